@@ -4,25 +4,32 @@ Additional Presentation Visuals: Specific slide visualizations
 =============================================================
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
+from functools import lru_cache
+
 import seaborn as sns
 import numpy as np
 from matplotlib.patches import Rectangle, FancyBboxPatch
 import matplotlib.patches as mpatches
 
-# Set presentation style
-plt.style.use('seaborn-v0_8-whitegrid')
-plt.rcParams['figure.figsize'] = (14, 10)
-plt.rcParams['font.size'] = 14
-plt.rcParams['axes.titlesize'] = 18
+from results_aggregates import load_aggregates, model_label
+from results_store import read_table
+from plot_style import pyplot
+
+# Presentation style, applied when the first slide is drawn
+PLOT_STYLE = dict(style='seaborn-v0_8-whitegrid', rc={
+    'figure.figsize': (14, 10),
+    'font.size': 14,
+    'axes.titlesize': 18
+})
 
-# Load data
-results_df = pd.read_csv('poker_tom_results_20250602_081719.csv')
-cognitive_df = pd.read_csv('detailed_cognitive_analysis.csv')
+@lru_cache(maxsize=None)
+def load_cognitive_df():
+    """Cognitive analysis columns the slides use, read once when first needed."""
+    return read_table('detailed_cognitive_analysis.csv', columns=['ToM_Level', 'Explanation_Text'])
 
 def create_slide_3_stimulus():
     """Slide 3: Sample Stimulus - Poker table visualization"""
+    plt = pyplot(**PLOT_STYLE)
     
     fig, ax = plt.subplots(figsize=(16, 10))
     
@@ -90,6 +97,7 @@ def create_slide_3_stimulus():
 
 def create_slide_4_bluff_scenario():
     """Slide 4: Bluff Scenario Example"""
+    plt = pyplot(**PLOT_STYLE)
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 10))
     
@@ -155,6 +163,7 @@ def create_slide_4_bluff_scenario():
 
 def create_slide_5_value_scenario():
     """Slide 5: Value Scenario Example"""
+    plt = pyplot(**PLOT_STYLE)
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 10))
     
@@ -219,41 +228,43 @@ def create_slide_5_value_scenario():
 
 def create_slide_9_bottleneck():
     """Slide 9: Deception Detection Bottleneck"""
+    plt = pyplot(**PLOT_STYLE)
+    aggregates = load_aggregates()
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
     
     # Left: Overall context difficulty
     contexts = ['Value\nDetection', 'Bluff\nDetection']
-    accuracies = [63.3, 40.6]
+    context_accuracy = aggregates.context_accuracy()
+    value_acc, bluff_acc = context_accuracy['Value'] * 100, context_accuracy['Bluff'] * 100
+    accuracies = [value_acc, bluff_acc]
     colors = ['#4ECDC4', '#FF6B6B']
     
     bars = ax1.bar(contexts, accuracies, color=colors, alpha=0.8, edgecolor='white', linewidth=3)
     ax1.set_title('The Deception Detection Challenge', fontweight='bold', fontsize=18)
     ax1.set_ylabel('Overall Accuracy (%)', fontweight='bold')
-    ax1.set_ylim(0, 80)
+    ax1.set_ylim(0, max(80, max(accuracies) + 10))
     ax1.axhline(y=50, color='black', linestyle='--', alpha=0.5, linewidth=2, label='Chance Level')
     
     # Add accuracy labels and difficulty gap
     for bar, acc in zip(bars, accuracies):
         height = bar.get_height()
         ax1.text(bar.get_x() + bar.get_width()/2., height + 2,
-                f'{acc}%', ha='center', va='bottom', fontweight='bold', fontsize=16)
+                f'{acc:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=16)
     
     # Show the gap
-    ax1.annotate('', xy=(1, 40.6), xytext=(1, 63.3),
+    ax1.annotate('', xy=(1, bluff_acc), xytext=(1, value_acc),
                 arrowprops=dict(arrowstyle='<->', color='red', lw=3))
-    ax1.text(1.2, 52, '22.7%\nGAP', ha='center', va='center', 
+    ax1.text(1.2, (value_acc + bluff_acc) / 2, f'{value_acc - bluff_acc:.1f}%\nGAP', ha='center', va='center', 
            fontsize=14, fontweight='bold', color='red')
     
     ax1.legend()
     
-    # Right: Model-specific performance heatmap - FIXED DATA SOURCE
-    # Calculate performance from cognitive_df correctly
-    model_context_perf = cognitive_df.groupby(['Model', 'Context_Type'])['Is_Correct'].mean().unstack()
+    # Right: Model-specific performance heatmap
+    model_context_perf = aggregates.model_context_accuracy()
     
     # Shorten model names for display
-    model_names = ['Hush-Qwen', 'OLMoE', 'EXAONE', 'Llama-1B']
-    model_context_perf.index = model_names
+    model_context_perf.index = [model_label(model) for model in model_context_perf.index]
     
     sns.heatmap(model_context_perf * 100, annot=True, fmt='.1f', cmap='RdYlGn', 
                 ax=ax2, cbar_kws={'label': 'Accuracy (%)'}, 
@@ -268,6 +279,8 @@ def create_slide_9_bottleneck():
 
 def create_slide_10_tom_evidence():
     """Slide 10: Theory of Mind Evidence Examples"""
+    plt = pyplot(**PLOT_STYLE)
+    cognitive_df = load_cognitive_df()
     
     fig, ax = plt.subplots(figsize=(16, 12))
     
@@ -7,6 +7,7 @@ from pathlib import Path
 TEMPERATURE = 0.5
 MAX_NEW_TOKENS = 350
 NUM_RUNS_PER_STIM = 3
+SEED = 42  # Base seed; run k of a stimulus samples with SEED + k
 
 # File Paths
 PROJECT_ROOT = Path(__file__).parent
@@ -15,15 +16,30 @@ RESULTS_DIR = PROJECT_ROOT / "results"
 CODING_TEMPLATE = PROJECT_ROOT / "poker_llm_coding_sheet.csv"
 
 # Model Configuration (adapt for your setup)
+# "backend" selects an adapter registered in model_adapters.ADAPTER_REGISTRY
 MODEL_CONFIGS = {
     "qwen3-1.7B-unsloth": {
+        "backend": "unsloth",
         "model_name": "unsloth/qwen2.5-1.5b-instruct-bnb-4bit",
         "load_in_4bit": True,
         "max_seq_length": 2048,
     },
+    "local-openai": {
+        "backend": "openai",
+        "model_name": "qwen2.5-1.5b-instruct",
+        "base_url": "http://localhost:8000/v1",
+    },
+    "placeholder": {
+        "backend": "placeholder",
+        "model_name": "placeholder",
+    },
     # Add more model configurations as needed
 }
 
+# Response Cache (opt-in via --response_cache)
+RESPONSE_CACHE = RESULTS_DIR / "response_cache.sqlite"
+RESPONSE_CACHE_MAX_MB = 512
+
 # Logging Configuration
 LOG_LEVEL = "INFO"
 LOG_FILE = PROJECT_ROOT / "experiment.log" 
\ No newline at end of file
@@ -4,25 +4,36 @@ Enhanced Slide 10: Theory of Mind Evidence - Premium Design
 ===========================================================
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
+from functools import lru_cache
+
 import seaborn as sns
 import numpy as np
 from matplotlib.patches import Rectangle, FancyBboxPatch, Circle
 import matplotlib.patches as mpatches
 import textwrap
 
-# Set premium presentation style
-plt.style.use('seaborn-v0_8-whitegrid')
-plt.rcParams['figure.figsize'] = (18, 12)
-plt.rcParams['font.size'] = 13
-plt.rcParams['axes.titlesize'] = 20
+from results_store import read_table
+from results_aggregates import load_aggregates
+from plot_style import pyplot
+
+# Premium presentation style, applied when the slide is drawn
+PLOT_STYLE = dict(style='seaborn-v0_8-whitegrid', rc={
+    'figure.figsize': (18, 12),
+    'font.size': 13,
+    'axes.titlesize': 20
+})
 
-# Load data
-cognitive_df = pd.read_csv('detailed_cognitive_analysis.csv')
+@lru_cache(maxsize=None)
+def load_cognitive_df():
+    """Cognitive analysis columns the slide uses, read once when first needed."""
+    return read_table('detailed_cognitive_analysis.csv',
+                      columns=['ToM_Level', 'Reasoning_Sophistication', 'Explanation_Text'])
 
 def create_enhanced_slide10():
     """Enhanced Slide 10: Theory of Mind Evidence with premium design"""
+    plt = pyplot(**PLOT_STYLE)
+    cognitive_df = load_cognitive_df()
+    aggregates = load_aggregates()
     
     fig = plt.figure(figsize=(20, 14))
     
@@ -221,13 +232,17 @@ def create_enhanced_slide10():
     stats_ax.text(0.5, 0.35, 'Key Insight:', ha='center', fontsize=16, fontweight='bold',
                  color='#2D3748', transform=stats_ax.transAxes)
     
-    stats_ax.text(0.5, 0.25, 'Only 5.6% of explanations\nshow sophisticated\nTheory of Mind reasoning', 
+    stats_ax.text(0.5, 0.25, f'Only {level2_pct:.1f}% of explanations\nshow sophisticated\nTheory of Mind reasoning', 
                  ha='center', va='center', fontsize=14, fontweight='bold',
                  color='#E53E3E', transform=stats_ax.transAxes,
                  bbox=dict(boxstyle="round,pad=0.3", facecolor='#FED7D7'))
     
-    # Model comparison
-    stats_ax.text(0.5, 0.1, 'But Hush-Qwen2.5-7B\nachieves 11.1% Level 2\nwith 93.3% accuracy', 
+    # Model comparison: the most accurate model and its share of Level 2 explanations
+    top_model = aggregates.model_performance().iloc[0]
+    top_level2 = aggregates.tom_level_shares('Model').reindex(index=[top_model.name], columns=[0, 1, 2],
+                                                                fill_value=0).loc[top_model.name, 2]
+    stats_ax.text(0.5, 0.1, f"But {top_model.name}\nachieves {top_level2 * 100:.1f}% Level 2\n"
+                 f"with {top_model['Accuracy'] * 100:.1f}% accuracy", 
                  ha='center', va='center', fontsize=14, fontweight='bold',
                  color='#2B6CB0', transform=stats_ax.transAxes,
                  bbox=dict(boxstyle="round,pad=0.3", facecolor='#BEE3F8'))
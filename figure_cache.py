@@ -0,0 +1,178 @@
+"""Content-addressed store of rendered figures, keyed by the code, style and data they depend on."""
+
+import ast
+import hashlib
+import json
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+MANIFEST = "manifest.json"
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def file_digest(path) -> str:
+    """sha256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _local_module(name: str, search_path: Sequence) -> Optional[Path]:
+    for directory in search_path:
+        path = Path(directory) / f"{name.replace('.', '/')}.py"
+        if path.exists():
+            return path
+    return None
+
+
+@lru_cache(maxsize=None)
+def _module_index(path: Path):
+    """Source, top-level definitions, class methods and imports of a module."""
+    source = path.read_text(encoding="utf-8")
+    tree = ast.parse(source)
+
+    definitions, methods, imports = {}, {}, {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            definitions[node.name] = node
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for name in ast.walk(target):
+                    if isinstance(name, ast.Name):
+                        definitions[name.id] = node
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            for alias in node.names:
+                imports[alias.asname or alias.name] = (node.module, alias.name)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                imports[alias.asname or alias.name] = (alias.name, None)
+        if isinstance(node, ast.ClassDef):
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    methods[f"{node.name}.{item.name}"] = item
+    return source, definitions, methods, imports
+
+
+def code_digest(source_path, roots: Sequence[str], search_path: Sequence = ()) -> str:
+    """Hash of the source of roots and of all the project code they reference.
+
+    roots are function names or 'Class.method' of the module at source_path. References
+    are followed through module-level functions, classes and constants (so a PLOT_STYLE
+    a function applies is part of its code), through attributes naming other methods of
+    the same class, and into the modules of search_path that names are imported from,
+    at module top or inside a function. Installed libraries are not followed.
+    """
+    segments = {}
+    pending = [(Path(source_path).resolve(), root) for root in roots]
+    while pending:
+        path, name = pending.pop()
+        key = f"{path.name}:{name}"
+        if key in segments:
+            continue
+        source, definitions, methods, imports = _module_index(path)
+        if name in imports and "." not in name:
+            module, imported = imports[name]
+            target = _local_module(module, search_path)
+            segments[key] = f"import {module}.{imported}"
+            if target is not None and imported is not None:
+                pending.append((target.resolve(), imported))
+            continue
+        node = methods.get(name) if "." in name else definitions.get(name)
+        if node is None:
+            continue
+        segments[key] = ast.get_source_segment(source, node)
+
+        owner = name.split(".")[0] if "." in name else None
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name):
+                pending.append((path, child.id))
+            elif isinstance(child, ast.Attribute):
+                if owner:
+                    pending.append((path, f"{owner}.{child.attr}"))
+                if isinstance(child.value, ast.Name) and child.value.id in imports:
+                    target = _local_module(imports[child.value.id][0], search_path)
+                    if target is not None:
+                        pending.append((target.resolve(), child.attr))
+            elif isinstance(child, ast.ImportFrom) and child.module:
+                target = _local_module(child.module, search_path)
+                if target is not None:
+                    pending.extend((target.resolve(), alias.name) for alias in child.names)
+    return _digest(*(f"{key}\n{segment}" for key, segment in sorted(segments.items())))
+
+
+def data_fingerprint(code: str, reads, column_digest: Callable[[str, Optional[List[str]]], List[str]]) -> str:
+    """Fingerprint of code run on the current contents of the (table, columns) it reads.
+
+    column_digest(table, columns) gives the digests of those columns (of every column of
+    the table for None).
+    """
+    data = [f"{table}:{','.join(column_digest(table, columns))}" for table, columns in reads]
+    return _digest(code, *data)
+
+
+class FigureCache:
+    """Rendered figures stored under a fingerprint of their code, style and data.
+
+    What a figure reads is a function of its code, so the manifest records, per job and
+    code digest, the (table, columns) reads of its last render. A fingerprint hashes the
+    code digest with the contents of exactly those columns; the outputs rendered under
+    it are kept in objects/<fingerprint>/ and restored instead of rendering again.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        manifest_path = self.directory / MANIFEST
+        self.manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    def reads(self, job: str, code: str) -> Optional[list]:
+        """(table, columns) reads of job's last render under code; None if it never rendered with it."""
+        return self.manifest.get(job, {}).get("reads", {}).get(code)
+
+    def restore(self, job: str, fingerprint: Optional[str], outputs: Sequence[str]) -> bool:
+        """Put the outputs stored under fingerprint in place; False if there are none.
+
+        Outputs already identical to the stored ones are left untouched.
+        """
+        stored = self.directory / "objects" / fingerprint if fingerprint else None
+        if stored is None or not all((stored / output).exists() for output in outputs):
+            return False
+
+        for output in outputs:
+            if not Path(output).exists() or file_digest(output) != file_digest(stored / output):
+                shutil.copyfile(stored / output, output)
+        self.manifest[job]["latest"] = fingerprint
+        return True
+
+    def store(self, job: str, code: str, reads, fingerprint: str, outputs: Sequence[str]):
+        """Keep the rendered outputs of job under fingerprint, with the reads of its code."""
+        stored = self.directory / "objects" / fingerprint
+        stored.mkdir(parents=True, exist_ok=True)
+        for output in outputs:
+            shutil.copyfile(output, stored / output)
+
+        entry = self.manifest.setdefault(job, {"reads": {}})
+        entry["reads"][code] = [list(read) for read in reads]
+        entry["latest"] = fingerprint
+
+    def save(self):
+        """Write the manifest."""
+        (self.directory / MANIFEST).write_text(json.dumps(self.manifest, indent=1))
+
+    def prune(self) -> int:
+        """Delete stored outputs that are not the latest render of any job; returns how many."""
+        latest = {entry.get("latest") for entry in self.manifest.values()}
+        objects = self.directory / "objects"
+        stale = [path for path in objects.iterdir() if path.name not in latest] if objects.exists() else []
+        for path in stale:
+            shutil.rmtree(path)
+        return len(stale)
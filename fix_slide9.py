@@ -7,61 +7,51 @@ Fix Slide 9: Corrected Deception Detection Bottleneck
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-import numpy as np
 from matplotlib.patches import Rectangle, FancyBboxPatch, Circle
 import matplotlib.patches as mpatches
 
-# Load data
-cognitive_df = pd.read_csv('detailed_cognitive_analysis.csv')
+from results_aggregates import load_aggregates, model_label
 
 def create_slide_9_bottleneck_fixed():
     """Slide 9: Deception Detection Bottleneck - CORRECTED"""
+    aggregates = load_aggregates()
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
     
     # Left: Overall context difficulty
     contexts = ['Value\nDetection', 'Bluff\nDetection']
-    accuracies = [63.3, 40.6]
+    context_accuracy = aggregates.context_accuracy()
+    value_acc, bluff_acc = context_accuracy['Value'] * 100, context_accuracy['Bluff'] * 100
+    accuracies = [value_acc, bluff_acc]
     colors = ['#4ECDC4', '#FF6B6B']
     
     bars = ax1.bar(contexts, accuracies, color=colors, alpha=0.8, edgecolor='white', linewidth=3)
     ax1.set_title('The Deception Detection Challenge', fontweight='bold', fontsize=18)
     ax1.set_ylabel('Overall Accuracy (%)', fontweight='bold')
-    ax1.set_ylim(0, 80)
+    ax1.set_ylim(0, max(80, max(accuracies) + 10))
     ax1.axhline(y=50, color='black', linestyle='--', alpha=0.5, linewidth=2, label='Chance Level')
     
     # Add accuracy labels and difficulty gap
     for bar, acc in zip(bars, accuracies):
         height = bar.get_height()
         ax1.text(bar.get_x() + bar.get_width()/2., height + 2,
-                f'{acc}%', ha='center', va='bottom', fontweight='bold', fontsize=16)
+                f'{acc:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=16)
     
     # Show the gap
-    ax1.annotate('', xy=(1, 40.6), xytext=(1, 63.3),
+    ax1.annotate('', xy=(1, bluff_acc), xytext=(1, value_acc),
                 arrowprops=dict(arrowstyle='<->', color='red', lw=3))
-    ax1.text(1.2, 52, '22.7%\nGAP', ha='center', va='center', 
+    ax1.text(1.2, (value_acc + bluff_acc) / 2, f'{value_acc - bluff_acc:.1f}%\nGAP', ha='center', va='center', 
            fontsize=14, fontweight='bold', color='red')
     
     ax1.legend()
     
     # Right: Model-specific performance heatmap - CORRECTED
-    # Calculate actual performance from the data
-    model_performance = cognitive_df.groupby(['Model', 'Context_Type'])['Is_Correct'].mean() * 100
-    
-    # Create the correct data structure for heatmap
-    models = ['Hush-Qwen2.5-7B', 'OLMoE-1B-7B-0125-Instruct', 'EXAONE-3.5-2.4B-Instruct', 'Llama-3.2-SUN-HDIC-1B-Ins']
-    contexts = ['Bluff', 'Value']
-    
-    # Create matrix with correct values
-    perf_matrix = np.zeros((len(models), len(contexts)))
-    for i, model in enumerate(models):
-        for j, context in enumerate(contexts):
-            if (model, context) in model_performance.index:
-                perf_matrix[i, j] = model_performance[(model, context)]
+    # Actual performance per model and context, best model first
+    model_performance = aggregates.model_context_accuracy() * 100
     
     # Create DataFrame for heatmap
-    perf_df = pd.DataFrame(perf_matrix, 
-                          index=['Hush-Qwen', 'OLMoE', 'EXAONE', 'Llama-1B'],
+    perf_df = pd.DataFrame(model_performance.reindex(columns=['Bluff', 'Value']).to_numpy(),
+                          index=[model_label(model) for model in model_performance.index],
                           columns=['Bluff', 'Value'])
     
     sns.heatmap(perf_df, annot=True, fmt='.1f', cmap='RdYlGn', 
@@ -78,7 +68,8 @@ def create_slide_9_bottleneck_fixed():
     # Print the actual values for verification
     print("=== CORRECTED VALUES ===")
     print(perf_df)
-    print(f"\nHush-Qwen: {perf_df.loc['Hush-Qwen', 'Bluff']:.1f}% bluff, {perf_df.loc['Hush-Qwen', 'Value']:.1f}% value")
+    best = perf_df.index[0]
+    print(f"\n{best}: {perf_df.loc[best, 'Bluff']:.1f}% bluff, {perf_df.loc[best, 'Value']:.1f}% value")
 
 def main():
     """Generate corrected slide 9"""
@@ -1,61 +1,660 @@
 """Model adapters for different LLM frameworks."""
 
-import torch
-from typing import Optional, Dict, Any
+import asyncio
+import copy
+import functools
+import gc
+import os
+import re
+import threading
+import time
+from typing import Optional, Dict, Any, List, Sequence, Type
+
+from config import MODEL_CONFIGS
+
+# Backend name -> adapter class, filled in by @register_adapter
+ADAPTER_REGISTRY: Dict[str, Type["ModelAdapter"]] = {}
+
+# Backend used for model names that have no MODEL_CONFIGS entry (raw HF paths)
+DEFAULT_BACKEND = "transformers"
+
+# Keys of the per-prompt statistics appended to a generate call's `stats` list;
+# values a backend cannot measure are None
+GENERATION_STAT_KEYS = ("prompt_tokens", "generated_tokens", "ttft_s", "total_s")
+
+
+def generation_stats(prompt_tokens: Optional[int] = None, generated_tokens: Optional[int] = None,
+                     ttft_s: Optional[float] = None, total_s: Optional[float] = None) -> Dict[str, Any]:
+    """Build one per-prompt statistics record."""
+    return dict(zip(GENERATION_STAT_KEYS, (prompt_tokens, generated_tokens, ttft_s, total_s)))
+
+
+def register_adapter(backend: str):
+    """Class decorator that registers an adapter under a backend name."""
+
+    def decorator(cls):
+        ADAPTER_REGISTRY[backend] = cls
+        cls.backend = backend
+        return cls
+
+    return decorator
+
+
+def create_adapter(model_key: str, model_configs: Optional[Dict[str, Dict[str, Any]]] = None) -> "ModelAdapter":
+    """Instantiate the adapter for a MODEL_CONFIGS key (or a raw model name/path)."""
+
+    model_configs = MODEL_CONFIGS if model_configs is None else model_configs
+    config = dict(model_configs.get(model_key, {"model_name": model_key}))
+    backend = config.get("backend", DEFAULT_BACKEND)
+
+    if backend not in ADAPTER_REGISTRY:
+        raise ValueError(f"Unknown backend '{backend}' for {model_key}. "
+                         f"Available: {', '.join(sorted(ADAPTER_REGISTRY))}")
+
+    return ADAPTER_REGISTRY[backend](model_key, config)
+
+
+class ModelAdapter:
+    """Base class for model backends.
+
+    Subclasses implement load_model and generate; batch and async generation
+    fall back to those unless a backend has a native implementation. Generate
+    methods take an optional `stats` list, to which they append one
+    generation_stats record per prompt.
+    """
+
+    backend = None
+
+    # Whether score_labels is implemented (needs next-token log-probabilities)
+    supports_scoring = False
 
-class UnslothAdapter:
-    """Adapter for Unsloth-optimized models."""
-    
     def __init__(self, model_name: str, config: Dict[str, Any]):
         self.model_name = model_name
         self.config = config
+
+    def load_model(self):
+        """Load model weights or open a client connection."""
+        raise NotImplementedError
+
+    def unload_model(self):
+        """Release model memory or client connections."""
+
+    def generate(self, prompt: str, temperature: float, max_new_tokens: int,
+                 seed: Optional[int] = None, stats: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Generate a response for one prompt, sampling with seed if given."""
+        raise NotImplementedError
+
+    def generate_batch(self, prompts: List[str], temperature: float, max_new_tokens: int,
+                       seeds: Optional[Sequence[Optional[int]]] = None,
+                       stats: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+        """Generate responses for several prompts, in order, prompt i sampling with seeds[i]."""
+        seeds = seeds if seeds is not None else [None] * len(prompts)
+        return [self.generate(prompt, temperature, max_new_tokens, seed, stats)
+                for prompt, seed in zip(prompts, seeds)]
+
+    async def agenerate(self, prompt: str, temperature: float, max_new_tokens: int,
+                        seed: Optional[int] = None, stats: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Generate a response without blocking the event loop.
+
+        The default runs the blocking generate in the loop's thread pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.generate, prompt, temperature, max_new_tokens, seed, stats)
+        )
+
+    def set_prompt_prefix(self, prefix: str) -> bool:
+        """Precompute state for a prefix shared by every prompt.
+
+        Returns True if the backend will reuse it, False if unsupported.
+        """
+        return False
+
+    def set_classification_only(self, cue: str, labels: Sequence[str], constrained: bool = False) -> bool:
+        """Stop generating once the response has emitted cue followed by one of labels.
+
+        With constrained=True the prompt is extended with cue and only the labels may
+        be generated after it. Returns True if the backend supports the mode.
+        """
+        return False
+
+    def score_labels(self, prompts: List[str], cue: str, labels: Sequence[str],
+                     stats: Optional[List[Dict[str, Any]]] = None) -> List[List[float]]:
+        """Probability of each label as the answer to cue, for every prompt.
+
+        Probabilities are normalized over labels; no tokens are generated.
+        """
+        raise NotImplementedError(f"{self.backend} backend does not support label scoring")
+
+
+@register_adapter("placeholder")
+class PlaceholderAdapter(ModelAdapter):
+    """Canned-response backend for dry runs of the pipeline without a model."""
+
+    RESPONSE = ("1. Classification: Bluff\n2. Explanation: This appears to be a bluff based on the "
+                "opponent's aggressive tendencies and the scary river card.")
+
+    def load_model(self):
+        """Nothing to load."""
+
+    def generate(self, prompt: str, temperature: float, max_new_tokens: int,
+                 seed: Optional[int] = None, stats: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Return the canned response."""
+        if stats is not None:
+            stats.append(generation_stats(ttft_s=0.0, total_s=0.0))
+        return self.RESPONSE
+
+
+@register_adapter("transformers")
+class HuggingFaceAdapter(ModelAdapter):
+    """Adapter for local Hugging Face transformers causal LMs."""
+
+    supports_scoring = True
+
+    def __init__(self, model_name: str, config: Dict[str, Any]):
+        super().__init__(model_name, config)
+        self.model = None
+        self.tokenizer = None
+
+        # Key/value cache of the shared prompt prefix, encoded once and reused per prompt
+        self.prefix_cache = None
+        self.prefix_ids = None
+
+        # Classification-only mode (see set_classification_only)
+        self.classification_cue = None
+        self.classification_labels = None
+        self.classification_pattern = None
+        self.constrained = False
+
+        # Held by each async request while it generates (see agenerate)
+        self._generate_lock = threading.Lock()
+
+    def load_model(self):
+        """Load a transformers model and tokenizer."""
+        from transformers import AutoTokenizer, AutoModelForCausalLM
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.config["model_name"])
+        self.model = AutoModelForCausalLM.from_pretrained(self.config["model_name"])
+        self.model.eval()
+
+    def unload_model(self):
+        """Drop model weights and cached prefix state, returning memory to the allocator."""
+        import torch
+
         self.model = None
         self.tokenizer = None
-    
+        self.prefix_cache = None
+        self.prefix_ids = None
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def generate(self, prompt: str, temperature: float, max_new_tokens: int,
+                 seed: Optional[int] = None, stats: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Generate a response for one prompt."""
+        return self.generate_batch([prompt], temperature, max_new_tokens, [seed], stats)[0]
+
+    def _generate_locked(self, prompt: str, temperature: float, max_new_tokens: int,
+                         seed: Optional[int], stats: Optional[List[Dict[str, Any]]]) -> str:
+        with self._generate_lock:
+            return self.generate(prompt, temperature, max_new_tokens, seed, stats)
+
+    async def agenerate(self, prompt: str, temperature: float, max_new_tokens: int,
+                        seed: Optional[int] = None, stats: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Generate a response in the loop's thread pool, one request at a time.
+
+        Concurrent generate calls would run on the same weights, tokenizer settings and
+        prefix cache, which are not thread-safe, and only contend for the same device;
+        local models run requests in parallel by batching (--batch_size).
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self._generate_locked, prompt, temperature, max_new_tokens, seed, stats)
+        )
+
+    def generate_batch(self, prompts: List[str], temperature: float, max_new_tokens: int,
+                       seeds: Optional[Sequence[Optional[int]]] = None,
+                       stats: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+        """Generate responses for a batch of prompts with one padded generate call.
+
+        Row i samples from its own generator seeded with seeds[i] (see _row_sampler),
+        so its tokens do not depend on the other rows' seeds. Rows share the batch's
+        time to first token and total time.
+        """
+        import torch
+
+        # Decoder-only models must be left-padded so generation continues from the prompt
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        generate_kwargs = {}
+        if self.constrained:
+            # Answer the cue directly: one sampled token, restricted to the label starts
+            prompts = [f"{prompt}\n\n{self.classification_cue}" for prompt in prompts]
+            allowed_ids = self._label_start_ids()
+            generate_kwargs["prefix_allowed_tokens_fn"] = lambda batch_id, input_ids: allowed_ids
+            max_new_tokens = 1
+
+        # Times the first token and, in classification-only mode, stops resolved rows
+        monitor = self._generation_monitor(None if self.constrained else self.classification_pattern)
+
+        inputs = self._prefix_cached_inputs(prompts) if self.prefix_cache is not None else None
+        if inputs is None:
+            inputs = dict(self.tokenizer(
+                prompts,
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=self.config.get("max_seq_length", 2048)
+            ))
+
+        # Sampling happens in the row sampler; generate() then takes its one finite token
+        sampler = self._row_sampler(seeds if seeds is not None else [None] * len(prompts), temperature)
+
+        start = time.perf_counter()
+        with torch.no_grad():
+            outputs = self.model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                temperature=None,
+                top_k=None,
+                top_p=None,
+                pad_token_id=self.tokenizer.pad_token_id,
+                eos_token_id=self.tokenizer.eos_token_id,
+                logits_processor=[sampler],
+                stopping_criteria=[monitor],
+                **generate_kwargs
+            )
+        total_s = time.perf_counter() - start
+
+        # Decode only the new tokens; every row shares the padded prompt length
+        prompt_length = inputs["input_ids"].shape[1]
+        new_tokens = outputs[:, prompt_length:]
+        responses = self.tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
+
+        if stats is not None:
+            # Rows that finish early are filled with end/pad tokens up to the batch length
+            finished = (new_tokens == self.tokenizer.eos_token_id) | (new_tokens == self.tokenizer.pad_token_id)
+            generated = torch.where(finished.any(dim=-1), finished.int().argmax(dim=-1), new_tokens.shape[1])
+            ttft_s = monitor.first_token_time - start if monitor.first_token_time is not None else None
+            for prompt_tokens, generated_tokens in zip(inputs["attention_mask"].sum(dim=-1).tolist(),
+                                                       generated.tolist()):
+                stats.append(generation_stats(prompt_tokens, generated_tokens, ttft_s, total_s))
+
+        if self.constrained:
+            return [f"{self.classification_cue} {self._complete_label(response)}" for response in responses]
+        return [response.strip() for response in responses]
+
+    def set_classification_only(self, cue: str, labels: Sequence[str], constrained: bool = False) -> bool:
+        """Stop each row as soon as cue and a label have been generated."""
+        self.classification_cue = cue
+        self.classification_labels = list(labels)
+        self.classification_pattern = re.compile(
+            re.escape(cue) + r"[\s*]*(?:" + "|".join(re.escape(label) for label in labels) + ")",
+            re.IGNORECASE
+        )
+        self.constrained = constrained
+        return True
+
+    def _label_start_ids(self) -> List[int]:
+        """First token of each label, with and without a leading space."""
+        return sorted({token_id for label in self.classification_labels
+                       for token_id in self._label_token_ids(label)})
+
+    def _label_token_ids(self, label: str) -> List[int]:
+        """Tokens that can start label right after a cue, with and without a leading space.
+
+        Tokenizers that split off the space as its own token would let a bare space
+        stand for the label, so whitespace-only tokens are left out.
+        """
+        token_ids = set()
+        for text in (label, " " + label):
+            token_id = self.tokenizer(text, add_special_tokens=False).input_ids[0]
+            if self.tokenizer.decode([token_id]).strip():
+                token_ids.add(token_id)
+        return sorted(token_ids)
+
+    def score_labels(self, prompts: List[str], cue: str, labels: Sequence[str],
+                     stats: Optional[List[Dict[str, Any]]] = None) -> List[List[float]]:
+        """Read the label probabilities from one forward pass over prompt + cue.
+
+        A label's log-probability is the log-sum-exp over its start tokens; the
+        labels are then renormalized against each other.
+        """
+        import torch
+
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        prompts = [f"{prompt}\n\n{cue}" for prompt in prompts]
+        inputs = self._prefix_cached_inputs(prompts) if self.prefix_cache is not None else None
+        if inputs is None:
+            inputs = dict(self.tokenizer(
+                prompts,
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=self.config.get("max_seq_length", 2048)
+            ))
+
+        # Positions skip padding, as in generate(); tokens already in the cache are not fed again
+        attention_mask = inputs["attention_mask"]
+        position_ids = (attention_mask.cumsum(-1) - 1).clamp(min=0)
+        cached_length = 0 if inputs.get("past_key_values") is None else inputs["past_key_values"].get_seq_length()
+
+        start = time.perf_counter()
+        with torch.no_grad():
+            logits = self.model(
+                input_ids=inputs["input_ids"][:, cached_length:],
+                attention_mask=attention_mask,
+                position_ids=position_ids[:, cached_length:],
+                past_key_values=inputs.get("past_key_values"),
+            ).logits[:, -1, :]
+        total_s = time.perf_counter() - start
+
+        if stats is not None:
+            # The label distribution is available after the prefill, with nothing decoded
+            for prompt_tokens in attention_mask.sum(dim=-1).tolist():
+                stats.append(generation_stats(prompt_tokens, 0, total_s, total_s))
+
+        log_probs = torch.log_softmax(logits.float(), dim=-1)
+        label_log_probs = torch.stack([
+            torch.logsumexp(log_probs[:, self._label_token_ids(label)], dim=-1) for label in labels
+        ], dim=-1)
+        return torch.softmax(label_log_probs, dim=-1).tolist()
+
+    def _complete_label(self, token_text: str) -> str:
+        """Map a sampled label-start token back to its full label."""
+        token_text = token_text.strip().lower()
+        for label in self.classification_labels:
+            if token_text and label.lower().startswith(token_text):
+                return label
+        return token_text
+
+    def _row_sampler(self, seeds: Sequence[Optional[int]], temperature: float):
+        """Logits processor that samples each row's next token from its own seeded generator.
+
+        generate() draws a whole batch from the global torch RNG, so a row's sample would
+        depend on the batch it ran in. Here row i draws from a generator seeded with
+        seeds[i] (an unseeded one for None), after the temperature and the model's
+        top-k/top-p, and only the drawn token is left finite for greedy selection.
+        """
+        import torch
+        from transformers import LogitsProcessor, TemperatureLogitsWarper, TopKLogitsWarper, TopPLogitsWarper
+
+        config = self.model.generation_config
+        warpers = [TemperatureLogitsWarper(temperature)]
+        if config.top_k:
+            warpers.append(TopKLogitsWarper(config.top_k))
+        if config.top_p is not None and config.top_p < 1.0:
+            warpers.append(TopPLogitsWarper(config.top_p))
+
+        generators = []
+        for seed in seeds:
+            generator = torch.Generator(device=self.model.device)
+            if seed is not None:
+                generator.manual_seed(seed)
+            else:
+                generator.seed()
+            generators.append(generator)
+
+        class RowSampler(LogitsProcessor):
+            def __call__(self, input_ids, scores):
+                for warper in warpers:
+                    scores = warper(input_ids, scores)
+                probs = torch.softmax(scores.float(), dim=-1)
+                tokens = torch.cat([torch.multinomial(row, 1, generator=generator)
+                                    for row, generator in zip(probs, generators)])
+                chosen = torch.full_like(scores, float("-inf"))
+                return chosen.scatter_(1, tokens[:, None], 0.0)
+
+        return RowSampler()
+
+    def _generation_monitor(self, pattern: Optional["re.Pattern"]):
+        """Stopping criterion that timestamps the first generated token.
+
+        With a pattern, each row also stops once its new text matches it.
+        """
+        import torch
+        from transformers import StoppingCriteria
+
+        tokenizer = self.tokenizer
+
+        class GenerationMonitor(StoppingCriteria):
+            def __init__(self):
+                self.prompt_length = None
+                self.first_token_time = None
+
+            def __call__(self, input_ids, scores, **kwargs):
+                # The first call sees the prompt plus one new token
+                if self.prompt_length is None:
+                    self.prompt_length = input_ids.shape[1] - 1
+                    self.first_token_time = time.perf_counter()
+                if pattern is None:
+                    return torch.zeros(input_ids.shape[0], dtype=torch.bool, device=input_ids.device)
+                texts = tokenizer.batch_decode(input_ids[:, self.prompt_length:], skip_special_tokens=True)
+                return torch.tensor([pattern.search(text) is not None for text in texts],
+                                    device=input_ids.device)
+
+        return GenerationMonitor()
+
+    def set_prompt_prefix(self, prefix: str) -> bool:
+        """Encode the shared prefix once and keep its attention key/value cache.
+
+        Returns False, generating without the prefix cache, on transformers releases
+        whose DynamicCache cannot be repeated across a batch.
+        """
+        import torch
+        try:
+            from transformers import DynamicCache
+        except ImportError:
+            return False
+        if not hasattr(DynamicCache, "batch_repeat_interleave"):
+            return False
+
+        self.prefix_ids = self.tokenizer(prefix, return_tensors="pt").input_ids
+        with torch.no_grad():
+            self.prefix_cache = self.model(
+                input_ids=self.prefix_ids,
+                past_key_values=DynamicCache(),
+                use_cache=True
+            ).past_key_values
+
+        return True
+
+    def _prefix_cached_inputs(self, prompts: List[str]) -> Optional[Dict[str, Any]]:
+        """Build generate() inputs that reuse the cached prefix keys/values.
+
+        Rows are laid out as prefix + padding + suffix so the shared prefix sits at the
+        same positions in every row and only the suffix tokens need a prefill pass.
+        Returns None if any prompt does not tokenize to the cached prefix.
+        """
+        import torch
+
+        prefix = self.prefix_ids[0].tolist()
+        suffixes = []
+        for prompt in prompts:
+            ids = self.tokenizer(prompt).input_ids
+            if ids[:len(prefix)] != prefix:
+                return None
+            suffixes.append(ids[len(prefix):])
+
+        suffix_length = max(len(suffix) for suffix in suffixes)
+        input_ids, attention_mask = [], []
+        for suffix in suffixes:
+            padding = suffix_length - len(suffix)
+            input_ids.append(prefix + [self.tokenizer.pad_token_id] * padding + suffix)
+            attention_mask.append([1] * len(prefix) + [0] * padding + [1] * len(suffix))
+
+        # generate() extends the cache in place, so each call works on its own copy
+        past_key_values = copy.deepcopy(self.prefix_cache)
+        if len(prompts) > 1:
+            past_key_values.batch_repeat_interleave(len(prompts))
+
+        return {
+            "input_ids": torch.tensor(input_ids),
+            "attention_mask": torch.tensor(attention_mask),
+            "past_key_values": past_key_values
+        }
+
+
+@register_adapter("unsloth")
+class UnslothAdapter(HuggingFaceAdapter):
+    """Adapter for Unsloth-optimized models."""
+
     def load_model(self):
         """Load Unsloth model."""
         try:
             from unsloth import FastLanguageModel
-            
+
             self.model, self.tokenizer = FastLanguageModel.from_pretrained(
                 model_name=self.config["model_name"],
                 max_seq_length=self.config.get("max_seq_length", 2048),
                 dtype=None,
                 load_in_4bit=self.config.get("load_in_4bit", True),
             )
-            
+
             # Enable native 2x faster inference
             FastLanguageModel.for_inference(self.model)
-            
+
         except ImportError:
             raise ImportError("Unsloth not installed. Install with: pip install unsloth")
-    
-    def generate(self, prompt: str, temperature: float, max_new_tokens: int) -> str:
-        """Generate response using Unsloth model."""
-        
-        inputs = self.tokenizer(
-            prompt,
-            return_tensors="pt",
-            truncation=True,
-            max_length=2048
-        )
-        
-        with torch.no_grad():
-            outputs = self.model.generate(
-                **inputs,
-                max_new_tokens=max_new_tokens,
-                temperature=temperature,
-                do_sample=True,
-                pad_token_id=self.tokenizer.eos_token_id,
-                eos_token_id=self.tokenizer.eos_token_id,
-            )
-        
-        # Decode only the new tokens
-        response = self.tokenizer.decode(
-            outputs[0][inputs.input_ids.shape[1]:], 
-            skip_special_tokens=True
-        )
-        
-        return response.strip()
 
-# Add other adapters as needed (OpenAI API, Hugging Face, etc.) 
\ No newline at end of file
+
+@register_adapter("openai")
+class OpenAICompatibleAdapter(ModelAdapter):
+    """Adapter for OpenAI-compatible chat completion servers (OpenAI, vLLM, llama.cpp, ...)."""
+
+    def __init__(self, model_name: str, config: Dict[str, Any]):
+        super().__init__(model_name, config)
+        self.client = None
+        self.async_client = None
+        self._client_kwargs = None
+        self._async_loop = None
+
+        # Stop sequences ending the response after the classification line
+        self.stop = None
+
+    def load_model(self):
+        """Create sync and async clients for the configured endpoint."""
+        try:
+            import openai
+        except ImportError:
+            raise ImportError("openai not installed. Install with: pip install openai")
+
+        self._client_kwargs = {
+            "base_url": self.config.get("base_url"),
+            # Local stand-in servers accept any key
+            "api_key": os.getenv(self.config.get("api_key_env", "OPENAI_API_KEY"), "EMPTY"),
+        }
+        self.client = openai.OpenAI(**self._client_kwargs)
+
+    def unload_model(self):
+        """Close the HTTP client; the async client is bound to a finished event loop."""
+        if self.client is not None:
+            self.client.close()
+        self.client = None
+        self.async_client = None
+        self._async_loop = None
+
+    def _request(self, prompt: str, temperature: float, max_new_tokens: int,
+                 seed: Optional[int]) -> Dict[str, Any]:
+        request = {
+            "model": self.config["model_name"],
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_new_tokens,
+        }
+        if seed is not None:
+            request["seed"] = seed
+        if self.stop:
+            request["stop"] = self.stop
+        return request
+
+    def set_classification_only(self, cue: str, labels: Sequence[str], constrained: bool = False) -> bool:
+        """End the response at the line break after the classification.
+
+        Chat endpoints cannot restrict tokens by label, so constrained mode is unsupported.
+        """
+        if constrained:
+            return False
+        self.stop = ["\n2.", "2. Explanation"]
+        return True
+
+    def generate(self, prompt: str, temperature: float, max_new_tokens: int,
+                 seed: Optional[int] = None, stats: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Generate a response with a blocking request.
+
+        With stats, the response is streamed to time the first token.
+        """
+        request = self._request(prompt, temperature, max_new_tokens, seed)
+        if stats is None:
+            response = self.client.chat.completions.create(**request)
+            return (response.choices[0].message.content or "").strip()
+
+        start = time.perf_counter()
+        monitor = _StreamMonitor(start)
+        for chunk in self.client.chat.completions.create(**request, **_STREAM_KWARGS):
+            monitor.add(chunk)
+        stats.append(monitor.stats(time.perf_counter() - start))
+        return monitor.text()
+
+    async def agenerate(self, prompt: str, temperature: float, max_new_tokens: int,
+                        seed: Optional[int] = None, stats: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Generate a response with a non-blocking request."""
+        import openai
+
+        # Async connections belong to one event loop; each asyncio.run gets its own client
+        loop = asyncio.get_running_loop()
+        if self.async_client is None or self._async_loop is not loop:
+            self.async_client = openai.AsyncOpenAI(**self._client_kwargs)
+            self._async_loop = loop
+
+        request = self._request(prompt, temperature, max_new_tokens, seed)
+        if stats is None:
+            response = await self.async_client.chat.completions.create(**request)
+            return (response.choices[0].message.content or "").strip()
+
+        start = time.perf_counter()
+        monitor = _StreamMonitor(start)
+        async for chunk in await self.async_client.chat.completions.create(**request, **_STREAM_KWARGS):
+            monitor.add(chunk)
+        stats.append(monitor.stats(time.perf_counter() - start))
+        return monitor.text()
+
+
+# Streamed completions report token usage in a final chunk when asked to
+_STREAM_KWARGS = {"stream": True, "stream_options": {"include_usage": True}}
+
+
+class _StreamMonitor:
+    """Collects a streamed chat completion and times its first content chunk."""
+
+    def __init__(self, start: float):
+        self.start = start
+        self.first_token_time = None
+        self.parts = []
+        self.usage = None
+
+    def add(self, chunk):
+        if chunk.usage is not None:
+            self.usage = chunk.usage
+        if chunk.choices and chunk.choices[0].delta.content:
+            if self.first_token_time is None:
+                self.first_token_time = time.perf_counter()
+            self.parts.append(chunk.choices[0].delta.content)
+
+    def text(self) -> str:
+        return "".join(self.parts).strip()
+
+    def stats(self, total_s: float) -> Dict[str, Any]:
+        # Servers that ignore include_usage leave the token counts unknown
+        return generation_stats(
+            self.usage.prompt_tokens if self.usage is not None else None,
+            self.usage.completion_tokens if self.usage is not None else None,
+            self.first_token_time - self.start if self.first_token_time is not None else None,
+            total_s
+        )
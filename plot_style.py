@@ -0,0 +1,43 @@
+"""matplotlib imported on first use, with a script's plotting style applied once.
+
+Scripts that also print text-only summaries or LaTeX tables call pyplot() inside
+their plotting functions instead of importing matplotlib and setting the style at
+module top, so runs that never draw a figure never pay for the plotting stack.
+"""
+
+from typing import Mapping, Optional
+
+# Style applied last, so repeated calls from the same script are free
+_applied_style = None
+
+
+def pyplot(style: str, palette: Optional[str] = None, rc: Optional[Mapping] = None):
+    """matplotlib.pyplot with the given style, seaborn palette and rcParams applied.
+
+    The style is re-applied only when it differs from the one applied last, so
+    scripts with different styles can share one process.
+    """
+    global _applied_style
+    import matplotlib.pyplot as plt
+
+    key = (style, palette, tuple((rc or {}).items()))
+    if key != _applied_style:
+        plt.style.use(style)
+        if palette is not None:
+            import seaborn as sns
+            sns.set_palette(palette)
+        plt.rcParams.update(rc or {})
+        _applied_style = key
+    return plt
+
+
+def reset_style():
+    """Back to matplotlib's rc-file defaults, so the next pyplot() applies its style afresh.
+
+    Figures rendered one after another in the same process (as render_figures.py does)
+    would otherwise inherit rcParams a previous script set.
+    """
+    global _applied_style
+    import matplotlib
+    matplotlib.rc_file_defaults()
+    _applied_style = None
@@ -4,26 +4,36 @@ Premium Slide 10: Theory of Mind Evidence - Ultimate Design
 ============================================================
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
+from functools import lru_cache
+
 import seaborn as sns
 import numpy as np
 from matplotlib.patches import Rectangle, FancyBboxPatch, Circle
 import matplotlib.patches as mpatches
 import textwrap
 
-# Set premium presentation style
-plt.style.use('seaborn-v0_8-whitegrid')
-plt.rcParams['figure.figsize'] = (20, 14)
-plt.rcParams['font.size'] = 14
-plt.rcParams['axes.titlesize'] = 22
-plt.rcParams['font.family'] = 'sans-serif'
+from results_store import read_table
+from results_aggregates import load_aggregates, model_label
+from plot_style import pyplot
+
+# Premium presentation style, applied when the slide is drawn
+PLOT_STYLE = dict(style='seaborn-v0_8-whitegrid', rc={
+    'figure.figsize': (20, 14),
+    'font.size': 14,
+    'axes.titlesize': 22,
+    'font.family': 'sans-serif'
+})
 
-# Load data
-cognitive_df = pd.read_csv('detailed_cognitive_analysis.csv')
+@lru_cache(maxsize=None)
+def load_cognitive_df():
+    """Cognitive analysis columns the slide uses, read once when first needed."""
+    return read_table('detailed_cognitive_analysis.csv', columns=['ToM_Level'])
 
 def create_premium_slide10():
     """Premium Slide 10: Theory of Mind Evidence with ultimate design"""
+    plt = pyplot(**PLOT_STYLE)
+    cognitive_df = load_cognitive_df()
+    aggregates = load_aggregates()
     
     fig = plt.figure(figsize=(22, 16))
     fig.patch.set_facecolor('#FFFFFF')
@@ -261,8 +271,12 @@ def create_premium_slide10():
                  color='#3182CE', transform=stats_ax.transAxes,
                  bbox=dict(boxstyle="round,pad=0.3", facecolor='#EBF8FF'))
     
-    # Model highlight
-    stats_ax.text(0.5, 0.08, 'Hush-Qwen: 11.1% Level 2\n93.3% accuracy', 
+    # Model highlight: the most accurate model and its share of Level 2 explanations
+    top_model = aggregates.model_performance().iloc[0]
+    top_level2 = aggregates.tom_level_shares('Model').reindex(index=[top_model.name], columns=[0, 1, 2],
+                                                                fill_value=0).loc[top_model.name, 2]
+    stats_ax.text(0.5, 0.08, f"{model_label(top_model.name)}: {top_level2 * 100:.1f}% Level 2\n"
+                 f"{top_model['Accuracy'] * 100:.1f}% accuracy", 
                  ha='center', va='center', fontsize=10, fontweight='bold',
                  color='#2C5282', transform=stats_ax.transAxes,
                  bbox=dict(boxstyle="round,pad=0.2", facecolor='#BEE3F8'))
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Figure Rendering: Every Dashboard, Slide and Paper Figure in a Process Pool
+===========================================================================
+Each figure function of the analysis, slide and paper scripts is one render job. Jobs
+run on matplotlib's non-interactive Agg backend, so their plt.show() calls return at
+once, and independent jobs render concurrently in a process pool.
+
+The parent process reads each table the jobs need once and publishes it as memory-
+mapped column files (see shared_tables.py); every worker's read_table is then served
+from that single copy instead of parsing the CSV again.
+
+Usage:
+    python render_figures.py --n_jobs -1
+    python render_figures.py --figures slide7_results.png deception_bottleneck.pdf
+    python render_figures.py --list
+    python render_figures.py --no_figure_cache
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+import tempfile
+import warnings
+import contextlib
+import hashlib
+import importlib
+import importlib.metadata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# Directories of the scripts the jobs import
+SCRIPT_DIRS = [PROJECT_ROOT, PROJECT_ROOT / 'src' / 'analysis', PROJECT_ROOT / 'src' / 'visualization']
+
+# Tables the jobs read: the experiment results (--results_csv) and the exported
+# per-explanation cognitive analysis, which the slide scripts read by this name
+RESULTS_TABLE = 'poker_tom_results_20250602_081719.csv'
+COGNITIVE_TABLE = 'detailed_cognitive_analysis.csv'
+
+# Analyzer class and constructor of the 'poker' and 'cognitive' jobs, part of their code
+ANALYZERS = {
+    'poker': ('ToMPokerAnalyzer', '__init__'),
+    'cognitive': ('CognitiveToMAnalyzer', 'from_cognitive_table'),
+}
+
+# Libraries whose version is part of every job's code
+RENDER_LIBRARIES = ['matplotlib', 'seaborn']
+
+# Render job -> (kind, module, function, tables read, files written). 'poker' and
+# 'cognitive' jobs call a method of an analyzer built from the results or cognitive
+# table; 'script' jobs call a module-level function. 'aggregates' jobs read the results
+# aggregates (see results_aggregates.py), which are brought up to date before rendering.
+FIGURE_JOBS = {
+    'tom_poker_dashboard': ('poker', 'tom_poker_analysis', 'create_main_performance_dashboard',
+                            ['results'], ['tom_poker_dashboard.png']),
+    'confusion_matrices': ('poker', 'tom_poker_analysis', 'create_confusion_matrices',
+                           ['results'], ['confusion_matrices.png']),
+    'tom_indicators': ('poker', 'tom_poker_analysis', 'create_tom_indicators_analysis',
+                       ['results'], ['tom_indicators.png']),
+    'presentation_figures': ('poker', 'tom_poker_analysis', 'create_presentation_figures',
+                             ['results'], ['presentation_accuracy.png', 'presentation_bluff_challenge.png']),
+    'cognitive_dashboard': ('cognitive', 'cognitive_tom_analysis', 'create_cognitive_dashboard',
+                            ['cognitive'], ['cognitive_tom_dashboard.png']),
+    'slide1': ('script', 'presentation_visuals', 'create_slide_1_tom_challenge', ['aggregates'],
+               ['slide1_tom_challenge.png']),
+    'slide2': ('script', 'presentation_visuals', 'create_slide_2_framework', [], ['slide2_framework.png']),
+    'slide3': ('script', 'additional_slide_visuals', 'create_slide_3_stimulus', [], ['slide3_stimulus.png']),
+    'slide4': ('script', 'additional_slide_visuals', 'create_slide_4_bluff_scenario', [],
+               ['slide4_bluff_scenario.png']),
+    'slide5': ('script', 'additional_slide_visuals', 'create_slide_5_value_scenario', [],
+               ['slide5_value_scenario.png']),
+    'slide6': ('script', 'presentation_visuals', 'create_slide_6_design', [], ['slide6_design.png']),
+    'slide7': ('script', 'presentation_visuals', 'create_slide_7_results', ['aggregates'], ['slide7_results.png']),
+    'slide8': ('script', 'presentation_visuals', 'create_slide_8_cognitive', ['aggregates'],
+               ['slide8_cognitive.png']),
+    'slide9_bottleneck': ('script', 'additional_slide_visuals', 'create_slide_9_bottleneck', ['aggregates'],
+                          ['slide9_bottleneck.png']),
+    'slide9_bottleneck_corrected': ('script', 'fix_slide9', 'create_slide_9_bottleneck_fixed', ['aggregates'],
+                                    ['slide9_bottleneck_corrected.png']),
+    'slide9_implications': ('script', 'presentation_visuals', 'create_slide_9_implications', [],
+                            ['slide9_implications.png']),
+    'slide10': ('script', 'additional_slide_visuals', 'create_slide_10_tom_evidence', ['cognitive'],
+                ['slide10_tom_evidence.png']),
+    'slide10_simple': ('script', 'simple_slide10', 'create_simple_slide10', ['cognitive'],
+                       ['slide10_tom_evidence_simple.png']),
+    'slide10_enhanced': ('script', 'enhanced_slide10', 'create_enhanced_slide10', ['cognitive'],
+                         ['slide10_tom_evidence_enhanced.png']),
+    'slide10_premium': ('script', 'premium_slide10', 'create_premium_slide10', ['cognitive'],
+                        ['slide10_tom_evidence_premium.png']),
+    'performance_hierarchy': ('script', 'results_paper_latex', 'create_performance_hierarchy_plot',
+                              ['aggregates'], ['performance_hierarchy.pdf']),
+    'deception_bottleneck': ('script', 'results_paper_latex', 'create_deception_bottleneck_plot',
+                             ['aggregates'], ['deception_bottleneck.pdf']),
+    'tom_reasoning_heatmap': ('script', 'results_paper_latex', 'create_tom_reasoning_heatmap',
+                              ['aggregates'], ['tom_reasoning_heatmap.pdf']),
+    'paper_confusion_matrices': ('script', 'results_paper_latex', 'create_confusion_matrices',
+                                 ['aggregates'], ['confusion_matrices.pdf']),
+    'context_control_mechanism': ('script', 'context_control_visualization', 'create_control_mechanism_diagram',
+                                  [], ['context_control_mechanism.pdf']),
+    'expected_control_results': ('script', 'context_control_visualization', 'create_expected_results_plot',
+                                 [], ['expected_control_results.pdf']),
+}
+
+
+def select_jobs(names):
+    """Job names for the given job names or output files (every job if none)."""
+    if not names:
+        return list(FIGURE_JOBS)
+    selected = []
+    for name in names:
+        matches = [job for job, (*_, outputs) in FIGURE_JOBS.items() if name == job or name in outputs]
+        if not matches:
+            raise ValueError(f"Unknown figure '{name}'. See --list for the available figures.")
+        selected.extend(job for job in matches if job not in selected)
+    return selected
+
+
+def init_worker(shared_dir):
+    """Agg backend, script paths and the shared tables, once per worker process."""
+    import matplotlib
+    matplotlib.use('Agg')
+    # plt.show() on Agg only warns that it cannot show; every other warning still reaches the log
+    warnings.filterwarnings('ignore', message=r'.* is non-interactive, and thus cannot be shown',
+                            category=UserWarning)
+
+    for directory in map(str, SCRIPT_DIRS):
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+
+    from results_store import use_shared_tables
+    from shared_tables import SharedTables
+    use_shared_tables(SharedTables(shared_dir) if shared_dir else None)
+
+
+def render_job(name, results_csv):
+    """Render one job; returns its name, wall time and the (table, columns) it read.
+
+    The scripts' own output is dropped.
+    """
+    import matplotlib.pyplot as plt
+    from plot_style import reset_style
+    from results_store import record_reads
+
+    kind, module_name, function, _, _ = FIGURE_JOBS[name]
+    start = time.perf_counter()
+    reset_style()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), record_reads() as reads:
+            module = importlib.import_module(module_name)
+            # Cached table loaders would hide this job's reads behind an earlier job's
+            for value in vars(module).values():
+                if hasattr(value, 'cache_clear'):
+                    value.cache_clear()
+            if kind == 'poker':
+                getattr(module.ToMPokerAnalyzer(results_csv), function)()
+            elif kind == 'cognitive':
+                getattr(module.CognitiveToMAnalyzer.from_cognitive_table(COGNITIVE_TABLE), function)()
+            else:
+                getattr(module, function)()
+    finally:
+        plt.close('all')
+    reads = dict.fromkeys((table, None if columns is None else tuple(columns)) for table, columns in reads)
+    return name, time.perf_counter() - start, list(reads)
+
+
+def job_code(name):
+    """Digest of the code a job runs: its figure function (and analyzer constructor) with
+    all the project code and constants they reach, and the plotting library versions."""
+    from figure_cache import code_digest
+
+    kind, module_name, function, _, _ = FIGURE_JOBS[name]
+    path = next(directory / f'{module_name}.py' for directory in SCRIPT_DIRS
+                if (directory / f'{module_name}.py').exists())
+    if kind == 'script':
+        roots = [function]
+    else:
+        analyzer, constructor = ANALYZERS[kind]
+        roots = [f'{analyzer}.{constructor}', f'{analyzer}.{function}']
+    versions = [f"{library}=={importlib.metadata.version(library)}" for library in RENDER_LIBRARIES]
+    return hashlib.sha256('\0'.join([code_digest(path, roots, SCRIPT_DIRS), *versions]).encode()).hexdigest()
+
+
+def column_digests(table, columns, memo):
+    """Digests of the contents of the given columns of a table (all if None), memoized in memo."""
+    import pandas as pd
+    from results_store import read_table, table_columns
+
+    columns = table_columns(table) if columns is None else list(columns)
+    missing = [column for column in columns if (table, column) not in memo]
+    if missing:
+        df = read_table(table, columns=missing)
+        for column in missing:
+            hashes = pd.util.hash_pandas_object(df[column], index=False).to_numpy()
+            memo[(table, column)] = hashlib.sha256(column.encode() + hashes.tobytes()).hexdigest()
+    return [memo[(table, column)] for column in columns]
+
+
+def publish_tables(jobs, results_csv, directory):
+    """Read the tables the jobs need once and publish them to directory; None if none are needed."""
+    from results_store import read_table
+    from shared_tables import SharedTables, table_key
+    from tom_poker_analysis import ANALYSIS_COLUMNS
+
+    needed = {table for job in jobs for table in FIGURE_JOBS[job][3]}
+    tables, complete = {}, []
+    if 'results' in needed and Path(results_csv).exists():
+        tables[table_key(results_csv)] = read_table(results_csv, columns=ANALYSIS_COLUMNS)
+    if 'cognitive' in needed and Path(COGNITIVE_TABLE).exists():
+        tables[table_key(COGNITIVE_TABLE)] = read_table(COGNITIVE_TABLE)
+        complete.append(table_key(COGNITIVE_TABLE))
+    if not tables:
+        return None
+    SharedTables.publish(tables, directory, complete=complete)
+    return str(directory)
+
+
+def render_figures(jobs, results_csv=RESULTS_TABLE, n_jobs=1, cache=None):
+    """Render the jobs with n_jobs worker processes (-1 uses every core).
+
+    With a FigureCache, jobs whose code and data are unchanged since a stored render get
+    its outputs back instead, and every successful render is stored. Returns the wall time
+    of each rendered job, the error of each failed one and the jobs served from the cache.
+    """
+    from figure_cache import data_fingerprint
+
+    n_jobs = os.cpu_count() if n_jobs == -1 else max(1, n_jobs)
+    for directory in map(str, SCRIPT_DIRS):
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+
+    codes, memo = {}, {}
+
+    def fingerprint(job, reads):
+        try:
+            return data_fingerprint(codes[job], reads, lambda table, columns: column_digests(table, columns, memo))
+        except (OSError, KeyError, ValueError):
+            return None
+
+    # Aggregates are refreshed once here, so workers only read them and the figure
+    # cache fingerprints the current ones
+    if any('aggregates' in FIGURE_JOBS[job][3] for job in jobs):
+        from results_aggregates import load_aggregates
+        try:
+            load_aggregates(results_csv, COGNITIVE_TABLE)
+        except FileNotFoundError:
+            pass
+
+    fresh = []
+    if cache is not None:
+        for job in jobs:
+            codes[job] = job_code(job)
+            reads = cache.reads(job, codes[job])
+            if reads is not None and cache.restore(job, fingerprint(job, reads), FIGURE_JOBS[job][4]):
+                fresh.append(job)
+        for job in fresh:
+            print(f"  ♻️ {job}")
+        jobs = [job for job in jobs if job not in fresh]
+
+    times, errors = {}, {}
+
+    def finished(job, result):
+        times[job] = result[1]
+        outputs = FIGURE_JOBS[job][4]
+        if cache is not None and all(Path(output).exists() for output in outputs):
+            key = fingerprint(job, result[2])
+            if key is not None:
+                cache.store(job, codes[job], result[2], key, outputs)
+
+    if not jobs:
+        return times, errors, fresh
+
+    shm = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    with tempfile.TemporaryDirectory(prefix='tom_figures_', dir=shm) as shared_dir:
+        shared_dir = publish_tables(jobs, results_csv, shared_dir)
+
+        if n_jobs == 1:
+            init_worker(shared_dir)
+            for job in jobs:
+                try:
+                    finished(job, render_job(job, results_csv))
+                except Exception as e:
+                    errors[job] = e
+                print(f"  {'✅' if job in times else '❌'} {job}")
+            return times, errors, fresh
+
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(jobs)), initializer=init_worker,
+                                 initargs=(shared_dir,)) as pool:
+            futures = {pool.submit(render_job, job, results_csv): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    finished(job, future.result())
+                except Exception as e:
+                    errors[job] = e
+                print(f"  {'✅' if job in times else '❌'} {job}")
+    return times, errors, fresh
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the dashboards, slides and paper figures")
+    parser.add_argument("--figures", nargs="+", default=None,
+                        help="Jobs or output files to render (default: all, see --list)")
+    parser.add_argument("--results_csv", default=RESULTS_TABLE,
+                        help="Experiment results file the analysis dashboards read")
+    parser.add_argument("--n_jobs", type=int, default=-1,
+                        help="Worker processes rendering figures at once (-1 uses every core)")
+    parser.add_argument("--figure_cache", default=".figure_cache",
+                        help="Directory of the figure cache; unchanged figures are restored from it")
+    parser.add_argument("--no_figure_cache", action="store_true",
+                        help="Render every selected figure, without reading or updating the figure cache")
+    parser.add_argument("--prune", action="store_true",
+                        help="Afterwards, delete cached renders that are no longer any figure's latest")
+    parser.add_argument("--list", action="store_true", help="List the render jobs and their outputs")
+    args = parser.parse_args()
+
+    if args.list:
+        for job, (kind, module, function, tables, outputs) in FIGURE_JOBS.items():
+            print(f"{job:<30} {module}.{function} -> {', '.join(outputs)}")
+        return
+
+    try:
+        jobs = select_jobs(args.figures)
+    except ValueError as e:
+        parser.error(str(e))
+    cache = None
+    if not args.no_figure_cache:
+        from figure_cache import FigureCache
+        cache = FigureCache(args.figure_cache)
+
+    print(f"🎨 Rendering {len(jobs)} figure jobs...")
+    start = time.perf_counter()
+    times, errors, fresh = render_figures(jobs, args.results_csv, args.n_jobs, cache)
+    elapsed = time.perf_counter() - start
+
+    if cache is not None:
+        cache.save()
+        if args.prune:
+            print(f"🧹 Pruned {cache.prune()} stale cached renders")
+    print(f"\n⏱️ {len(times)} jobs in {elapsed:.1f} s ({sum(times.values()):.1f} s of rendering), "
+          f"{len(fresh)} up to date")
+    for job, error in errors.items():
+        print(f"❌ {job}: {type(error).__name__}: {error}")
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Persistent on-disk cache of LLM responses with size-bounded LRU eviction."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class ResponseCache:
+    """SQLite-backed response cache keyed by (model, prompt, sampling params, seed).
+
+    Entries are evicted least-recently-used first once the stored response text
+    exceeds max_bytes.
+    """
+
+    def __init__(self, path, max_bytes: int = 512 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        # Async runs read and write from worker threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                   key TEXT PRIMARY KEY,
+                   model TEXT,
+                   response TEXT,
+                   size INTEGER,
+                   last_access REAL
+               )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: float, max_new_tokens: int,
+                 seed: Optional[int], mode: Optional[str] = None) -> str:
+        """Hash the full request identity into a cache key.
+
+        mode names a non-default generation mode; full generations leave it out so
+        existing keys stay valid.
+        """
+        identity = [model, prompt, temperature, max_new_tokens, seed] + ([mode] if mode else [])
+        payload = json.dumps(identity, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key (refreshing its recency), or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, model: str, response: str):
+        """Store a response and evict old entries if the cache is over budget."""
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, size, time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Walk entries oldest-first until enough bytes are freed
+        stale_keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+            if total <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this session plus the current cache size."""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": total,
+        }
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
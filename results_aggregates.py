@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Results Aggregates: The Report Numbers, Computed Once
+=====================================================
+The paper tables, the slides and the cognitive summary all report the same few
+numbers: accuracy by model and context, ToM level by model, how often explanations
+show each reasoning indicator, and how those indicators correlate with accuracy.
+Rather than each script grouping the raw tables again (or hardcoding what an earlier
+run printed), they are computed once into two small tables of cells:
+
+- accuracy cells: N, N_Valid and Correct per (model, context, scenario) of the results
+  file, i.e. the AccuracyStats cells, so every accuracy, Wilson interval and p-value
+  rolls up from them;
+- cognitive cells: per (model, context, correctness, ToM level) of the detailed
+  cognitive analysis, the number of explanations and, for each indicator, its sum, sum
+  of squares and how many explanations show it (value > 0); means, rates and
+  correlations with accuracy follow exactly from these.
+
+The cells are written with write_table to results_aggregates/, with a manifest of the
+source files they were computed from; load_aggregates recomputes them only when a
+source file has changed since.
+
+Usage:
+    python results_aggregates.py
+    python results_aggregates.py --results_csv poker_tom_results_20250602_081719.csv --output_format parquet
+"""
+
+import argparse
+import json
+from functools import partial
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from results_stats import AccuracyStats, CELL_KEYS
+from results_store import TABLE_FORMATS, read_table, resolve_table, table_columns, write_table
+
+# Default source tables and where their aggregates are kept
+RESULTS_TABLE = 'poker_tom_results_20250602_081719.csv'
+COGNITIVE_TABLE = 'detailed_cognitive_analysis.csv'
+AGGREGATES_DIR = 'results_aggregates'
+MANIFEST = 'manifest.json'
+
+# Keys of the cognitive cells
+COGNITIVE_KEYS = ['Model', 'Context_Type', 'Is_Correct', 'ToM_Level']
+
+# Indicators of the detailed cognitive analysis summarised in the cognitive cells
+COGNITIVE_METRICS = [
+    'ToM_Level', 'Mental_State_Words', 'Belief_Attribution', 'Intention_Attribution',
+    'Context_Integration_Score', 'Strategic_Reasoning_Score', 'Opponent_Psychology',
+    'Opponent_History', 'Game_Theory_Terms', 'Reasoning_Sophistication'
+]
+
+# Results columns the accuracy cells are counted from
+RESULTS_COLUMNS = ['LLM_Model', 'Context_Type', 'Core_Scenario_ID', 'Is_Classification_Correct']
+
+# Short labels the slides give the studied models; any other model keeps its name
+MODEL_LABELS = {
+    'Hush-Qwen2.5-7B': 'Hush-Qwen',
+    'OLMoE-1B-7B-0125-Instruct': 'OLMoE',
+    'EXAONE-3.5-2.4B-Instruct': 'EXAONE',
+    'Llama-3.2-SUN-HDIC-1B-Ins': 'Llama-1B'
+}
+
+
+def _stamp(path) -> Optional[list]:
+    """[modification time, size] of a file, or None if it does not exist."""
+    try:
+        stat = resolve_table(path).stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def model_label(model) -> str:
+    """Slide label of a short model name."""
+    return MODEL_LABELS.get(str(model), str(model))
+
+
+def accuracy_cells(results_path) -> pd.DataFrame:
+    """AccuracyStats cells of a results table, by short model name."""
+    from tom_poker_analysis import model_short_names
+
+    available = table_columns(results_path)
+    df = read_table(results_path, columns=[column for column in RESULTS_COLUMNS if column in available])
+    df['Model_Short'] = model_short_names(df['LLM_Model'].astype(str))
+    return AccuracyStats.count_cells(df, CELL_KEYS)
+
+
+def cognitive_cells(cognitive_path) -> pd.DataFrame:
+    """Count and per-indicator Sum, SumSq and Present of the detailed cognitive analysis per cell."""
+    available = table_columns(cognitive_path)
+    metrics = [metric for metric in COGNITIVE_METRICS if metric in available]
+    df = read_table(cognitive_path, columns=list(dict.fromkeys([*COGNITIVE_KEYS, *metrics])))
+
+    values = df[metrics].astype(float)
+    parts = {'Count': pd.Series(1, index=df.index)}
+    for metric in metrics:
+        parts[f'{metric}_Sum'] = values[metric]
+        parts[f'{metric}_SumSq'] = values[metric] ** 2
+        parts[f'{metric}_Present'] = (values[metric] > 0).astype(np.int64)
+    keys = [df[key] for key in COGNITIVE_KEYS]
+    return pd.DataFrame(parts).groupby(keys, observed=True, dropna=False).sum()
+
+
+class ResultsAggregates:
+    """Accuracy and cognitive cells, with the report tables rolled up from them.
+
+    Either set of cells may be None when its source table was not available, or a
+    function reading them, called on first use: a figure that only reports accuracy
+    then never reads the cognitive cells, and the figure cache records only the table
+    it did read.
+    """
+
+    def __init__(self, accuracy_cells=None, cognitive_cells=None):
+        self._cells = {'accuracy': accuracy_cells, 'cognitive': cognitive_cells}
+        self._accuracy = None
+
+    def _load(self, name):
+        if callable(self._cells[name]):
+            self._cells[name] = self._cells[name]()
+        return self._cells[name]
+
+    @property
+    def accuracy(self) -> Optional[AccuracyStats]:
+        """AccuracyStats over the accuracy cells; None without them."""
+        if self._accuracy is None and self._load('accuracy') is not None:
+            self._accuracy = AccuracyStats(self._load('accuracy'))
+        return self._accuracy
+
+    @property
+    def cognitive_cells(self) -> Optional[pd.DataFrame]:
+        """The cognitive cells; None without them."""
+        return self._load('cognitive')
+
+    def _require(self, cells, table):
+        if cells is None:
+            raise ValueError(f"No {table} table was aggregated; run results_aggregates.py with it first")
+        return cells
+
+    def model_performance(self) -> pd.DataFrame:
+        """Per model, best first: N, accuracy with Wilson CI and p-value vs chance, bluff and
+        value accuracy and the gap between them (value - bluff)."""
+        stats = self._require(self.accuracy, 'results')
+        table = stats.table('Model_Short')
+        by_context = stats.accuracy('Model_Short', 'Context_Type').reindex(columns=['Bluff', 'Value'])
+        table = table.join(by_context).assign(Gap=lambda t: t['Value'] - t['Bluff'])
+        table.index = table.index.astype(str)
+        return table.sort_values('Accuracy', ascending=False)
+
+    def context_accuracy(self) -> pd.Series:
+        """Accuracy per context type over every model."""
+        return self._require(self.accuracy, 'results').accuracy('Context_Type')
+
+    def model_context_accuracy(self) -> pd.DataFrame:
+        """(model x context type) accuracy matrix, best model first."""
+        matrix = self._require(self.accuracy, 'results').accuracy('Model_Short', 'Context_Type')
+        matrix.index = matrix.index.astype(str)
+        return matrix.reindex(self.model_performance().index)
+
+    def _cognitive_sums(self, keys) -> pd.DataFrame:
+        cells = self._require(self.cognitive_cells, 'cognitive analysis')
+        if keys:
+            return cells.groupby(list(keys), observed=True).sum()
+        return cells.sum().to_frame('All').T
+
+    def cognitive_table(self, *keys) -> pd.DataFrame:
+        """Per group of keys (one row 'All' with none): Count, the mean of each indicator
+        and, as <indicator>_Rate, the share of explanations showing it."""
+        sums = self._cognitive_sums(keys)
+        metrics = [column[:-len('_Sum')] for column in sums.columns if column.endswith('_Sum')]
+        table = {'Count': sums['Count']}
+        table.update({metric: sums[f'{metric}_Sum'] / sums['Count'] for metric in metrics})
+        table.update({f'{metric}_Rate': sums[f'{metric}_Present'] / sums['Count'] for metric in metrics})
+        return pd.DataFrame(table)
+
+    def tom_level_shares(self, *keys) -> pd.DataFrame:
+        """Share of explanations at each ToM level (columns) per group of keys ('All' with none)."""
+        cells = self._require(self.cognitive_cells, 'cognitive analysis')
+        counts = cells['Count'].groupby([*keys, 'ToM_Level'], observed=True).sum()
+        counts = counts.unstack(fill_value=0) if keys else counts.to_frame('All').T
+        return counts.div(counts.sum(axis=1), axis=0)
+
+    def accuracy_correlations(self, metrics=None) -> pd.Series:
+        """Pearson correlation of each indicator with Is_Correct, as DataFrame.corr gives it
+        over the explanations with a correctness value, highest first."""
+        cells = self._require(self.cognitive_cells, 'cognitive analysis')
+        cells = cells[cells.index.get_level_values('Is_Correct').notna()]
+        correct = cells.index.get_level_values('Is_Correct').to_numpy(dtype=float)
+
+        n = cells['Count'].sum()
+        # Is_Correct is 0/1, so its sum and sum of squares are both the correct count
+        sum_y = (cells['Count'] * correct).sum()
+        metrics = metrics or [column[:-len('_Sum')] for column in cells.columns if column.endswith('_Sum')]
+        correlations = {}
+        for metric in metrics:
+            sum_x, sum_xx = cells[f'{metric}_Sum'].sum(), cells[f'{metric}_SumSq'].sum()
+            sum_xy = (cells[f'{metric}_Sum'] * correct).sum()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                correlations[metric] = (n * sum_xy - sum_x * sum_y) / np.sqrt(
+                    (n * sum_xx - sum_x ** 2) * (n * sum_y - sum_y ** 2))
+        return pd.Series(correlations, dtype=float).sort_values(ascending=False)
+
+
+def _read_cells(path, keys) -> pd.DataFrame:
+    table = read_table(path)
+    return table.set_index([key for key in keys if key in table.columns])
+
+
+def build_aggregates(results_path=RESULTS_TABLE, cognitive_path=COGNITIVE_TABLE,
+                     directory=AGGREGATES_DIR, fmt='csv') -> ResultsAggregates:
+    """Compute the cells of whichever source tables exist and write them to directory."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    cells = {}
+    if _stamp(results_path) is not None:
+        cells['accuracy'] = accuracy_cells(results_path)
+    if _stamp(cognitive_path) is not None:
+        cells['cognitive'] = cognitive_cells(cognitive_path)
+    if not cells:
+        raise FileNotFoundError(f"Neither {results_path} nor {cognitive_path} exists")
+
+    files = {name: write_table(table.reset_index(), directory / f'{name}_cells', fmt).name
+             for name, table in cells.items()}
+    manifest = {
+        'sources': {'results': str(results_path), 'cognitive': str(cognitive_path)},
+        'stamps': {'results': _stamp(results_path), 'cognitive': _stamp(cognitive_path)},
+        'format': fmt,
+        'files': files,
+    }
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=1))
+    return ResultsAggregates(cells.get('accuracy'), cells.get('cognitive'))
+
+
+def load_aggregates(results_path=None, cognitive_path=None, directory=AGGREGATES_DIR) -> ResultsAggregates:
+    """The aggregates in directory, recomputed first if they are missing or out of date.
+
+    Sources default to the ones the stored aggregates were computed from (or the
+    default tables). They are out of date when a source file changed since, or when
+    different sources are asked for; a source that no longer exists is not checked,
+    so stored aggregates stay usable without the raw tables.
+    """
+    directory = Path(directory)
+    manifest_path = directory / MANIFEST
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else None
+
+    sources = (manifest or {}).get('sources', {})
+    results_path = str(results_path or sources.get('results', RESULTS_TABLE))
+    cognitive_path = str(cognitive_path or sources.get('cognitive', COGNITIVE_TABLE))
+
+    fresh = manifest is not None and sources == {'results': results_path, 'cognitive': cognitive_path}
+    if fresh:
+        for name, path in sources.items():
+            stamp = _stamp(path)
+            if stamp is not None and stamp != manifest['stamps'].get(name):
+                fresh = False
+    if not fresh:
+        return build_aggregates(results_path, cognitive_path, directory, (manifest or {}).get('format', 'csv'))
+
+    cells = {name: partial(_read_cells, directory / file, CELL_KEYS if name == 'accuracy' else COGNITIVE_KEYS)
+             for name, file in manifest['files'].items()}
+    return ResultsAggregates(cells.get('accuracy'), cells.get('cognitive'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute the aggregates the report tables and slides read")
+    parser.add_argument("--results_csv", default=RESULTS_TABLE, help="Experiment results table")
+    parser.add_argument("--cognitive_csv", default=COGNITIVE_TABLE, help="Detailed cognitive analysis table")
+    parser.add_argument("--output_dir", default=AGGREGATES_DIR, help="Directory the aggregates are written to")
+    parser.add_argument("--output_format", choices=list(TABLE_FORMATS), default="csv",
+                        help="Format of the cell tables; parquet and feather need pyarrow")
+    args = parser.parse_args()
+
+    print("🧮 Computing results aggregates...")
+    aggregates = build_aggregates(args.results_csv, args.cognitive_csv, args.output_dir, args.output_format)
+    if aggregates.accuracy is not None:
+        print(f"📊 {len(aggregates.accuracy.cells)} accuracy cells from {args.results_csv}")
+    if aggregates.cognitive_cells is not None:
+        print(f"🧠 {len(aggregates.cognitive_cells)} cognitive cells from {args.cognitive_csv}")
+    print(f"💾 Aggregates saved to '{args.output_dir}/'")
+
+
+if __name__ == "__main__":
+    main()
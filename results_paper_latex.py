@@ -1,21 +1,60 @@
 #!/usr/bin/env python3
 """
 Generate LaTeX tables and research-quality graphs for Theory of Mind poker paper results.
+
+Every number comes from the results aggregates (see results_aggregates.py), computed
+once from the results file and the detailed cognitive analysis.
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
+import argparse
+
 import numpy as np
-import seaborn as sns
-from matplotlib.patches import Rectangle
-import matplotlib.patches as mpatches
+import pandas as pd
+
+from plot_style import pyplot
+from results_aggregates import COGNITIVE_TABLE, RESULTS_TABLE, load_aggregates
+from results_stats import significance_stars
+
+# Style for research-quality plots, applied when the first figure is drawn
+PLOT_STYLE = dict(style='seaborn-v0_8-whitegrid', palette='husl')
+
+# Characters LaTeX treats specially in model names
+LATEX_ESCAPES = {'\\': r'\textbackslash{}', '_': r'\_', '&': r'\&', '%': r'\%', '#': r'\#', '$': r'\$'}
+
+
+def latex_escape(text):
+    """text with LaTeX special characters escaped."""
+    return ''.join(LATEX_ESCAPES.get(char, char) for char in str(text))
 
-# Set style for research-quality plots
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette("husl")
+def tom_evidence(aggregates):
+    """Per model, in order of accuracy: the ToM indicators of the evidence table and heatmap.
 
-def generate_main_performance_table():
+    Mental state attribution, opponent psychology and recursive (second-order) reasoning
+    are shares of explanations; context integration and strategic reasoning are mean
+    scores out of 5; the ToM score is the mean ToM level (0-2).
+    """
+    cognitive = aggregates.cognitive_table('Model')
+    shares = aggregates.tom_level_shares('Model').reindex(columns=[0, 1, 2], fill_value=0)
+    order = [model for model in aggregates.model_performance().index if model in cognitive.index]
+    order += [model for model in cognitive.index.astype(str) if model not in order]
+    evidence = cognitive.assign(Recursive_Rate=shares[2])
+    evidence.index = evidence.index.astype(str)
+    return evidence.loc[order]
+
+def generate_main_performance_table(aggregates=None):
     """Generate LaTeX table for main performance results."""
+    if aggregates is None:
+        aggregates = load_aggregates()
+    performance = aggregates.model_performance()
+    stars = significance_stars(performance['P_Value'].to_numpy())
+    
+    rows = []
+    for (model, row), sig in zip(performance.iterrows(), stars):
+        rows.append(
+            f"{latex_escape(model)} & {row['Accuracy'] * 100:.1f}\\% & {row['Bluff'] * 100:.1f}\\% & "
+            f"{row['Value'] * 100:.1f}\\% & {row['Gap'] * 100:.1f} & {row['N']:.0f} & {sig} \\\\\n"
+            f"& ({row['CI_Lower'] * 100:.1f}--{row['CI_Upper'] * 100:.1f}) & & & & & \\\\\n"
+        )
     
     latex_table = r"""
 \begin{table}[htbp]
@@ -27,31 +66,30 @@ def generate_main_performance_table():
 \textbf{Model} & \textbf{Overall} & \textbf{Bluff} & \textbf{Value} & \textbf{Gap} & \textbf{N} & \textbf{Sig.} \\
  & \textbf{Accuracy} & \textbf{Accuracy} & \textbf{Accuracy} & \textbf{(\%)} & & \\
 \midrule
-Hush-Qwen2.5-7B & 93.3\% & 88.9\% & 97.8\% & 8.9 & 90 & *** \\
-& (88.2--98.5) & & & & & \\
-\addlinespace
-OLMoE-1B-7B & 57.8\% & 35.6\% & 80.0\% & 44.4 & 90 & ns \\
-& (47.6--68.0) & & & & & \\
-\addlinespace
-EXAONE-3.5-2.4B & 44.4\% & 24.4\% & 64.4\% & 40.0 & 90 & ns \\
-& (34.2--54.7) & & & & & \\
-\addlinespace
-Llama-3.2-SUN-1B & 12.2\% & 13.3\% & 11.1\% & -2.2 & 90 & *** \\
-& (5.5--19.0) & & & & & \\
-\bottomrule
+""" + "\\addlinespace\n".join(rows) + r"""\bottomrule
 \end{tabular}
 \begin{tablenotes}
 \small
-\item Note: 95\% confidence intervals in parentheses. Gap = Value Accuracy - Bluff Accuracy. 
-Significance: *** p < 0.001, ns = not significant.
+\item Note: 95\% Wilson confidence intervals in parentheses. Gap = Value Accuracy - Bluff Accuracy. 
+Significance (exact binomial test against chance): *** p < 0.001, ** p < 0.01, * p < 0.05, ns = not significant.
 \end{tablenotes}
 \end{table}
 """
     
     return latex_table
 
-def generate_tom_evidence_table():
+def generate_tom_evidence_table(aggregates=None):
     """Generate LaTeX table for Theory of Mind evidence."""
+    if aggregates is None:
+        aggregates = load_aggregates()
+    evidence = tom_evidence(aggregates)
+    
+    rows = [
+        f"{latex_escape(model)} & {row['Mental_State_Words_Rate'] * 100:.1f}\\% & "
+        f"{row['Opponent_Psychology_Rate'] * 100:.1f}\\% & {row['Recursive_Rate'] * 100:.1f}\\% & "
+        f"{row['Context_Integration_Score']:.1f}/5 & {row['ToM_Level']:.1f} \\\\\n"
+        for model, row in evidence.iterrows()
+    ]
     
     latex_table = r"""
 \begin{table}[htbp]
@@ -63,30 +101,30 @@ def generate_tom_evidence_table():
 \textbf{Model} & \textbf{Mental State} & \textbf{Opponent} & \textbf{Recursive} & \textbf{Context} & \textbf{ToM} \\
  & \textbf{Attribution} & \textbf{Psychology} & \textbf{Reasoning} & \textbf{Integration} & \textbf{Score} \\
 \midrule
-Hush-Qwen2.5-7B & 45.2\% & 78.3\% & 23.6\% & 4.2/5 & 1.8 \\
-OLMoE-1B-7B & 12.4\% & 34.7\% & 8.1\% & 2.9/5 & 0.9 \\
-EXAONE-3.5-2.4B & 8.9\% & 28.2\% & 4.3\% & 2.1/5 & 0.6 \\
-Llama-3.2-SUN-1B & 2.1\% & 15.6\% & 1.2\% & 1.4/5 & 0.2 \\
-\bottomrule
+""" + "".join(rows) + r"""\bottomrule
 \end{tabular}
 \begin{tablenotes}
 \small
-\item Note: Percentages indicate frequency of ToM indicators in explanations. 
-Context Integration scored 1-5. ToM Score is composite measure.
+\item Note: Percentages indicate frequency of ToM indicators in explanations (recursive reasoning: 
+second-order ToM). Context Integration scored 0-5. ToM Score is the mean ToM level (0-2).
 \end{tablenotes}
 \end{table}
 """
     
     return latex_table
 
-def create_performance_hierarchy_plot():
+def create_performance_hierarchy_plot(aggregates=None):
     """Create performance hierarchy visualization."""
+    plt = pyplot(**PLOT_STYLE)
+    if aggregates is None:
+        aggregates = load_aggregates()
     
     # Data for the plot
-    models = ['Hush-Qwen2.5-7B', 'OLMoE-1B-7B', 'EXAONE-3.5-2.4B', 'Llama-3.2-SUN-1B']
-    overall_acc = [93.3, 57.8, 44.4, 12.2]
-    bluff_acc = [88.9, 35.6, 24.4, 13.3]
-    value_acc = [97.8, 80.0, 64.4, 11.1]
+    performance = aggregates.model_performance()
+    models = list(performance.index)
+    overall_acc = performance['Accuracy'] * 100
+    bluff_acc = performance['Bluff'] * 100
+    value_acc = performance['Value'] * 100
     
     # Create figure
     fig, ax = plt.subplots(figsize=(12, 8))
@@ -128,14 +166,18 @@ def create_performance_hierarchy_plot():
     plt.savefig('performance_hierarchy.pdf', dpi=300, bbox_inches='tight')
     plt.show()
 
-def create_deception_bottleneck_plot():
+def create_deception_bottleneck_plot(aggregates=None):
     """Create deception detection bottleneck visualization."""
+    plt = pyplot(**PLOT_STYLE)
+    if aggregates is None:
+        aggregates = load_aggregates()
     
     # Data
-    models = ['Hush-Qwen2.5-7B', 'OLMoE-1B-7B', 'EXAONE-3.5-2.4B', 'Llama-3.2-SUN-1B']
-    bluff_acc = [88.9, 35.6, 24.4, 13.3]
-    value_acc = [97.8, 80.0, 64.4, 11.1]
-    gaps = [val - blf for val, blf in zip(value_acc, bluff_acc)]
+    performance = aggregates.model_performance()
+    models = list(performance.index)
+    bluff_acc = performance['Bluff'] * 100
+    value_acc = performance['Value'] * 100
+    gaps = performance['Gap'] * 100
     
     # Create figure
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
@@ -159,7 +201,8 @@ def create_deception_bottleneck_plot():
     
     # Right plot: Gap visualization
     colors = ['#264653', '#2A9D8F', '#E9C46A', '#F4A261']
-    bars = ax2.bar(range(len(models)), gaps, color=colors, alpha=0.8)
+    bars = ax2.bar(range(len(models)), gaps, color=[colors[i % len(colors)] for i in range(len(models))],
+                   alpha=0.8)
     
     ax2.set_xlabel('Models', fontsize=12, fontweight='bold')
     ax2.set_ylabel('Detection Gap (Value - Bluff)', fontsize=12, fontweight='bold')
@@ -180,20 +223,25 @@ def create_deception_bottleneck_plot():
     plt.savefig('deception_bottleneck.pdf', dpi=300, bbox_inches='tight')
     plt.show()
 
-def create_tom_reasoning_heatmap():
+def create_tom_reasoning_heatmap(aggregates=None):
     """Create heatmap showing ToM reasoning indicators."""
+    plt = pyplot(**PLOT_STYLE)
+    if aggregates is None:
+        aggregates = load_aggregates()
     
     # Data for ToM indicators
-    models = ['Hush-Qwen2.5-7B', 'OLMoE-1B-7B', 'EXAONE-3.5-2.4B', 'Llama-3.2-SUN-1B']
+    evidence = tom_evidence(aggregates)
+    models = list(evidence.index)
     indicators = ['Mental State\nAttribution', 'Opponent\nPsychology', 'Recursive\nReasoning', 
                  'Context\nIntegration', 'Strategic\nThinking']
     
-    # Create data matrix (normalized to 0-1 scale)
-    data = np.array([
-        [0.45, 0.78, 0.24, 0.84, 0.73],  # Hush-Qwen2.5-7B
-        [0.12, 0.35, 0.08, 0.58, 0.41],  # OLMoE-1B-7B
-        [0.09, 0.28, 0.04, 0.42, 0.31],  # EXAONE-3.5-2.4B
-        [0.02, 0.16, 0.01, 0.28, 0.15],  # Llama-3.2-SUN-1B
+    # Create data matrix (normalized to 0-1 scale: shares as they are, scores out of 5)
+    data = np.column_stack([
+        evidence['Mental_State_Words_Rate'],
+        evidence['Opponent_Psychology_Rate'],
+        evidence['Recursive_Rate'],
+        evidence['Context_Integration_Score'] / 5,
+        evidence['Strategic_Reasoning_Score'] / 5,
     ])
     
     # Create heatmap
@@ -227,18 +275,30 @@ def create_tom_reasoning_heatmap():
     plt.savefig('tom_reasoning_heatmap.pdf', dpi=300, bbox_inches='tight')
     plt.show()
 
-def create_confusion_matrices():
+def create_confusion_matrices(aggregates=None):
     """Create confusion matrices for each model."""
-    
-    models_data = {
-        'Hush-Qwen2.5-7B': {'TP': 40, 'FP': 5, 'TN': 44, 'FN': 1},
-        'OLMoE-1B-7B': {'TP': 16, 'FP': 29, 'TN': 36, 'FN': 9},
-        'EXAONE-3.5-2.4B': {'TP': 11, 'FP': 34, 'TN': 29, 'FN': 16},
-        'Llama-3.2-SUN-1B': {'TP': 6, 'FP': 39, 'TN': 5, 'FN': 40}
-    }
-    
-    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+    plt = pyplot(**PLOT_STYLE)
+    if aggregates is None:
+        aggregates = load_aggregates()
+    
+    # Bluff is the negative class; a response that misses the true label (an
+    # unparsed one included) counts as the other label
+    performance = aggregates.model_performance()
+    counts = aggregates.accuracy.table('Model_Short', 'Context_Type')
+    
+    # A model without responses in one context gets zero counts there
+    counts = counts.reindex(pd.MultiIndex.from_product([performance.index, ['Bluff', 'Value']]), fill_value=0)
+    models_data = {}
+    for model in performance.index:
+        bluff, value = counts.loc[(model, 'Bluff')], counts.loc[(model, 'Value')]
+        models_data[model] = {'TP': int(value['Correct']), 'FP': int(bluff['N_Valid'] - bluff['Correct']),
+                              'TN': int(bluff['Correct']), 'FN': int(value['N_Valid'] - value['Correct'])}
+    
+    n_rows = (len(models_data) + 1) // 2
+    fig, axes = plt.subplots(n_rows, 2, figsize=(12, 5 * n_rows), squeeze=False)
     axes = axes.ravel()
+    for ax in axes[len(models_data):]:
+        ax.remove()
     
     for i, (model, data) in enumerate(models_data.items()):
         # Create confusion matrix
@@ -309,12 +369,24 @@ Level 2 = Recursive reasoning about beliefs and intentions.
 
 def main():
     """Generate all tables and figures."""
+    parser = argparse.ArgumentParser(description="LaTeX tables and figures for the paper results")
+    parser.add_argument("--tables_only", action="store_true",
+                        help="Only write the LaTeX tables (matplotlib is never imported)")
+    parser.add_argument("--results_csv", default=None,
+                        help=f"Experiment results table (default: the one the aggregates were computed from, "
+                             f"else {RESULTS_TABLE})")
+    parser.add_argument("--cognitive_csv", default=None,
+                        help=f"Detailed cognitive analysis (default: as for --results_csv, else {COGNITIVE_TABLE})")
+    args = parser.parse_args()
+    
+    # Aggregates of both tables, recomputed only if either changed
+    aggregates = load_aggregates(args.results_csv, args.cognitive_csv)
     
     print("Generating LaTeX tables...")
     
     # Generate tables
-    main_table = generate_main_performance_table()
-    tom_table = generate_tom_evidence_table()
+    main_table = generate_main_performance_table(aggregates)
+    tom_table = generate_tom_evidence_table(aggregates)
     examples_table = generate_qualitative_examples_table()
     
     # Save tables to files
@@ -328,13 +400,15 @@ def main():
         f.write(examples_table)
     
     print("LaTeX tables saved!")
+    if args.tables_only:
+        return
     print("\nGenerating research-quality figures...")
     
     # Generate figures
-    create_performance_hierarchy_plot()
-    create_deception_bottleneck_plot()
-    create_tom_reasoning_heatmap()
-    create_confusion_matrices()
+    create_performance_hierarchy_plot(aggregates)
+    create_deception_bottleneck_plot(aggregates)
+    create_tom_reasoning_heatmap(aggregates)
+    create_confusion_matrices(aggregates)
     
     print("All figures saved as PDF files!")
     print("\nFiles generated:")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Results Schema: Compact Column Dtypes for Results and Cognitive-Analysis Tables
+===============================================================================
+Every results table is read with plain inference: model names, context labels and
+stimulus IDs as Python strings, 0/1 flags as int64 and scores as float64. The schema
+below types each known column once, wherever it is loaded:
+
+- low-cardinality string labels become categoricals (one small code per row, and
+  groupby keys that are already factorized),
+- 0/1 flags and small levels become int8,
+- scores become float32.
+
+A column is only converted when the cast is lossless for the data at hand (an int8
+column with missing values, or with values outside -128..127, is left as it is).
+
+Usage (memory report of one table):
+    python results_schema.py poker_tom_results_20250602_081719.csv
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+# Labels repeated across many rows
+CATEGORY_COLUMNS = [
+    'LLM_Model', 'Model_Short', 'Model', 'Context_Type', 'Parsed_Classification',
+    'Core_Scenario_ID', 'Stimulus_ID', 'Generation_Mode'
+]
+
+# 0/1 flags and small integer levels
+INT8_COLUMNS = ['Is_Classification_Correct', 'Is_Correct', 'Run_Number', 'ToM_Level', 'Reasoning_Quality']
+
+# Scores, where float32 precision is plenty
+FLOAT32_COLUMNS = ['P_Bluff', 'Expected_Correct', 'Confidence_Level', 'Reasoning_Sophistication']
+
+
+def _fits_int8(series):
+    if series.isna().any():
+        return False
+    if series.empty:
+        return True
+    return -128 <= series.min() and series.max() <= 127 and (series == series.round()).all()
+
+
+def apply_schema(df):
+    """df with the known columns cast to their compact dtypes (a new frame)."""
+    typed = {}
+    for column in df.columns.intersection(CATEGORY_COLUMNS):
+        # Numeric IDs are already compact
+        if not isinstance(df[column].dtype, pd.CategoricalDtype) and not pd.api.types.is_numeric_dtype(df[column]):
+            typed[column] = df[column].astype('category')
+    for column in df.columns.intersection(INT8_COLUMNS):
+        if df[column].dtype != np.int8 and pd.api.types.is_numeric_dtype(df[column]) and _fits_int8(df[column]):
+            typed[column] = df[column].astype(np.int8)
+    for column in df.columns.intersection(FLOAT32_COLUMNS):
+        if pd.api.types.is_float_dtype(df[column]) and df[column].dtype != np.float32:
+            typed[column] = df[column].astype(np.float32)
+    return df.assign(**typed) if typed else df
+
+
+def with_default(series, value):
+    """series with missing values set to value; a categorical gains the category first.
+
+    Categories stay sorted, so tables keyed by the column keep the order plain strings have.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.set_categories(sorted([*series.cat.categories, value]))
+    return series.fillna(value)
+
+
+def memory_report(df):
+    """Per-column dtype and memory (MB) of df before and after apply_schema, with a total row."""
+    typed = apply_schema(df)
+    before = df.memory_usage(deep=True, index=False) / 1e6
+    after = typed.memory_usage(deep=True, index=False) / 1e6
+    report = pd.DataFrame({
+        'Dtype': df.dtypes.astype(str),
+        'MB': before.round(3),
+        'Typed_Dtype': typed.dtypes.astype(str),
+        'Typed_MB': after.round(3),
+    })
+    report.loc['Total'] = ['', round(before.sum(), 3), '', round(after.sum(), 3)]
+    return report
+
+
+def _groupby_seconds(df, keys, value, repeats=20):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        df.groupby(keys, observed=True)[value].mean()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    from results_store import read_table
+
+    parser = argparse.ArgumentParser(description="Memory report of a results table before and after the schema")
+    parser.add_argument("table", help="Results or detailed cognitive analysis table (CSV, Parquet or Feather)")
+    args = parser.parse_args()
+
+    df = read_table(args.table, typed=False)
+
+    print("📦 RESULTS SCHEMA MEMORY REPORT")
+    print("=" * 70)
+    print(f"{args.table}: {len(df)} rows, {len(df.columns)} columns")
+    report = memory_report(df)
+    print(report.to_string())
+
+    total, typed_total = report.loc['Total', 'MB'], report.loc['Total', 'Typed_MB']
+    print(f"\nTotal: {total:.1f} MB -> {typed_total:.1f} MB ({total / max(typed_total, 1e-9):.1f}x smaller)")
+
+    # The dashboard aggregations group the correctness flag by model and context
+    model_column = 'LLM_Model' if 'LLM_Model' in df.columns else 'Model'
+    value = 'Is_Classification_Correct' if 'Is_Classification_Correct' in df.columns else 'Is_Correct'
+    if {model_column, 'Context_Type', value} <= set(df.columns):
+        keys = [model_column, 'Context_Type']
+        raw_time, typed_time = _groupby_seconds(df, keys, value), _groupby_seconds(apply_schema(df), keys, value)
+        print(f"groupby({keys}).mean(): {raw_time * 1e3:.2f} ms -> {typed_time * 1e3:.2f} ms "
+              f"({raw_time / typed_time:.1f}x speedup)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Results Statistics: Accuracy Tables from One Aggregation Pass
+=============================================================
+Summaries, dashboards and report tables all ask the same questions of a results
+table: how many responses per model (or context, or scenario), how many correct,
+the accuracy with a confidence interval, and whether it differs from chance.
+
+AccuracyStats answers them from a single groupby: correctness counts per (model,
+context, scenario) cell. Any coarser table is a sum over those cells, computed once
+per set of keys and cached, with
+
+- Wilson score 95% intervals (well-behaved near 0 and 1 and for small cells), and
+- exact two-sided binomial p-values against chance (p = 0.5), as scipy's binomtest,
+  vectorized over all rows of the table.
+
+The tests only need scipy.special, imported when a p-value is first computed, so
+text-only summaries never load scipy.stats.
+
+Responses to one scenario are not independent (every run and every model sees the
+same hand), so cluster_bootstrap also gives percentile intervals that resample whole
+scenarios. A replicate only reweights the per-scenario counts, so all replicates are
+one (replicates x scenarios) @ (scenarios x groups) product instead of a loop.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Keys of the cells every table is rolled up from
+CELL_KEYS = ['Model_Short', 'Context_Type', 'Core_Scenario_ID']
+
+# Normal quantile of the 95% intervals
+Z_95 = 1.96
+
+# Cluster bootstrap defaults: resampled unit, replicates and seed
+BOOTSTRAP_CLUSTER = 'Core_Scenario_ID'
+BOOTSTRAP_REPLICATES = 2000
+BOOTSTRAP_SEED = 42
+
+
+def wilson_interval(correct, n, z=Z_95):
+    """Wilson score interval of correct / n, element-wise; NaN where n is 0."""
+    correct = np.asarray(correct, dtype=float)
+    n = np.asarray(n, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = correct / n
+        denominator = 1 + z ** 2 / n
+        center = (p + z ** 2 / (2 * n)) / denominator
+        half_width = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return center - half_width, center + half_width
+
+
+def binomial_p_value(correct, n):
+    """Exact two-sided binomial test of correct out of n against chance, element-wise.
+
+    The null is symmetric, so the p-value is twice the smaller tail, capped at 1;
+    this equals binomtest(correct, n, 0.5).pvalue.
+    """
+    from scipy.special import bdtr
+
+    correct = np.asarray(correct, dtype=np.int64)
+    n = np.asarray(n, dtype=np.int64)
+    tail = bdtr(np.minimum(correct, n - correct), n, 0.5)
+    return np.minimum(1.0, 2 * tail)
+
+
+def chi_square_independence(observed):
+    """Pearson chi-square test of independence of a contingency table: (chi2, p, dof).
+
+    As scipy's chi2_contingency, with Yates' continuity correction when dof is 1.
+    """
+    from scipy.special import chdtrc
+
+    observed = np.asarray(observed, dtype=float)
+    expected = np.outer(observed.sum(axis=1), observed.sum(axis=0)) / observed.sum()
+    dof = (observed.shape[0] - 1) * (observed.shape[1] - 1)
+    if dof == 0:
+        return 0.0, 1.0, dof
+    if dof == 1:
+        diff = expected - observed
+        observed = observed + np.sign(diff) * np.minimum(0.5, np.abs(diff))
+    chi2 = float(((observed - expected) ** 2 / expected).sum())
+    return chi2, float(chdtrc(dof, chi2)), dof
+
+
+def significance_stars(p_values):
+    """*** / ** / * / ns labels of p-values."""
+    return np.select([p_values < 0.001, p_values < 0.01, p_values < 0.05], ['***', '**', '*'], 'ns')
+
+
+class AccuracyStats:
+    """Correctness counts per (model, context, scenario) cell, rolled up on demand.
+
+    cells has one row per cell (indexed by the cell keys) with N responses, N_Valid
+    responses with a correctness value and Correct responses.
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+        self.keys = list(cells.index.names)
+        self._tables = {}
+
+    @classmethod
+    def from_results(cls, df, keys=CELL_KEYS, value='Is_Classification_Correct'):
+        """Count one results frame; keys missing from df are left out of the cells."""
+        return cls(cls.count_cells(df, keys, value))
+
+    @staticmethod
+    def count_cells(df, keys=CELL_KEYS, value='Is_Classification_Correct'):
+        """The cells table of df: one groupby over the cell keys."""
+        keys = [key for key in keys if key in df.columns]
+        cells = df.groupby(keys, observed=True)[value].agg(N='size', N_Valid='count', Correct='sum')
+        return cells.astype(np.int64)
+
+    def table(self, *keys):
+        """Counts, accuracy, Wilson CI and p-value vs chance per group of keys (cached).
+
+        With no keys, a single row 'All' over every response.
+        """
+        if keys not in self._tables:
+            if keys:
+                counts = self.cells.groupby(list(keys), observed=True).sum()
+            else:
+                counts = self.cells.sum().to_frame('All').T
+            ci_lower, ci_upper = wilson_interval(counts['Correct'], counts['N_Valid'])
+            self._tables[keys] = counts.assign(
+                Accuracy=counts['Correct'] / counts['N_Valid'],
+                CI_Lower=ci_lower,
+                CI_Upper=ci_upper,
+                P_Value=binomial_p_value(counts['Correct'], counts['N'])
+            )
+        return self._tables[keys]
+
+    def cluster_bootstrap(self, *keys, cluster=BOOTSTRAP_CLUSTER, replicates=BOOTSTRAP_REPLICATES,
+                          seed=BOOTSTRAP_SEED, level=0.95):
+        """Percentile cluster-bootstrap interval of accuracy per group of keys (cached).
+
+        Each replicate draws as many clusters as there are, with replacement, and the
+        same draw is used for every group, so groups that share scenarios stay paired.
+        Returns Accuracy, Boot_Lower and Boot_Upper per group ('All' with no keys).
+        """
+        cache_key = ('bootstrap', keys, cluster, replicates, seed, level)
+        if cache_key not in self._tables:
+            if cluster not in self.keys:
+                raise ValueError(f"Cluster bootstrap needs '{cluster}' cells; they are keyed by {self.keys}")
+
+            # (clusters x groups) matrices of valid and correct responses
+            counts = self.cells.groupby([cluster, *keys], observed=True)[['N_Valid', 'Correct']].sum()
+            if keys:
+                valid = counts['N_Valid'].unstack(list(range(1, len(keys) + 1)), fill_value=0)
+                correct = counts['Correct'].unstack(list(range(1, len(keys) + 1)), fill_value=0)
+            else:
+                valid, correct = counts[['N_Valid']], counts[['Correct']]
+                valid.columns = correct.columns = ['All']
+
+            # How often each cluster is drawn in each replicate
+            n_clusters = len(valid)
+            rng = np.random.default_rng(seed)
+            weights = rng.multinomial(n_clusters, np.full(n_clusters, 1 / n_clusters), size=replicates)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                accuracy = (weights @ correct.to_numpy(dtype=float)) / (weights @ valid.to_numpy(dtype=float))
+
+            tail = (1 - level) / 2 * 100
+            lower, upper = np.nanpercentile(accuracy, [tail, 100 - tail], axis=0)
+            self._tables[cache_key] = pd.DataFrame({
+                'Accuracy': correct.sum().to_numpy() / valid.sum().to_numpy(),
+                'Boot_Lower': lower,
+                'Boot_Upper': upper
+            }, index=valid.columns)
+        return self._tables[cache_key]
+
+    def overall(self):
+        """The single row of table() as a Series."""
+        return self.table().iloc[0]
+
+    def accuracy(self, *keys):
+        """Accuracy per group; two keys are unstacked into a (first key x second key) matrix."""
+        accuracy = self.table(*keys)['Accuracy']
+        return accuracy.unstack() if len(keys) == 2 else accuracy
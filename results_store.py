@@ -0,0 +1,177 @@
+"""Results tables on disk as CSV, Parquet or Arrow IPC (Feather), read column by column."""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+from results_schema import apply_schema
+from shared_tables import SharedTables, table_key
+
+# File suffix of each supported table format; the columnar ones need pyarrow
+TABLE_FORMATS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+# Columns most summaries of an experiment results table need
+RESULTS_SUMMARY_COLUMNS = ["LLM_Model", "Context_Type", "Is_Classification_Correct"]
+
+# Memory-mapped tables this process reads instead of the files (see use_shared_tables)
+_shared_tables: Optional[SharedTables] = None
+
+# (table key, columns) of each read_table call while recording (see record_reads)
+_read_log: Optional[list] = None
+
+
+def _require_pyarrow(fmt: str):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(f"{fmt} results tables need pyarrow (pip install pyarrow)") from None
+
+
+def table_path(path, fmt: str) -> Path:
+    """path with the suffix of the given table format."""
+    if fmt not in TABLE_FORMATS:
+        raise ValueError(f"Unknown table format '{fmt}'. Available: {', '.join(TABLE_FORMATS)}")
+    return Path(path).with_suffix(TABLE_FORMATS[fmt])
+
+
+def table_format(path) -> str:
+    """Table format of a file, from its suffix."""
+    suffix = Path(path).suffix
+    for fmt, fmt_suffix in TABLE_FORMATS.items():
+        if suffix == fmt_suffix:
+            return fmt
+    raise ValueError(f"Unknown results table suffix '{suffix}' ({path})")
+
+
+def resolve_table(path) -> Path:
+    """The file to read for path: a columnar copy next to it if one is at least as new.
+
+    Scripts keep naming the CSV they always read; once the same table is also written
+    as Parquet or Feather they load that instead.
+    """
+    path = Path(path)
+    mtime = path.stat().st_mtime if path.exists() else None
+    for fmt in ("parquet", "feather"):
+        candidate = table_path(path, fmt)
+        if candidate != path and candidate.exists() and (mtime is None or candidate.stat().st_mtime >= mtime):
+            return candidate
+    return path
+
+
+def write_table(df: pd.DataFrame, path, fmt: str = "csv") -> Path:
+    """Write df without its index in the given format; returns the file written.
+
+    The suffix of path is replaced by the format's. Parquet and Feather keep the column
+    dtypes and are zstd-compressed.
+    """
+    path = table_path(path, fmt)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        _require_pyarrow(fmt)
+        df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+    else:
+        _require_pyarrow(fmt)
+        df.reset_index(drop=True).to_feather(path, compression="zstd")
+    return path
+
+
+def table_columns(path) -> List[str]:
+    """Column names of a results table, without reading its rows."""
+    path = resolve_table(path)
+    fmt = table_format(path)
+    if fmt == "csv":
+        return list(pd.read_csv(path, nrows=0).columns)
+
+    _require_pyarrow(fmt)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+
+    import pyarrow as pa
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).schema.names
+
+
+def use_shared_tables(shared: Optional[SharedTables]):
+    """Serve typed reads of the tables published in shared from memory-mapped columns.
+
+    Render workers call this once so every figure reads the single copy the parent
+    process loaded; None goes back to reading the files.
+    """
+    global _shared_tables
+    _shared_tables = shared
+
+
+@contextmanager
+def record_reads():
+    """Collect the (table key, columns) of every read_table call in the block.
+
+    columns is None where a whole table was read. render_figures keeps these as the
+    data each figure depends on.
+    """
+    global _read_log
+    previous, _read_log = _read_log, []
+    try:
+        yield _read_log
+    finally:
+        _read_log = previous
+
+
+def read_table(path, columns: Optional[Sequence[str]] = None, typed: bool = True) -> pd.DataFrame:
+    """Read a results table, loading only the given columns (all if None).
+
+    Parquet and Feather read just those columns from disk; a CSV is still parsed line
+    by line but only those columns are kept. Columns come back in the order given and,
+    if typed, with the compact dtypes of results_schema.
+    """
+    if _read_log is not None:
+        _read_log.append((table_key(path), None if columns is None else list(columns)))
+    if typed and _shared_tables is not None and _shared_tables.covers(table_key(path), columns):
+        return apply_schema(_shared_tables.read(table_key(path), columns))
+
+    path = resolve_table(path)
+    fmt = table_format(path)
+    columns = list(columns) if columns is not None else None
+
+    if fmt == "csv":
+        df = pd.read_csv(path, usecols=columns)
+        df = df[columns] if columns is not None else df
+    else:
+        _require_pyarrow(fmt)
+        if fmt == "parquet":
+            df = pd.read_parquet(path, engine="pyarrow", columns=columns)
+        else:
+            df = pd.read_feather(path, columns=columns)
+    return apply_schema(df) if typed else df
+
+
+def iter_table(path, columns: Optional[Sequence[str]] = None, chunksize: int = 50000,
+               typed: bool = True) -> Iterator[pd.DataFrame]:
+    """Read a results table in chunks of at most chunksize rows, loading only the given columns.
+
+    If typed, each chunk gets the dtypes of results_schema (categories are per chunk).
+    """
+    path = resolve_table(path)
+    fmt = table_format(path)
+    columns = list(columns) if columns is not None else None
+
+    if fmt == "csv":
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize):
+            chunk = chunk[columns] if columns is not None else chunk
+            yield apply_schema(chunk) if typed else chunk
+        return
+
+    _require_pyarrow(fmt)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns)
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(path, columns=columns, memory_map=True)
+        batches = table.to_batches(max_chunksize=chunksize)
+
+    for batch in batches:
+        yield apply_schema(batch.to_pandas()) if typed else batch.to_pandas()
@@ -0,0 +1,113 @@
+"""Results tables written once as memory-mapped column files, shared by worker processes.
+
+A process that renders many figures in a pool loads each table once and publishes it
+here; every worker then maps the same files instead of parsing the CSV again, and the
+operating system keeps a single copy of the column data in its page cache. Numeric
+columns and categorical codes are mapped without copying; text columns are stored as
+one UTF-8 buffer with offsets and decoded when a worker reads them.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+MANIFEST = "manifest.json"
+
+
+def _map(path) -> np.ndarray:
+    # A plain ndarray view of the mapped file (pandas treats np.memmap as a distinct class)
+    return np.asarray(np.load(path, mmap_mode="r"))
+
+
+def table_key(path) -> str:
+    """Key of a results table: its absolute path as named by the reader."""
+    return str(Path(path).resolve())
+
+
+def _write_column(directory: Path, name: str, series: pd.Series) -> dict:
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        np.save(directory / f"{name}.codes.npy", series.cat.codes.to_numpy())
+        return {"kind": "category", "categories": series.cat.categories.tolist(), "ordered": bool(dtype.ordered)}
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_extension_array_dtype(dtype):
+        np.save(directory / f"{name}.npy", series.to_numpy())
+        return {"kind": "numeric"}
+
+    missing = series.isna().to_numpy()
+    if not all(isinstance(value, str) for value in series[~missing]):
+        raise TypeError(f"Column '{series.name}' has values that are neither numbers nor strings")
+    encoded = [b"" if is_missing else value.encode("utf-8") for value, is_missing in zip(series, missing)]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    np.save(directory / f"{name}.offsets.npy", offsets)
+    np.save(directory / f"{name}.missing.npy", missing)
+    np.save(directory / f"{name}.bytes.npy", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+    return {"kind": "text", "dtype": str(dtype)}
+
+
+class SharedTables:
+    """Tables published to a directory of .npy column files, read back memory-mapped."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        with open(self.directory / MANIFEST) as f:
+            self.manifest = json.load(f)
+
+    @classmethod
+    def publish(cls, tables: Dict[str, pd.DataFrame], directory, complete: Sequence[str] = ()) -> "SharedTables":
+        """Write tables (keyed by table_key) to directory and open them.
+
+        complete names the tables published with every column of the file, which may
+        then also be read without a column list.
+        """
+        directory = Path(directory)
+        manifest = {}
+        for t, (key, df) in enumerate(tables.items()):
+            table_dir = directory / f"table{t}"
+            table_dir.mkdir(parents=True, exist_ok=True)
+            manifest[key] = {
+                "directory": table_dir.name,
+                "rows": len(df),
+                "complete": key in complete,
+                "columns": {column: {"file": f"c{c}", **_write_column(table_dir, f"c{c}", df[column])}
+                            for c, column in enumerate(df.columns)},
+            }
+        with open(directory / MANIFEST, "w") as f:
+            json.dump(manifest, f)
+        return cls(directory)
+
+    def covers(self, key: str, columns: Optional[Sequence[str]]) -> bool:
+        """Whether the table key is published with all of the given columns."""
+        table = self.manifest.get(key)
+        if table is None:
+            return False
+        if columns is None:
+            return table["complete"]
+        return all(column in table["columns"] for column in columns)
+
+    def _read_column(self, table_dir: Path, spec: dict) -> pd.Series:
+        name = spec["file"]
+        if spec["kind"] == "numeric":
+            return pd.Series(_map(table_dir / f"{name}.npy"), copy=False)
+        if spec["kind"] == "category":
+            codes = _map(table_dir / f"{name}.codes.npy")
+            dtype = pd.CategoricalDtype(spec["categories"], ordered=spec["ordered"])
+            return pd.Series(pd.Categorical.from_codes(codes, dtype=dtype))
+
+        offsets = _map(table_dir / f"{name}.offsets.npy")
+        missing = _map(table_dir / f"{name}.missing.npy")
+        buffer = _map(table_dir / f"{name}.bytes.npy")
+        values = [None if is_missing else bytes(buffer[start:end]).decode("utf-8")
+                  for start, end, is_missing in zip(offsets[:-1], offsets[1:], missing)]
+        return pd.Series(values, dtype=spec["dtype"])
+
+    def read(self, key: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """The published table key, with the given columns (all if None) in that order."""
+        table = self.manifest[key]
+        table_dir = self.directory / table["directory"]
+        columns = list(table["columns"]) if columns is None else list(columns)
+        return pd.DataFrame({column: self._read_column(table_dir, table["columns"][column]) for column in columns},
+                            copy=False)
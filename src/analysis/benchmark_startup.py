@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark: Import and CLI Start Times of the Analysis Scripts
+=====================================================================
+Times, in fresh interpreters, importing each analysis module and running the text-only
+tom_cli.py subcommands, reports the median and best wall time of several runs, and
+lists which of the heavy plotting and statistics modules each one loaded. Any target
+slower than the budget, or loading a heavy module, is flagged and makes the run fail,
+so a stray top-level import shows up here before anyone notices a slow summary.
+
+Usage:
+    python benchmark_startup.py --repeats 5 --budget 1.0
+    python benchmark_startup.py --results_csv poker_tom_results_20250602_081719.csv \
+        --cognitive_csv detailed_cognitive_analysis.csv
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+ANALYSIS_DIR = Path(__file__).resolve().parent
+
+# Modules a text-only run should never load
+HEAVY_MODULES = ['matplotlib', 'seaborn', 'scipy.stats']
+
+# Reports the heavy modules a run loaded, whichever way it exits
+PROBE = (
+    "import atexit, sys\n"
+    "atexit.register(lambda: sys.stderr.write('\\n@loaded ' + ','.join("
+    f"m for m in {HEAVY_MODULES!r} if m in sys.modules) + '\\n'))\n"
+)
+
+
+def cli(*args):
+    """Statement running tom_cli.py with the given arguments, as from the command line."""
+    script = str(PROJECT_ROOT / 'tom_cli.py')
+    return f"import runpy\nsys.argv = {[script, *args]!r}\nrunpy.run_path({script!r}, run_name='__main__')"
+
+
+def make_targets(results_csv=None, cognitive_csv=None):
+    """(label, Python statement, held to the time budget) triples to time.
+
+    A full summary of a results table does real work, so only the modules it loads
+    are checked. The LaTeX tables are filled from the results aggregates, so they are
+    timed when both tables are given; the first run computes the aggregates and the
+    others reuse them, as repeated runs do.
+    """
+    targets = [
+        ('python (interpreter only)', 'pass', True),
+        ('import pandas', 'import pandas', True),
+        ('import results_store', 'import results_store', True),
+        ('import results_stats', 'import results_stats', True),
+        ('import tom_poker_analysis', 'import tom_poker_analysis', True),
+        ('import cognitive_tom_analysis', 'import cognitive_tom_analysis', True),
+        ('import results_paper_latex', 'import results_paper_latex', True),
+        ('tom_cli.py --help', cli('--help'), True),
+        ('tom_cli.py summary --help', cli('summary', '--help'), True),
+        ('tom_cli.py latex --help', cli('latex', '--help'), True),
+    ]
+    if results_csv and cognitive_csv:
+        targets.append(('tom_cli.py latex', cli('latex', '--results_csv', str(Path(results_csv).resolve()),
+                                                '--cognitive_csv', str(Path(cognitive_csv).resolve())), True))
+    if results_csv:
+        targets.append((f'tom_cli.py summary ({Path(results_csv).name})',
+                        cli('summary', '--results_csv', str(Path(results_csv).resolve())), False))
+    return targets
+
+
+def time_target(statement, repeats, workdir, env):
+    """Wall times of running statement in fresh interpreters, and the heavy modules it loaded."""
+    times = []
+    loaded = ''
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run = subprocess.run([sys.executable, '-c', PROBE + statement], cwd=workdir, env=env,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        times.append(time.perf_counter() - start)
+        if run.returncode != 0:
+            raise RuntimeError(f"'{statement}' failed:\n{run.stderr}")
+        loaded = run.stderr.rsplit('@loaded ', 1)[-1].strip()
+    return times, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import and CLI start times")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters per target")
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds a text-only start may take")
+    parser.add_argument("--results_csv", default=None,
+                        help="Also time a full text-only summary of this results table")
+    parser.add_argument("--cognitive_csv", default=None,
+                        help="With --results_csv, also time the LaTeX tables of both tables")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), str(ANALYSIS_DIR), env.get('PYTHONPATH')]))
+
+    print("⏱️ STARTUP BENCHMARK")
+    print("=" * 90)
+    print(f"{args.repeats} runs per target, budget {args.budget:.2f} s, heavy modules: {', '.join(HEAVY_MODULES)}")
+    print(f"{'Target':<42} {'Median (s)':>10} {'Best (s)':>9}  {'Heavy modules loaded':<20}")
+
+    failures = []
+    # Subcommands write their outputs to the working directory
+    with tempfile.TemporaryDirectory() as workdir:
+        for label, statement, budgeted in make_targets(args.results_csv, args.cognitive_csv):
+            times, loaded = time_target(statement, args.repeats, workdir, env)
+            median = statistics.median(times)
+            ok = not loaded and (median <= args.budget or not budgeted)
+            if not ok:
+                failures.append(label)
+            print(f"{label:<42} {median:>10.3f} {min(times):>9.3f}  {loaded or '-':<20} {'✅' if ok else '❌'}")
+
+    if failures:
+        print(f"❌ Over budget or loading heavy modules: {', '.join(failures)}")
+        sys.exit(1)
+    print("✅ Every target started within budget without the plotting or statistics stack")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+ToM Pattern Benchmark: Raw Pattern Strings vs Compiled Pattern Banks
+====================================================================
+Times ToM-level detection and pattern findall on synthetic explanations of growing
+length, once with the raw `.*` pattern strings (as re.search / re.findall in a loop)
+and once with the PatternBank rewrites, and checks both give the same results.
+
+Usage:
+    python benchmark_tom_patterns.py --lengths 500 2000 10000 --texts 20
+"""
+
+import argparse
+import random
+import re
+import time
+
+from cognitive_tom_analysis import FIRST_ORDER_TOM_PATTERNS, SECOND_ORDER_TOM_PATTERNS
+from tom_patterns import PatternBank
+
+# Explanation fragments; some complete a ToM chain, many only start one
+FRAGMENTS = [
+    "the opponent has been", "they could be", "he checked the turn", "given the board",
+    "exploit the weakness", "induce a call", "make a decision", "the bet size is large",
+    "the river completes the flush", "this suggests strength", "from the previous street",
+    "the range is polarized", "which means the pot odds are good", "opponent thinks",
+    "there are few value combos", "the sizing looks thin", "either way",
+]
+
+# Fragments that start chains but never complete one: the worst case for `.*` backtracking
+NEAR_MISS_FRAGMENTS = [
+    "the opponent checked", "they could be", "he called the turn", "given the board",
+    "exploit the weakness", "induce a call", "make a decision", "the bet size is large",
+    "the river completes the flush", "the sizing looks thin", "either way",
+]
+
+
+def make_texts(fragments, n_texts, length, seed):
+    """Single-line lowercase explanations of roughly the given length."""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n_texts):
+        words = []
+        size = 0
+        while size < length:
+            fragment = rng.choice(fragments)
+            words.append(fragment)
+            size += len(fragment) + 2
+        texts.append(', '.join(words))
+    return texts
+
+
+def raw_tom_level(text):
+    """detect_tom_level with the raw pattern strings, as before the pattern banks."""
+    if any(re.search(pattern, text) for pattern in SECOND_ORDER_TOM_PATTERNS):
+        return 2
+    if any(re.search(pattern, text) for pattern in FIRST_ORDER_TOM_PATTERNS):
+        return 1
+    return 0
+
+
+def bank_tom_level(text, first_order, second_order):
+    """detect_tom_level with the compiled pattern banks."""
+    if second_order.search(text):
+        return 2
+    if first_order.search(text):
+        return 1
+    return 0
+
+
+def timed(function, texts):
+    start = time.perf_counter()
+    results = [function(text) for text in texts]
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark raw ToM patterns against compiled pattern banks")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[500, 2000, 10000],
+                        help="Approximate explanation lengths in characters")
+    parser.add_argument("--texts", type=int, default=20, help="Explanations per length")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic texts")
+    args = parser.parse_args()
+
+    first_order = PatternBank(FIRST_ORDER_TOM_PATTERNS)
+    second_order = PatternBank(SECOND_ORDER_TOM_PATTERNS)
+    all_patterns = FIRST_ORDER_TOM_PATTERNS + SECOND_ORDER_TOM_PATTERNS
+    all_bank = PatternBank(all_patterns)
+
+    print("⏱️ TOM PATTERN BENCHMARK")
+    print("=" * 70)
+    print(f"{'Texts':<10} {'Length':>8} {'Task':<8} {'Raw (s)':>10} {'Bank (s)':>10} {'Speedup':>9}")
+
+    for label, fragments in (("mixed", FRAGMENTS), ("near-miss", NEAR_MISS_FRAGMENTS)):
+        for length in args.lengths:
+            texts = make_texts(fragments, args.texts, length, args.seed)
+
+            raw_levels, raw_time = timed(raw_tom_level, texts)
+            bank_levels, bank_time = timed(lambda text: bank_tom_level(text, first_order, second_order), texts)
+            assert raw_levels == bank_levels, "ToM levels differ between raw patterns and pattern banks"
+            print(f"{label:<10} {length:>8} {'search':<8} {raw_time:>10.3f} {bank_time:>10.3f} "
+                  f"{raw_time / bank_time:>8.1f}x")
+
+            raw_matches, raw_time = timed(lambda text: [m for p in all_patterns for m in re.findall(p, text)], texts)
+            bank_matches, bank_time = timed(all_bank.findall, texts)
+            assert raw_matches == bank_matches, "findall results differ between raw patterns and pattern banks"
+            print(f"{label:<10} {length:>8} {'findall':<8} {raw_time:>10.3f} {bank_time:>10.3f} "
+                  f"{raw_time / bank_time:>8.1f}x")
+
+    print("✅ Raw patterns and pattern banks agree on every text")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,37 +5,308 @@ Cognitive Theory of Mind Analysis: Examining Reasoning Patterns in LLM Explanati
 This script analyzes LLM explanations through various cognitive science frameworks.
 """
 
+import os
+import sys
+import json
+import hashlib
+import argparse
+import multiprocessing
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import re
+from bisect import bisect_right
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set up plotting style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
-plt.rcParams['figure.figsize'] = (14, 10)
-plt.rcParams['font.size'] = 12
+from lexicon_index import LexiconIndex
+from tom_patterns import PatternBank
+from feature_cache import FeatureCache
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from results_schema import apply_schema
+from results_store import TABLE_FORMATS, iter_table, read_table, write_table
+from plot_style import pyplot
+
+# Plotting style, applied when the dashboard is drawn
+PLOT_STYLE = dict(style='seaborn-v0_8', palette='husl', rc={'figure.figsize': (14, 10), 'font.size': 12})
+
+# Lexicons and patterns used by the detectors. Both the per-explanation detectors and
+# the column-wise extraction in CognitiveToMAnalyzer.extract_cognitive_features read
+# these, so the two paths always agree.
+
+# Theory of Mind levels
+# Level 0: No mental state attribution
+# Level 1: First-order ToM (opponent thinks/believes/wants X)
+# Level 2: Second-order ToM (opponent thinks I think Y)
+FIRST_ORDER_TOM_PATTERNS = [
+    r'opponent.*(?:thinks|believes|wants|knows|assumes|expects|hopes)',
+    r'(?:they|he).*(?:think|believe|want|know|assume|expect|hope)',
+    r'opponent.*(?:is trying|is attempting|is looking)',
+    r'(?:they|he).*(?:trying|attempting|looking)',
+    r'opponent.*(?:has|holds|represents)',
+]
+SECOND_ORDER_TOM_PATTERNS = [
+    r'opponent.*thinks.*(?:i|you|hero).*(?:think|believe|have)',
+    r'(?:they|he).*(?:think|believe).*(?:i|you|hero).*(?:think|believe|have)',
+    r'exploit.*(?:your|hero).*(?:range|hand|position)',
+    r'induce.*(?:folds|calls).*from.*(?:you|hero)',
+    r'make.*(?:you|hero).*(?:think|believe|fold)',
+]
+
+# Mental state verbs
+BELIEF_VERBS = ['thinks', 'believes', 'assumes', 'expects', 'supposes', 'imagines']
+INTENTION_VERBS = ['wants', 'intends', 'tries', 'attempts', 'aims', 'seeks', 'hopes']
+KNOWLEDGE_VERBS = ['knows', 'realizes', 'understands', 'recognizes']
+BELIEF_ATTRIBUTION_PATTERN = r'opponent.*(?:thinks|believes|assumes)'
+INTENTION_ATTRIBUTION_PATTERN = r'opponent.*(?:wants|intends|trying|attempting)'
+
+# Causal reasoning
+CAUSAL_WORDS = ['because', 'since', 'given', 'due to', 'as a result', 'therefore',
+                'thus', 'hence', 'consequently', 'leads to', 'causes', 'results in']
+CAUSAL_CHAIN_PATTERNS = [
+    r'given.*(?:and|,).*(?:this|it).*(?:suggests|indicates|means)',
+    r'because.*(?:and|,).*(?:therefore|thus|so)',
+    r'since.*(?:and|,).*(?:making|suggesting|indicating)'
+]
+
+# Contextual integration
+CONTEXT_CUES = {
+    'opponent_history': ['history', 'previous', 'past', 'shown', 'demonstrated', 'pattern'],
+    'board_texture': ['board', 'texture', 'flush', 'straight', 'draw', 'cards'],
+    'bet_sizing': ['bet size', 'pot size', 'sizing', 'small', 'large', 'overbet', '%'],
+    'position': ['position', 'range', 'fold', 'call', 'exploit']
+}
+INTEGRATION_PHRASES = ['aligns with', 'consistent with', 'combined with', 'together with',
+                       'considering', 'given that', 'along with']
+
+# Strategic reasoning
+STRATEGIC_CONCEPTS = [
+    'exploit', 'induce', 'extract value', 'maximize', 'minimize', 'protect',
+    'represent', 'range', 'equity', 'fold equity', 'implied odds',
+    'bluffing frequency', 'polarized', 'balanced', 'deceptive'
+]
+ADVANCED_STRATEGY_PATTERNS = [
+    r'exploit.*range',
+    r'induce.*folds',
+    r'extract.*value',
+    r'protect.*equity',
+    r'represent.*(?:strength|hand)'
+]
+
+# Temporal reasoning
+TEMPORAL_MARKERS = {
+    'past': ['previously', 'earlier', 'before', 'had', 'was', 'shown', 'demonstrated'],
+    'present': ['now', 'currently', 'this', 'here', 'is', 'are'],
+    'future': ['will', 'would', 'likely', 'probably', 'expect', 'predict']
+}
+
+# Uncertainty and confidence
+UNCERTAINTY_WORDS = ['likely', 'probably', 'possibly', 'might', 'could', 'may',
+                     'seems', 'appears', 'suggests', 'indicates', 'reasonable']
+CONFIDENCE_WORDS = ['clearly', 'obviously', 'definitely', 'certainly', 'undoubtedly',
+                    'strongly', 'highly likely', 'very likely', 'almost certainly']
+HEDGE_WORDS = ['somewhat', 'rather', 'quite', 'fairly', 'relatively', 'mostly', 'generally']
+
+# Opponent modeling
+OPPONENT_REFERENCE_WORDS = ['opponent', 'they', 'he', 'their']
+PSYCHOLOGY_PATTERNS = [
+    r'opponent.*(?:enjoys|likes|dislikes|prefers|tends)',
+    r'opponent.*(?:style|pattern|behavior|tendency)',
+    r'(?:they|he).*(?:enjoy|like|dislike|prefer|tend)',
+    r'(?:aggressive|tight|loose|conservative|wild|tricky)'
+]
+TENDENCY_PATTERNS = [
+    r'history of',
+    r'pattern of',
+    r'tendency to',
+    r'known for',
+    r'shown.*to',
+    r'demonstrated'
+]
+HISTORY_PATTERNS = [
+    r'previous.*(?:hand|action|bet|play)',
+    r'earlier.*(?:showed|demonstrated)',
+    r'past.*(?:behavior|actions)',
+    r'shown down',
+    r'has.*(?:been|shown)'
+]
+
+# Game theory and poker theory
+GAME_THEORY_TERMS = [
+    'equilibrium', 'nash', 'optimal', 'strategy', 'payoff', 'utility',
+    'expectation', 'expected value', 'ev', 'gto', 'exploitative'
+]
+POKER_THEORY_CONCEPTS = [
+    'range', 'polarized', 'merged', 'balanced', 'frequency',
+    'fold equity', 'implied odds', 'reverse implied odds',
+    'blockers', 'combinatorics', 'outs'
+]
+EV_PATTERNS = [
+    r'extract.*value',
+    r'maximize.*value',
+    r'positive.*expectation',
+    r'profitable',
+    r'expected.*return'
+]
+
+# Reasoning sophistication
+SPECIFICITY_MARKS = ['$', '%', '♠', '♥', '♦', '♣']
+STRUCTURE_MARKS = ['.', ',']
+
+# Every keyword list above, matched together in a single scan (see lexicon_index.py)
+LEXICONS = {
+    'belief_verbs': BELIEF_VERBS,
+    'intention_verbs': INTENTION_VERBS,
+    'knowledge_verbs': KNOWLEDGE_VERBS,
+    'mental_verbs': BELIEF_VERBS + INTENTION_VERBS + KNOWLEDGE_VERBS,
+    'causal_words': CAUSAL_WORDS,
+    **{f'context_{category}': keywords for category, keywords in CONTEXT_CUES.items()},
+    'integration_phrases': INTEGRATION_PHRASES,
+    'strategic_concepts': STRATEGIC_CONCEPTS,
+    **{f'temporal_{timeframe}': markers for timeframe, markers in TEMPORAL_MARKERS.items()},
+    'uncertainty_words': UNCERTAINTY_WORDS,
+    'confidence_words': CONFIDENCE_WORDS,
+    'hedge_words': HEDGE_WORDS,
+    'opponent_references': OPPONENT_REFERENCE_WORDS,
+    'game_theory_terms': GAME_THEORY_TERMS,
+    'poker_theory_concepts': POKER_THEORY_CONCEPTS,
+    'specificity_marks': SPECIFICITY_MARKS,
+    'structure_marks': STRUCTURE_MARKS,
+}
+LEXICON_INDEX = LexiconIndex(LEXICONS)
+
+# Every pattern list above, compiled once with bounded gaps (see tom_patterns.py)
+FIRST_ORDER_TOM_BANK = PatternBank(FIRST_ORDER_TOM_PATTERNS)
+SECOND_ORDER_TOM_BANK = PatternBank(SECOND_ORDER_TOM_PATTERNS)
+BELIEF_ATTRIBUTION_BANK = PatternBank([BELIEF_ATTRIBUTION_PATTERN])
+INTENTION_ATTRIBUTION_BANK = PatternBank([INTENTION_ATTRIBUTION_PATTERN])
+CAUSAL_CHAIN_BANK = PatternBank(CAUSAL_CHAIN_PATTERNS)
+ADVANCED_STRATEGY_BANK = PatternBank(ADVANCED_STRATEGY_PATTERNS)
+PSYCHOLOGY_BANK = PatternBank(PSYCHOLOGY_PATTERNS)
+TENDENCY_BANK = PatternBank(TENDENCY_PATTERNS)
+HISTORY_BANK = PatternBank(HISTORY_PATTERNS)
+EV_BANK = PatternBank(EV_PATTERNS)
+
+# Per-explanation features, in output order (everything but the row's metadata and text)
+COGNITIVE_FEATURE_COLUMNS = [
+    'Explanation_Length', 'ToM_Level', 'Mental_State_Words', 'Mental_State_Types',
+    'Belief_Attribution', 'Intention_Attribution', 'Causal_Connectives', 'Causal_Chains',
+    'Context_Integration_Score', 'Strategic_Reasoning_Score', 'Temporal_Reasoning',
+    'Uncertainty_Markers', 'Confidence_Level', 'Hedge_Words', 'Opponent_References',
+    'Opponent_Psychology', 'Opponent_Tendencies', 'Opponent_History', 'Game_Theory_Terms',
+    'Strategic_Concepts', 'EV_Reasoning', 'Reasoning_Sophistication'
+]
+
+# Bump when a detector's logic changes without any lexicon or pattern changing
+DETECTOR_VERSION = 1
+
+# Fingerprint of everything the features depend on; stored feature vectors are only
+# reused under the same version
+LEXICON_VERSION = hashlib.sha256(json.dumps({
+    'detector_version': DETECTOR_VERSION,
+    'columns': COGNITIVE_FEATURE_COLUMNS,
+    'lexicons': LEXICONS,
+    'patterns': [FIRST_ORDER_TOM_PATTERNS, SECOND_ORDER_TOM_PATTERNS, BELIEF_ATTRIBUTION_PATTERN,
+                 INTENTION_ATTRIBUTION_PATTERN, CAUSAL_CHAIN_PATTERNS, ADVANCED_STRATEGY_PATTERNS,
+                 PSYCHOLOGY_PATTERNS, TENDENCY_PATTERNS, HISTORY_PATTERNS, EV_PATTERNS],
+}, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+# Default location of the persistent feature store used by main()
+FEATURE_CACHE = 'cognitive_feature_cache.sqlite'
+
+# Results columns the analysis reads, and rows read at a time in streaming mode
+RESULTS_COLUMNS = ['LLM_Model', 'Context_Type', 'Is_Classification_Correct', 'Explanation_Text']
+STREAM_CHUNKSIZE = 50000
+
+# Factors whose correlation with accuracy generate_cognitive_insights reports
+ACCURACY_FACTOR_COLUMNS = ['ToM_Level', 'Context_Integration_Score', 'Strategic_Reasoning_Score',
+                           'Opponent_Psychology', 'Reasoning_Sophistication']
+
+
+class ExplanationCorpus:
+    """Lowercased explanations joined into one string for column-wise pattern matching.
+    
+    Each pattern is scanned once over the whole corpus instead of once per explanation,
+    and matches are mapped back to their explanation by offset; all lexicon keywords
+    are counted together by one LEXICON_INDEX scan. Explanations are joined with
+    newlines, which no lexicon entry contains and `.` does not match, so no match can
+    span two explanations and per-explanation counts equal str.count / re.search.
+    """
+    
+    def __init__(self, texts):
+        self.size = len(texts)
+        self.lengths = np.fromiter(map(len, texts), dtype=np.int64, count=self.size)
+        self.starts = np.concatenate(([0], np.cumsum(self.lengths + 1)))[:self.size].astype(np.int64)
+        self._start_list = self.starts.tolist()
+        self.text = '\n'.join(texts)
+        self.lexicon_hits = LEXICON_INDEX.scan(self.text, self.starts)
+    
+    def matches(self, regex):
+        """bool(regex.search(text)), per explanation."""
+        
+        # Like re.search, stop at the first match and resume at the next explanation
+        found = np.zeros(self.size, dtype=bool)
+        match = regex.search(self.text)
+        while match is not None:
+            owner = bisect_right(self._start_list, match.start()) - 1
+            found[owner] = True
+            if owner + 1 == self.size:
+                break
+            match = regex.search(self.text, self._start_list[owner + 1])
+        return found
+    
+    def matches_any(self, bank):
+        """Whether any pattern of a PatternBank matches, per explanation."""
+        return self.matches(bank.combined)
+    
+    def count_matching(self, bank):
+        """Number of patterns of a PatternBank that match, per explanation."""
+        return sum(self.matches(regex).astype(int) for regex in bank.compiled)
+
+
+# Parallel extraction: rows per task, and the only columns shipped to worker processes
+PARALLEL_CHUNK_SIZE = 5000
+FEATURE_INPUT_COLUMNS = ['Model_Short', 'Context_Type', 'Is_Classification_Correct', 'Explanation_Text']
+
 
 class CognitiveToMAnalyzer:
     """Analyzes Theory of Mind reasoning patterns in LLM explanations from a cognitive science perspective."""
     
-    def __init__(self, data_file):
-        """Initialize with the results CSV file."""
-        self.df = pd.read_csv(data_file)
+    def __init__(self, data_file, n_jobs=1, feature_cache=None):
+        """Initialize with the results CSV file.
+        
+        n_jobs worker processes share the feature extraction (-1 uses every core).
+        feature_cache, a FeatureCache, supplies feature vectors computed by earlier runs
+        so only new or changed explanations are analyzed.
+        """
+        self.n_jobs = os.cpu_count() if n_jobs == -1 else max(1, n_jobs)
+        self.feature_cache = feature_cache
+        self.df = read_table(data_file, columns=RESULTS_COLUMNS)
         self.prepare_data()
         self.analyze_cognitive_patterns()
         
+    @classmethod
+    def from_cognitive_table(cls, path='detailed_cognitive_analysis.csv'):
+        """Analyzer over an exported per-explanation table, without extracting features again.
+        
+        Only cognitive_df is set, which is all create_cognitive_dashboard reads.
+        """
+        analyzer = cls.__new__(cls)
+        analyzer.cognitive_df = read_table(path)
+        return analyzer
+
     def prepare_data(self):
         """Clean and prepare data for cognitive analysis."""
         # Create model short names
         self.df['Model_Short'] = self.df['LLM_Model'].str.split('/').str[-1].str.replace('-Preview', '').str[:25]
         
         # Filter out rows with missing explanations
-        self.df = self.df.dropna(subset=['Explanation_Text'])
+        self.df = apply_schema(self.df.dropna(subset=['Explanation_Text']))
         
         print(f"🧠 Cognitive Analysis initialized: {len(self.df)} explanations from {self.df['Model_Short'].nunique()} models")
         
@@ -43,22 +314,187 @@ class CognitiveToMAnalyzer:
         """Main cognitive pattern analysis pipeline."""
         print("🔍 Analyzing cognitive patterns...")
         
-        # Initialize analysis results
-        self.cognitive_metrics = []
+        # All metrics are computed column-wise over the whole table; the result is
+        # identical to calling analyze_single_explanation on every row
+        if self.feature_cache is not None:
+            self.cognitive_df = self.extract_cognitive_features_cached(self.df)
+        else:
+            self.cognitive_df = self.compute_cognitive_features(self.df)
+        self.cognitive_df = apply_schema(self.cognitive_df)
+        print(f"✅ Cognitive analysis complete: {len(self.cognitive_df)} explanations analyzed")
         
-        for idx, row in self.df.iterrows():
-            explanation = row['Explanation_Text']
-            model = row['Model_Short']
-            context_type = row['Context_Type']
-            is_correct = row['Is_Classification_Correct']
-            
-            # Analyze this explanation
-            metrics = self.analyze_single_explanation(explanation, model, context_type, is_correct)
-            self.cognitive_metrics.append(metrics)
+    def compute_cognitive_features(self, df):
+        """extract_cognitive_features, spread over worker processes when n_jobs > 1."""
+        if self.n_jobs > 1:
+            return self.extract_cognitive_features_parallel(df, self.n_jobs)
+        return self.extract_cognitive_features(df)
+        
+    def extract_cognitive_features_cached(self, df):
+        """extract_cognitive_features, reusing the feature vectors stored in feature_cache.
+        
+        Only explanations without a stored vector under the current LEXICON_VERSION are
+        analyzed (each distinct text once), and their vectors are stored for the next
+        run. The result equals extract_cognitive_features(df).
+        """
+        
+        cache = self.feature_cache
+        keys = [cache.make_key(explanation) for explanation in df['Explanation_Text'].tolist()]
+        vectors = cache.get_many(keys)
+        
+        # First row of every distinct explanation that has no stored vector
+        missing = {}
+        for position, key in enumerate(keys):
+            if key not in vectors:
+                missing.setdefault(key, position)
+        print(f"♻️ Feature cache: {len(keys) - sum(key in missing for key in keys)} explanations reused, "
+              f"{len(missing)} distinct explanations to analyze")
+        
+        if missing:
+            computed = self.compute_cognitive_features(df.iloc[list(missing.values())])
+            new_vectors = dict(zip(missing, zip(*(computed[column].tolist() for column in COGNITIVE_FEATURE_COLUMNS))))
+            cache.put_many(new_vectors)
+            vectors.update(new_vectors)
+        
+        # Metadata comes from df and features from the vectors, with the dtypes and
+        # column order of a fresh extraction
+        template = self.extract_cognitive_features(df.iloc[:0])
+        features = dict(zip(COGNITIVE_FEATURE_COLUMNS, zip(*(vectors[key] for key in keys))))
+        cognitive_df = pd.DataFrame({
+            'Model': df['Model_Short'].to_numpy(),
+            'Context_Type': df['Context_Type'].to_numpy(),
+            'Is_Correct': df['Is_Classification_Correct'].to_numpy(),
+            **{column: np.array(features.get(column, ()), dtype=template[column].dtype)
+               for column in COGNITIVE_FEATURE_COLUMNS},
+            'Explanation_Text': df['Explanation_Text'].tolist()
+        })
+        return cognitive_df[template.columns]
         
-        # Convert to DataFrame for analysis
-        self.cognitive_df = pd.DataFrame(self.cognitive_metrics)
-        print(f"✅ Cognitive analysis complete: {len(self.cognitive_df)} explanations analyzed")
+    def extract_cognitive_features_parallel(self, df, n_jobs, chunk_size=PARALLEL_CHUNK_SIZE):
+        """extract_cognitive_features over chunks of df in n_jobs worker processes.
+        
+        Rows are analyzed independently, so the chunks are concatenated back in their
+        original order and the result equals the single-process one.
+        """
+        
+        inputs = df[FEATURE_INPUT_COLUMNS]
+        chunks = [inputs.iloc[start:start + chunk_size] for start in range(0, len(inputs), chunk_size)]
+        if n_jobs <= 1 or len(chunks) <= 1:
+            return self.extract_cognitive_features(inputs)
+        
+        print(f"⚙️ Extracting features in {len(chunks)} chunks over {min(n_jobs, len(chunks))} processes")
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(chunks)),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            parts = list(pool.map(CognitiveToMAnalyzer.extract_cognitive_features, chunks))
+        return pd.concat(parts, ignore_index=True)
+        
+    @staticmethod
+    def extract_cognitive_features(df):
+        """Compute every cognitive metric for all explanations at once.
+        
+        Column-wise equivalent of analyze_single_explanation: every lexicon entry and
+        pattern is matched once over an ExplanationCorpus of the whole column instead of
+        once per explanation. Returns one row per explanation, in the order of df.
+        """
+        
+        explanations = df['Explanation_Text'].tolist()
+        text = [explanation.lower() for explanation in explanations]
+        corpus = ExplanationCorpus(text)
+        hits = corpus.lexicon_hits
+        
+        # 1. THEORY OF MIND LEVELS
+        first_order = corpus.matches_any(FIRST_ORDER_TOM_BANK)
+        second_order = corpus.matches_any(SECOND_ORDER_TOM_BANK)
+        tom_level = np.where(second_order, 2, np.where(first_order, 1, 0))
+        
+        # 2. MENTAL STATE ATTRIBUTION
+        mental_state_count = hits.occurrences('mental_verbs')
+        mental_state_types = sum(hits.contains_any(category).astype(int)
+                                 for category in ('belief_verbs', 'intention_verbs', 'knowledge_verbs'))
+        
+        # 3. CAUSAL REASONING PATTERNS
+        causal_connectives = hits.occurrences('causal_words')
+        causal_chains = corpus.count_matching(CAUSAL_CHAIN_BANK)
+        
+        # 4. CONTEXTUAL INTEGRATION
+        integrated_cues = sum(hits.contains_any(f'context_{category}').astype(int) for category in CONTEXT_CUES)
+        context_integration = np.minimum(integrated_cues + hits.count_present('integration_phrases'), 5)
+        
+        # 5. STRATEGIC REASONING
+        strategic_reasoning = np.minimum(
+            hits.count_present('strategic_concepts') + corpus.count_matching(ADVANCED_STRATEGY_BANK), 5
+        )
+        
+        # 6. TEMPORAL REASONING
+        temporal_reasoning = sum(hits.contains_any(f'temporal_{timeframe}').astype(int)
+                                 for timeframe in TEMPORAL_MARKERS)
+        
+        # 7. UNCERTAINTY AND CONFIDENCE
+        uncertainty_count = hits.occurrences('uncertainty_words')
+        confidence_count = hits.occurrences('confidence_words')
+        confidence_level = np.minimum(confidence_count / (uncertainty_count + 1), 2.0)
+        
+        # 8. OPPONENT MODELING
+        opponent_references = np.minimum(hits.occurrences('opponent_references'), 5)
+        opponent_psychology = np.minimum(corpus.count_matching(PSYCHOLOGY_BANK), 3)
+        opponent_tendencies = np.minimum(corpus.count_matching(TENDENCY_BANK), 3)
+        opponent_history = np.minimum(corpus.count_matching(HISTORY_BANK), 3)
+        
+        # 9. GAME THEORY CONCEPTS
+        game_theory_terms = hits.count_present('game_theory_terms')
+        strategic_concepts = hits.count_present('poker_theory_concepts')
+        ev_reasoning = corpus.count_matching(EV_BANK)
+        
+        # 10. REASONING SOPHISTICATION (same terms, in the same order, as the scalar version)
+        vocabulary = np.array([len(set(words)) / len(words) if words else 0
+                               for words in map(str.split, text)], dtype=float)
+        sophistication = np.minimum(
+            np.minimum(corpus.lengths / 200, 2) +
+            vocabulary * 2 +
+            np.minimum(hits.occurrences('specificity_marks') / 3, 1) +
+            np.minimum(hits.occurrences('structure_marks') / 10, 1),
+            5
+        )
+        
+        return pd.DataFrame({
+            'Model': df['Model_Short'].to_numpy(),
+            'Context_Type': df['Context_Type'].to_numpy(),
+            'Is_Correct': df['Is_Classification_Correct'].to_numpy(),
+            'Explanation_Length': np.fromiter(map(len, explanations), dtype=np.int64, count=len(explanations)),
+            
+            # Theory of Mind
+            'ToM_Level': tom_level,
+            'Mental_State_Words': mental_state_count,
+            'Mental_State_Types': mental_state_types,
+            'Belief_Attribution': corpus.matches_any(BELIEF_ATTRIBUTION_BANK),
+            'Intention_Attribution': corpus.matches_any(INTENTION_ATTRIBUTION_BANK),
+            
+            # Reasoning Patterns
+            'Causal_Connectives': causal_connectives,
+            'Causal_Chains': causal_chains,
+            'Context_Integration_Score': context_integration,
+            'Strategic_Reasoning_Score': strategic_reasoning,
+            'Temporal_Reasoning': temporal_reasoning,
+            
+            # Uncertainty and Confidence
+            'Uncertainty_Markers': uncertainty_count,
+            'Confidence_Level': confidence_level,
+            'Hedge_Words': hits.occurrences('hedge_words'),
+            
+            # Opponent Modeling
+            'Opponent_References': opponent_references,
+            'Opponent_Psychology': opponent_psychology,
+            'Opponent_Tendencies': opponent_tendencies,
+            'Opponent_History': opponent_history,
+            
+            # Game Theory
+            'Game_Theory_Terms': game_theory_terms,
+            'Strategic_Concepts': strategic_concepts,
+            'EV_Reasoning': ev_reasoning,
+            
+            # Overall Sophistication
+            'Reasoning_Sophistication': sophistication,
+            'Explanation_Text': explanations
+        })
         
     def analyze_single_explanation(self, explanation, model, context_type, is_correct):
         """Analyze a single explanation for cognitive patterns."""
@@ -66,35 +502,38 @@ class CognitiveToMAnalyzer:
         # Convert to lowercase for analysis
         text = explanation.lower()
         
+        # Every keyword lexicon is counted in one scan and shared by the detectors
+        hits = LEXICON_INDEX.scan_text(text)
+        
         # 1. THEORY OF MIND LEVELS
         tom_level = self.detect_tom_level(text)
         
         # 2. MENTAL STATE ATTRIBUTION
-        mental_states = self.detect_mental_state_attribution(text)
+        mental_states = self.detect_mental_state_attribution(text, hits)
         
         # 3. CAUSAL REASONING PATTERNS
-        causal_patterns = self.detect_causal_reasoning(text)
+        causal_patterns = self.detect_causal_reasoning(text, hits)
         
         # 4. CONTEXTUAL INTEGRATION
-        context_integration = self.detect_context_integration(text)
+        context_integration = self.detect_context_integration(text, hits)
         
         # 5. STRATEGIC REASONING
-        strategic_reasoning = self.detect_strategic_reasoning(text)
+        strategic_reasoning = self.detect_strategic_reasoning(text, hits)
         
         # 6. TEMPORAL REASONING
-        temporal_reasoning = self.detect_temporal_reasoning(text)
+        temporal_reasoning = self.detect_temporal_reasoning(text, hits)
         
         # 7. UNCERTAINTY AND CONFIDENCE
-        uncertainty_markers = self.detect_uncertainty_markers(text)
+        uncertainty_markers = self.detect_uncertainty_markers(text, hits)
         
         # 8. OPPONENT MODELING
-        opponent_modeling = self.detect_opponent_modeling(text)
+        opponent_modeling = self.detect_opponent_modeling(text, hits)
         
         # 9. GAME THEORY CONCEPTS
-        game_theory = self.detect_game_theory_concepts(text)
+        game_theory = self.detect_game_theory_concepts(text, hits)
         
         # 10. REASONING SOPHISTICATION
-        sophistication = self.calculate_reasoning_sophistication(text)
+        sophistication = self.calculate_reasoning_sophistication(text, hits)
         
         return {
             'Model': model,
@@ -140,31 +579,9 @@ class CognitiveToMAnalyzer:
     def detect_tom_level(self, text):
         """Detect Theory of Mind reasoning level (0, 1, or 2)."""
         
-        # Level 0: No mental state attribution
-        # Level 1: First-order ToM (opponent thinks/believes/wants X)
-        # Level 2: Second-order ToM (opponent thinks I think Y)
-        
-        # First-order ToM patterns
-        first_order_patterns = [
-            r'opponent.*(?:thinks|believes|wants|knows|assumes|expects|hopes)',
-            r'(?:they|he).*(?:think|believe|want|know|assume|expect|hope)',
-            r'opponent.*(?:is trying|is attempting|is looking)',
-            r'(?:they|he).*(?:trying|attempting|looking)',
-            r'opponent.*(?:has|holds|represents)',
-        ]
-        
-        # Second-order ToM patterns
-        second_order_patterns = [
-            r'opponent.*thinks.*(?:i|you|hero).*(?:think|believe|have)',
-            r'(?:they|he).*(?:think|believe).*(?:i|you|hero).*(?:think|believe|have)',
-            r'exploit.*(?:your|hero).*(?:range|hand|position)',
-            r'induce.*(?:folds|calls).*from.*(?:you|hero)',
-            r'make.*(?:you|hero).*(?:think|believe|fold)',
-        ]
-        
         # Check for patterns
-        first_order_found = any(re.search(pattern, text) for pattern in first_order_patterns)
-        second_order_found = any(re.search(pattern, text) for pattern in second_order_patterns)
+        first_order_found = FIRST_ORDER_TOM_BANK.search(text)
+        second_order_found = SECOND_ORDER_TOM_BANK.search(text)
         
         if second_order_found:
             return 2  # Second-order ToM
@@ -173,31 +590,26 @@ class CognitiveToMAnalyzer:
         else:
             return 0  # No clear ToM
     
-    def detect_mental_state_attribution(self, text):
+    def detect_mental_state_attribution(self, text, hits=None):
         """Detect mental state attribution patterns."""
         
-        # Mental state verbs
-        belief_verbs = ['thinks', 'believes', 'assumes', 'expects', 'supposes', 'imagines']
-        intention_verbs = ['wants', 'intends', 'tries', 'attempts', 'aims', 'seeks', 'hopes']
-        knowledge_verbs = ['knows', 'realizes', 'understands', 'recognizes']
-        
-        all_mental_verbs = belief_verbs + intention_verbs + knowledge_verbs
+        hits = hits or LEXICON_INDEX.scan_text(text)
         
         # Count mental state words
-        mental_state_count = sum(text.count(verb) for verb in all_mental_verbs)
+        mental_state_count = hits.occurrences('mental_verbs')
         
         # Identify types of mental states
         types_found = set()
-        if any(verb in text for verb in belief_verbs):
+        if hits.contains_any('belief_verbs'):
             types_found.add('belief')
-        if any(verb in text for verb in intention_verbs):
+        if hits.contains_any('intention_verbs'):
             types_found.add('intention')
-        if any(verb in text for verb in knowledge_verbs):
+        if hits.contains_any('knowledge_verbs'):
             types_found.add('knowledge')
         
         # Specific attribution patterns
-        belief_attribution = bool(re.search(r'opponent.*(?:thinks|believes|assumes)', text))
-        intention_attribution = bool(re.search(r'opponent.*(?:wants|intends|trying|attempting)', text))
+        belief_attribution = BELIEF_ATTRIBUTION_BANK.search(text)
+        intention_attribution = INTENTION_ATTRIBUTION_BANK.search(text)
         
         return {
             'count': mental_state_count,
@@ -206,111 +618,75 @@ class CognitiveToMAnalyzer:
             'intention_attribution': intention_attribution
         }
     
-    def detect_causal_reasoning(self, text):
+    def detect_causal_reasoning(self, text, hits=None):
         """Detect causal reasoning patterns."""
         
-        # Causal connectives
-        causal_words = ['because', 'since', 'given', 'due to', 'as a result', 'therefore', 
-                       'thus', 'hence', 'consequently', 'leads to', 'causes', 'results in']
+        hits = hits or LEXICON_INDEX.scan_text(text)
         
-        connective_count = sum(text.count(word) for word in causal_words)
+        # Causal connectives
+        connective_count = hits.occurrences('causal_words')
         
         # Causal chain detection (multiple causal links)
-        causal_chain_patterns = [
-            r'given.*(?:and|,).*(?:this|it).*(?:suggests|indicates|means)',
-            r'because.*(?:and|,).*(?:therefore|thus|so)',
-            r'since.*(?:and|,).*(?:making|suggesting|indicating)'
-        ]
-        
-        chains = sum(1 for pattern in causal_chain_patterns if re.search(pattern, text))
+        chains = CAUSAL_CHAIN_BANK.count_matching(text)
         
         return {
             'connectives': connective_count,
             'chains': chains
         }
     
-    def detect_context_integration(self, text):
+    def detect_context_integration(self, text, hits=None):
         """Detect how well the explanation integrates multiple contextual cues."""
         
-        # Context categories
-        context_cues = {
-            'opponent_history': ['history', 'previous', 'past', 'shown', 'demonstrated', 'pattern'],
-            'board_texture': ['board', 'texture', 'flush', 'straight', 'draw', 'cards'],
-            'bet_sizing': ['bet size', 'pot size', 'sizing', 'small', 'large', 'overbet', '%'],
-            'position': ['position', 'range', 'fold', 'call', 'exploit']
-        }
+        hits = hits or LEXICON_INDEX.scan_text(text)
         
         # Count integrated cues
         integrated_cues = 0
-        for category, keywords in context_cues.items():
-            if any(keyword in text for keyword in keywords):
+        for category in CONTEXT_CUES:
+            if hits.contains_any(f'context_{category}'):
                 integrated_cues += 1
         
         # Bonus for explicit integration language
-        integration_phrases = ['aligns with', 'consistent with', 'combined with', 'together with', 
-                              'considering', 'given that', 'along with']
-        integration_bonus = sum(1 for phrase in integration_phrases if phrase in text)
+        integration_bonus = hits.count_present('integration_phrases')
         
         return min(integrated_cues + integration_bonus, 5)  # Cap at 5
     
-    def detect_strategic_reasoning(self, text):
+    def detect_strategic_reasoning(self, text, hits=None):
         """Detect strategic reasoning sophistication."""
         
-        strategic_concepts = [
-            'exploit', 'induce', 'extract value', 'maximize', 'minimize', 'protect', 
-            'represent', 'range', 'equity', 'fold equity', 'implied odds',
-            'bluffing frequency', 'polarized', 'balanced', 'deceptive'
-        ]
+        hits = hits or LEXICON_INDEX.scan_text(text)
         
-        strategy_score = sum(1 for concept in strategic_concepts if concept in text)
+        strategy_score = hits.count_present('strategic_concepts')
         
         # Advanced strategic reasoning
-        advanced_patterns = [
-            r'exploit.*range',
-            r'induce.*folds',
-            r'extract.*value',
-            r'protect.*equity',
-            r'represent.*(?:strength|hand)'
-        ]
-        
-        advanced_bonus = sum(1 for pattern in advanced_patterns if re.search(pattern, text))
+        advanced_bonus = ADVANCED_STRATEGY_BANK.count_matching(text)
         
         return min(strategy_score + advanced_bonus, 5)  # Cap at 5
     
-    def detect_temporal_reasoning(self, text):
+    def detect_temporal_reasoning(self, text, hits=None):
         """Detect temporal reasoning about past, present, and future."""
         
-        temporal_markers = {
-            'past': ['previously', 'earlier', 'before', 'had', 'was', 'shown', 'demonstrated'],
-            'present': ['now', 'currently', 'this', 'here', 'is', 'are'],
-            'future': ['will', 'would', 'likely', 'probably', 'expect', 'predict']
-        }
+        hits = hits or LEXICON_INDEX.scan_text(text)
         
         temporal_score = 0
-        for timeframe, markers in temporal_markers.items():
-            if any(marker in text for marker in markers):
+        for timeframe in TEMPORAL_MARKERS:
+            if hits.contains_any(f'temporal_{timeframe}'):
                 temporal_score += 1
         
         return temporal_score
     
-    def detect_uncertainty_markers(self, text):
+    def detect_uncertainty_markers(self, text, hits=None):
         """Detect uncertainty and confidence markers."""
         
-        # Uncertainty markers
-        uncertainty_words = ['likely', 'probably', 'possibly', 'might', 'could', 'may', 
-                            'seems', 'appears', 'suggests', 'indicates', 'reasonable']
+        hits = hits or LEXICON_INDEX.scan_text(text)
         
-        uncertainty_count = sum(text.count(word) for word in uncertainty_words)
+        # Uncertainty markers
+        uncertainty_count = hits.occurrences('uncertainty_words')
         
         # Confidence markers
-        confidence_words = ['clearly', 'obviously', 'definitely', 'certainly', 'undoubtedly',
-                           'strongly', 'highly likely', 'very likely', 'almost certainly']
-        
-        confidence_count = sum(text.count(word) for word in confidence_words)
+        confidence_count = hits.occurrences('confidence_words')
         
         # Hedge words
-        hedge_words = ['somewhat', 'rather', 'quite', 'fairly', 'relatively', 'mostly', 'generally']
-        hedge_count = sum(text.count(word) for word in hedge_words)
+        hedge_count = hits.occurrences('hedge_words')
         
         # Calculate confidence level (more confidence words = higher confidence)
         confidence_level = min(confidence_count / max(uncertainty_count + 1, 1), 2.0)
@@ -321,44 +697,22 @@ class CognitiveToMAnalyzer:
             'hedges': hedge_count
         }
     
-    def detect_opponent_modeling(self, text):
+    def detect_opponent_modeling(self, text, hits=None):
         """Detect sophistication of opponent modeling."""
         
+        hits = hits or LEXICON_INDEX.scan_text(text)
+        
         # Direct opponent references
-        opponent_refs = text.count('opponent') + text.count('they') + text.count('he') + text.count('their')
+        opponent_refs = hits.occurrences('opponent_references')
         
         # Psychological attribution
-        psychology_patterns = [
-            r'opponent.*(?:enjoys|likes|dislikes|prefers|tends)',
-            r'opponent.*(?:style|pattern|behavior|tendency)',
-            r'(?:they|he).*(?:enjoy|like|dislike|prefer|tend)',
-            r'(?:aggressive|tight|loose|conservative|wild|tricky)'
-        ]
-        
-        psychology_score = sum(1 for pattern in psychology_patterns if re.search(pattern, text))
+        psychology_score = PSYCHOLOGY_BANK.count_matching(text)
         
         # Tendency attribution
-        tendency_patterns = [
-            r'history of',
-            r'pattern of',
-            r'tendency to',
-            r'known for',
-            r'shown.*to',
-            r'demonstrated'
-        ]
-        
-        tendency_score = sum(1 for pattern in tendency_patterns if re.search(pattern, text))
+        tendency_score = TENDENCY_BANK.count_matching(text)
         
         # Historical reference
-        history_patterns = [
-            r'previous.*(?:hand|action|bet|play)',
-            r'earlier.*(?:showed|demonstrated)',
-            r'past.*(?:behavior|actions)',
-            r'shown down',
-            r'has.*(?:been|shown)'
-        ]
-        
-        history_score = sum(1 for pattern in history_patterns if re.search(pattern, text))
+        history_score = HISTORY_BANK.count_matching(text)
         
         return {
             'references': min(opponent_refs, 5),
@@ -367,36 +721,19 @@ class CognitiveToMAnalyzer:
             'history': min(history_score, 3)
         }
     
-    def detect_game_theory_concepts(self, text):
+    def detect_game_theory_concepts(self, text, hits=None):
         """Detect game theory and poker theory concepts."""
         
-        # Game theory terms
-        game_theory_terms = [
-            'equilibrium', 'nash', 'optimal', 'strategy', 'payoff', 'utility',
-            'expectation', 'expected value', 'ev', 'gto', 'exploitative'
-        ]
+        hits = hits or LEXICON_INDEX.scan_text(text)
         
-        theory_count = sum(1 for term in game_theory_terms if term in text)
+        # Game theory terms
+        theory_count = hits.count_present('game_theory_terms')
         
         # Strategic concepts
-        strategic_concepts = [
-            'range', 'polarized', 'merged', 'balanced', 'frequency',
-            'fold equity', 'implied odds', 'reverse implied odds',
-            'blockers', 'combinatorics', 'outs'
-        ]
-        
-        concept_count = sum(1 for concept in strategic_concepts if concept in text)
+        concept_count = hits.count_present('poker_theory_concepts')
         
         # Expected value reasoning
-        ev_patterns = [
-            r'extract.*value',
-            r'maximize.*value',
-            r'positive.*expectation',
-            r'profitable',
-            r'expected.*return'
-        ]
-        
-        ev_reasoning = sum(1 for pattern in ev_patterns if re.search(pattern, text))
+        ev_reasoning = EV_BANK.count_matching(text)
         
         return {
             'terms': theory_count,
@@ -404,15 +741,17 @@ class CognitiveToMAnalyzer:
             'ev_reasoning': ev_reasoning
         }
     
-    def calculate_reasoning_sophistication(self, text):
+    def calculate_reasoning_sophistication(self, text, hits=None):
         """Calculate overall reasoning sophistication score."""
         
+        hits = hits or LEXICON_INDEX.scan_text(text)
+        
         # Components of sophisticated reasoning
         components = {
             'length': min(len(text) / 200, 2),  # Longer explanations (up to 2 points)
             'vocabulary': len(set(text.split())) / len(text.split()) if text.split() else 0,  # Vocabulary diversity
-            'specificity': text.count('$') + text.count('%') + text.count('♠') + text.count('♥') + text.count('♦') + text.count('♣'),  # Specific references
-            'logical_structure': text.count('.') + text.count(','),  # Sentence complexity
+            'specificity': hits.occurrences('specificity_marks'),  # Specific references
+            'logical_structure': hits.occurrences('structure_marks'),  # Sentence complexity
         }
         
         # Normalize and combine
@@ -427,6 +766,8 @@ class CognitiveToMAnalyzer:
     
     def create_cognitive_dashboard(self):
         """Create comprehensive cognitive analysis dashboard."""
+        plt = pyplot(**PLOT_STYLE)
+        import seaborn as sns
         
         fig, axes = plt.subplots(3, 3, figsize=(20, 18))
         fig.suptitle('🧠 Cognitive Theory of Mind Analysis Dashboard', fontsize=20, fontweight='bold', y=0.98)
@@ -589,8 +930,7 @@ class CognitiveToMAnalyzer:
         print(context_comparison)
         
         # Correlation with accuracy
-        cognitive_cols = ['ToM_Level', 'Context_Integration_Score', 'Strategic_Reasoning_Score', 
-                         'Opponent_Psychology', 'Reasoning_Sophistication']
+        cognitive_cols = ACCURACY_FACTOR_COLUMNS
         correlations = self.cognitive_df[cognitive_cols + ['Is_Correct']].corr()['Is_Correct'].sort_values(ascending=False)[:-1]
         
         print(f"\n📊 COGNITIVE FACTORS CORRELATED WITH ACCURACY:")
@@ -619,8 +959,12 @@ class CognitiveToMAnalyzer:
             'accuracy_correlations': correlations
         }
         
-    def export_cognitive_analysis(self):
-        """Export detailed cognitive analysis results."""
+    def export_cognitive_analysis(self, fmt='csv'):
+        """Export detailed cognitive analysis results.
+        
+        The per-explanation table is written in fmt (csv, parquet or feather); the
+        per-model summary is a few rows and stays CSV.
+        """
         
         # Summary statistics by model
         model_summary = self.cognitive_df.groupby('Model').agg({
@@ -636,19 +980,211 @@ class CognitiveToMAnalyzer:
         model_summary.to_csv('cognitive_analysis_summary.csv')
         
         # Detailed explanation analysis
-        self.cognitive_df.to_csv('detailed_cognitive_analysis.csv', index=False)
+        detailed_path = write_table(self.cognitive_df, 'detailed_cognitive_analysis.csv', fmt)
         
         print("📁 Cognitive analysis exported:")
         print("  - cognitive_analysis_summary.csv")
-        print("  - detailed_cognitive_analysis.csv")
+        print(f"  - {detailed_path}")
+
+
+class RunningCovariance:
+    """Co-moments of several columns, merged chunk by chunk.
+    
+    Holds only the count, column means and the co-moment matrix; chunks are combined
+    with the pairwise update of Chan et al., which stays accurate for long streams.
+    """
+    
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.n = 0
+        self.mean = np.zeros(len(self.columns))
+        self.comoment = np.zeros((len(self.columns), len(self.columns)))
+    
+    def update(self, values):
+        """Fold a (rows x columns) array into the running co-moments."""
+        n_chunk = len(values)
+        if n_chunk == 0:
+            return
+        mean_chunk = values.mean(axis=0)
+        centered = values - mean_chunk
+        n_total = self.n + n_chunk
+        delta = mean_chunk - self.mean
+        self.comoment += centered.T @ centered + np.outer(delta, delta) * self.n * n_chunk / n_total
+        self.mean += delta * n_chunk / n_total
+        self.n = n_total
+    
+    def correlation(self):
+        """Pearson correlation matrix, like DataFrame.corr()."""
+        scale = np.sqrt(np.diag(self.comoment))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.comoment / np.outer(scale, scale)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+class StreamingCognitiveSummary(CognitiveToMAnalyzer):
+    """Constant-memory equivalent of CognitiveToMAnalyzer.generate_cognitive_insights.
+    
+    Reads the results in chunks (without the raw response column), extracts each
+    chunk's features and keeps running aggregates: the ToM-level histogram, per-model
+    and per-context sums, co-moments for the accuracy correlations and the current top
+    explanations. No full cognitive_df is built, so the dashboard and export methods
+    are not available; only generate_cognitive_insights is.
+    """
+    
+    CONTEXT_COLUMNS = ['ToM_Level', 'Strategic_Reasoning_Score', 'Uncertainty_Markers', 'Opponent_Psychology']
+    TOP_EXPLANATIONS = 3
+    
+    def __init__(self, data_file, chunksize=STREAM_CHUNKSIZE, n_jobs=1, feature_cache=None):
+        """Stream the results CSV file through feature extraction and the running aggregates."""
+        self.n_jobs = os.cpu_count() if n_jobs == -1 else max(1, n_jobs)
+        self.feature_cache = feature_cache
+        self.cognitive_df = None
+        
+        self.rows = 0
+        self.tom_counts = Counter()
+        self.model_tom = {}                # model -> [ToM level sum, explanations]
+        self.context_sums = {}             # context -> [explanations, sums of CONTEXT_COLUMNS]
+        self.covariance = RunningCovariance(ACCURACY_FACTOR_COLUMNS + ['Is_Correct'])
+        self.top_explanations = None
+        
+        print("🔍 Streaming cognitive patterns...")
+        for chunk in iter_table(data_file, columns=RESULTS_COLUMNS, chunksize=chunksize):
+            chunk['Model_Short'] = chunk['LLM_Model'].str.split('/').str[-1].str.replace('-Preview', '').str[:25]
+            chunk = chunk.dropna(subset=['Explanation_Text'])
+            if self.feature_cache is not None:
+                features = self.extract_cognitive_features_cached(chunk)
+            else:
+                features = self.compute_cognitive_features(chunk)
+            self.update(apply_schema(features))
+        
+        print(f"🧠 Cognitive Analysis streamed: {self.rows} explanations from {len(self.model_tom)} models")
+    
+    def update(self, features):
+        """Fold the cognitive features of one chunk into the running aggregates."""
+        self.rows += len(features)
+        self.tom_counts.update(features['ToM_Level'].value_counts().to_dict())
+        
+        for model, row in features.groupby('Model', observed=True)['ToM_Level'].agg(['sum', 'count']).iterrows():
+            totals = self.model_tom.setdefault(model, [0, 0])
+            totals[0] += row['sum']
+            totals[1] += row['count']
+        
+        for context, group in features.groupby('Context_Type', observed=True):
+            totals = self.context_sums.setdefault(context, [0, np.zeros(len(self.CONTEXT_COLUMNS))])
+            totals[0] += len(group)
+            totals[1] += group[self.CONTEXT_COLUMNS].sum().to_numpy(dtype=float)
+        
+        self.covariance.update(features[self.covariance.columns].to_numpy(dtype=float))
+        
+        # Only the best few candidates are kept; ties keep file order
+        candidates = features[(features['Is_Correct'] == 1) & (features['ToM_Level'] == 2)]
+        if self.top_explanations is not None:
+            candidates = pd.concat([self.top_explanations, candidates], ignore_index=True)
+        self.top_explanations = candidates.sort_values(
+            'Reasoning_Sophistication', ascending=False, kind='stable'
+        ).head(self.TOP_EXPLANATIONS)
+    
+    def generate_cognitive_insights(self):
+        """Generate the insights of CognitiveToMAnalyzer.generate_cognitive_insights."""
+        
+        print("\n" + "="*80)
+        print("🧠 COGNITIVE THEORY OF MIND INSIGHTS")
+        print("="*80)
+        
+        # Overall ToM levels
+        tom_distribution = pd.Series(self.tom_counts, dtype=float).sort_values(ascending=False) / self.rows * 100
+        tom_distribution.index.name, tom_distribution.name = 'ToM_Level', 'proportion'
+        print(f"\n🎯 THEORY OF MIND LEVELS:")
+        print(f"Level 0 (None): {tom_distribution.get(0, 0):.1f}%")
+        print(f"Level 1 (First-order): {tom_distribution.get(1, 0):.1f}%")
+        print(f"Level 2 (Second-order): {tom_distribution.get(2, 0):.1f}%")
+        
+        # Model comparison
+        model_tom = pd.Series({model: total / count for model, (total, count) in self.model_tom.items()},
+                              name='ToM_Level').sort_index().sort_values(ascending=False)
+        model_tom.index.name = 'Model'
+        print(f"\n🤖 MODEL COGNITIVE RANKINGS:")
+        for model, tom_score in model_tom.items():
+            print(f"{model[:25]}: {tom_score:.2f} average ToM level")
+        
+        # Bluff vs Value cognitive differences
+        contexts = sorted(self.context_sums)
+        context_comparison = pd.DataFrame(
+            [self.context_sums[context][1] / self.context_sums[context][0] for context in contexts],
+            index=pd.Index(contexts, name='Context_Type'), columns=self.CONTEXT_COLUMNS
+        ).round(3)
+        
+        print(f"\n🎭 COGNITIVE DIFFERENCES: BLUFF vs VALUE")
+        print(context_comparison)
+        
+        # Correlation with accuracy
+        correlations = self.covariance.correlation()['Is_Correct'].sort_values(ascending=False)[:-1]
+        
+        print(f"\n📊 COGNITIVE FACTORS CORRELATED WITH ACCURACY:")
+        for factor, correlation in correlations.items():
+            print(f"{factor}: {correlation:.3f}")
+        
+        # Best explanations analysis
+        print(f"\n🏆 TOP THEORY OF MIND EXPLANATIONS:")
+        for idx, explanation in self.top_explanations.iterrows():
+            print(f"\nModel: {explanation['Model']}")
+            print(f"Context: {explanation['Context_Type']}")
+            print(f"ToM Level: {explanation['ToM_Level']}")
+            print(f"Sophistication: {explanation['Reasoning_Sophistication']:.2f}")
+            print(f"Text: {explanation['Explanation_Text'][:200]}...")
+            print("-" * 60)
+        
+        return {
+            'tom_distribution': tom_distribution,
+            'model_rankings': model_tom,
+            'context_differences': context_comparison,
+            'accuracy_correlations': correlations
+        }
+
+
+def close_feature_cache(feature_cache):
+    """Drop the vectors of older lexicon versions from the feature store and close it."""
+    if feature_cache is None:
+        return
+    pruned = feature_cache.prune()
+    if pruned:
+        print(f"🧹 Pruned {pruned} cached feature vectors of older lexicon versions")
+    feature_cache.close()
 
 
 def main():
     """Main cognitive analysis pipeline."""
+    parser = argparse.ArgumentParser(description="Cognitive Theory of Mind Analysis")
+    parser.add_argument("--results_csv", default="poker_tom_results_20250602_081719.csv",
+                        help="Experiment results file to analyze (a newer .parquet/.feather copy is read instead)")
+    parser.add_argument("--n_jobs", type=int, default=1,
+                        help="Worker processes for feature extraction (-1 uses every core)")
+    parser.add_argument("--feature_cache", default=FEATURE_CACHE,
+                        help="Persistent store of per-explanation features reused across runs")
+    parser.add_argument("--no_feature_cache", action="store_true",
+                        help="Analyze every explanation from scratch without reading or writing the store")
+    parser.add_argument("--stream", action="store_true",
+                        help="Only generate the cognitive insights, reading the results in chunks")
+    parser.add_argument("--chunksize", type=int, default=STREAM_CHUNKSIZE,
+                        help="Rows per chunk in streaming mode")
+    parser.add_argument("--output_format", choices=list(TABLE_FORMATS), default="csv",
+                        help="Format of detailed_cognitive_analysis; parquet and feather need pyarrow")
+    args = parser.parse_args()
+    
+    feature_cache = None if args.no_feature_cache else FeatureCache(args.feature_cache, LEXICON_VERSION)
+    
+    if args.stream:
+        print("🧠 Streaming Cognitive Theory of Mind Insights...")
+        summary = StreamingCognitiveSummary(args.results_csv, chunksize=args.chunksize,
+                                            n_jobs=args.n_jobs, feature_cache=feature_cache)
+        summary.generate_cognitive_insights()
+        close_feature_cache(feature_cache)
+        return
+    
     print("🧠 Starting Cognitive Theory of Mind Analysis...")
     
     # Initialize analyzer
-    analyzer = CognitiveToMAnalyzer('poker_tom_results_20250602_081719.csv')
+    analyzer = CognitiveToMAnalyzer(args.results_csv, n_jobs=args.n_jobs, feature_cache=feature_cache)
     
     # Create visualizations
     print("\n📊 Creating cognitive dashboard...")
@@ -660,13 +1196,15 @@ def main():
     
     # Export results
     print("\n📁 Exporting analysis...")
-    analyzer.export_cognitive_analysis()
+    analyzer.export_cognitive_analysis(args.output_format)
+    
+    close_feature_cache(feature_cache)
     
     print("\n✅ Cognitive analysis complete!")
     print("\nFiles generated:")
     print("- cognitive_tom_dashboard.png")
     print("- cognitive_analysis_summary.csv")
-    print("- detailed_cognitive_analysis.csv")
+    print(f"- detailed_cognitive_analysis{TABLE_FORMATS[args.output_format]}")
 
 
 if __name__ == "__main__":
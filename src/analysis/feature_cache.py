@@ -0,0 +1,93 @@
+"""Persistent on-disk store of per-explanation cognitive feature vectors."""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
+
+# SQLite's default limit on bound parameters is 999
+_QUERY_BATCH = 900
+
+
+class FeatureCache:
+    """SQLite-backed store of feature vectors keyed by explanation text and lexicon version.
+
+    A key hashes the explanation text together with the detector-lexicon version, so
+    changing any lexicon, pattern or detector version makes every stored vector miss
+    instead of returning stale features.
+    """
+
+    def __init__(self, path, version: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.version = version
+
+        self.hits = 0
+        self.misses = 0
+
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS features (
+                   key TEXT PRIMARY KEY,
+                   version TEXT,
+                   features TEXT,
+                   created REAL
+               )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_version ON features (version)")
+        self._conn.commit()
+
+    def make_key(self, text: str) -> str:
+        """Hash an explanation text and the lexicon version into a key."""
+        payload = json.dumps([self.version, text], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List]:
+        """Stored feature vectors for the keys that are present."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        for start in range(0, len(keys), _QUERY_BATCH):
+            batch = keys[start:start + _QUERY_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, features FROM features WHERE key IN ({placeholders})", batch
+            )
+            found.update((key, json.loads(features)) for key, features in rows)
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: Dict[str, Sequence]):
+        """Store feature vectors (lists of JSON-serialisable values) by key."""
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO features (key, version, features, created) VALUES (?, ?, ?, ?)",
+            ((key, self.version, json.dumps(list(values)), now) for key, values in entries.items())
+        )
+        self._conn.commit()
+
+    def prune(self) -> int:
+        """Delete vectors stored under other lexicon versions; returns how many."""
+        deleted = self._conn.execute("DELETE FROM features WHERE version != ?", (self.version,)).rowcount
+        self._conn.commit()
+        return deleted
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this session plus the number of stored vectors."""
+        entries = self._conn.execute(
+            "SELECT COUNT(*) FROM features WHERE version = ?", (self.version,)
+        ).fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+    def close(self):
+        """Close the underlying database connection."""
+        self._conn.close()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Lexicon Index: Single-Pass Keyword Matching
+===========================================
+Finds every keyword of a set of lexicons in one linear scan of the text, instead
+of one str.count / `in` pass per keyword.
+
+The keywords are compiled into a single trie-shaped regular expression wrapped in
+a lookahead, so the scan reports, at every position where some keyword starts, the
+longest keyword starting there. Every other keyword starting at that position is a
+prefix of it, so a precomputed prefix closure turns each hit into the full set of
+(position, keyword) occurrences - the output function of an Aho-Corasick automaton,
+with the automaton itself run by the C regex engine.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Sequence
+
+import numpy as np
+
+
+def _trie_pattern(keywords):
+    """Regex matching the longest of keywords at the current position."""
+
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def node_pattern(node):
+        branches = [re.escape(char) + node_pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Longer keywords are tried first; a keyword ending here is the fallback
+        if '' in node:
+            return body + '?' if len(branches) == 1 and len(body) == 1 else '(?:' + body + ')?'
+        return body
+
+    return node_pattern(trie)
+
+
+def _self_overlapping(keyword):
+    """Whether two occurrences of keyword can overlap (it has a proper border)."""
+    return any(keyword[:size] == keyword[-size:] for size in range(1, len(keyword)))
+
+
+class LexiconHits:
+    """Per-text keyword counts from one LexiconIndex scan.
+
+    counts[i, k] is the number of non-overlapping occurrences of keyword k in text i,
+    the same as texts[i].count(keyword). Category queries return one value per text.
+    """
+
+    def __init__(self, index: 'LexiconIndex', counts: np.ndarray):
+        self.index = index
+        self.counts = counts
+
+    def occurrences(self, category: str) -> np.ndarray:
+        """sum(text.count(word) for word in lexicon), per text."""
+        return self.counts[:, self.index.category_ids[category]].sum(axis=1, dtype=np.int64)
+
+    def contains_any(self, category: str) -> np.ndarray:
+        """any(word in text for word in lexicon), per text."""
+        return (self.counts[:, self.index.category_ids[category]] > 0).any(axis=1)
+
+    def count_present(self, category: str) -> np.ndarray:
+        """Number of lexicon words that occur in each text."""
+        return (self.counts[:, self.index.category_ids[category]] > 0).sum(axis=1, dtype=np.int64)
+
+
+class TextLexiconHits:
+    """Keyword counts of a single text; category queries return plain ints and bools.
+
+    Category totals are accumulated from the keywords actually found, in plain Python,
+    since array overhead outweighs the work for one short text.
+    """
+
+    def __init__(self, index: 'LexiconIndex', counts: Counter):
+        self.index = index
+        self.counts = counts
+        self._occurrences = Counter()
+        self._present = Counter()
+        for keyword, n in counts.items():
+            for category in index.keyword_categories[keyword]:
+                self._occurrences[category] += n
+                self._present[category] += 1
+
+    def occurrences(self, category: str) -> int:
+        return self._occurrences[category]
+
+    def contains_any(self, category: str) -> bool:
+        return category in self._present
+
+    def count_present(self, category: str) -> int:
+        return self._present[category]
+
+
+class LexiconIndex:
+    """One automaton over several named keyword lists.
+
+    A keyword may appear in several lexicons; it is matched once and counted in each.
+    """
+
+    def __init__(self, lexicons: Dict[str, Sequence[str]]):
+        self.lexicons = {name: list(words) for name, words in lexicons.items()}
+        self.keywords = sorted({word for words in self.lexicons.values() for word in words})
+        keyword_ids = {keyword: i for i, keyword in enumerate(self.keywords)}
+
+        # Repeated words in a list are counted once per listing, as in sum(text.count(w) for w in words)
+        self.category_ids = {
+            name: np.array([keyword_ids[word] for word in words], dtype=np.int64)
+            for name, words in self.lexicons.items()
+        }
+
+        # Zero-width lookahead: every start position is reported, even inside an earlier hit
+        self.pattern = re.compile('(?=(' + _trie_pattern(self.keywords) + '))')
+
+        # Prefix closure: the keywords starting wherever keyword is the longest match
+        closure = [[keyword_ids[other] for other in self.keywords if keyword.startswith(other)]
+                   for keyword in self.keywords]
+        self._closure_sizes = np.array([len(ids) for ids in closure], dtype=np.int64)
+        self._closure_offsets = np.concatenate(([0], np.cumsum(self._closure_sizes)[:-1]))
+        self._closure_ids = np.array([i for ids in closure for i in ids], dtype=np.int64)
+        self._keyword_ids = keyword_ids
+
+        # Categories listing each keyword, once per listing
+        self.keyword_categories = {keyword: [] for keyword in self.keywords}
+        for name, words in self.lexicons.items():
+            for word in words:
+                self.keyword_categories[word].append(name)
+        self._closure_words = {keyword: [self.keywords[i] for i in ids]
+                               for keyword, ids in zip(self.keywords, closure)}
+
+        # Keywords whose occurrences can overlap need str.count's greedy left-to-right rule
+        self._overlapping_ids = [keyword_ids[k] for k in self.keywords if _self_overlapping(k)]
+        self._overlapping_words = {k for k in self.keywords if _self_overlapping(k)}
+
+    def scan(self, text: str, starts: Sequence[int]) -> LexiconHits:
+        """Count every keyword in a corpus of texts concatenated into text.
+
+        starts holds the offset of each text. Texts must be separated by a character
+        that no keyword contains, so no occurrence spans two texts.
+        """
+
+        starts = np.asarray(starts, dtype=np.int64)
+        size, n_keywords = len(starts), len(self.keywords)
+
+        longest = [(match.start(), self._keyword_ids[match.group(1)]) for match in self.pattern.finditer(text)]
+        longest = np.array(longest, dtype=np.int64).reshape(-1, 2)
+
+        # Expand each longest match to all keywords starting at the same position
+        sizes = self._closure_sizes[longest[:, 1]]
+        positions = np.repeat(longest[:, 0], sizes)
+        first = np.repeat(self._closure_offsets[longest[:, 1]] - np.cumsum(sizes) + sizes, sizes)
+        keyword_ids = self._closure_ids[first + np.arange(len(positions))]
+
+        owners = np.searchsorted(starts, positions, side='right') - 1
+        counts = np.bincount(owners * n_keywords + keyword_ids, minlength=size * n_keywords)
+        counts = counts.reshape(size, n_keywords).astype(np.int32)
+
+        for keyword_id in self._overlapping_ids:
+            selected = keyword_ids == keyword_id
+            counts[:, keyword_id] = self._non_overlapping_counts(
+                owners[selected], positions[selected], len(self.keywords[keyword_id]), size
+            )
+
+        return LexiconHits(self, counts)
+
+    def scan_text(self, text: str) -> TextLexiconHits:
+        """Count every keyword in a single text."""
+        counts = Counter()
+        for longest, n in Counter(self.pattern.findall(text)).items():
+            for keyword in self._closure_words[longest]:
+                counts[keyword] += n
+        # Only the few self-overlapping keywords need str.count's left-to-right rule
+        for keyword in self._overlapping_words & counts.keys():
+            counts[keyword] = text.count(keyword)
+        return TextLexiconHits(self, counts)
+
+    @staticmethod
+    def _non_overlapping_counts(owners: np.ndarray, positions: np.ndarray, length: int, size: int) -> np.ndarray:
+        """Count occurrences per text, skipping any that start inside the previous one."""
+        counts = np.zeros(size, dtype=np.int32)
+        last_owner, last_end = -1, 0
+        for owner, position in zip(owners.tolist(), positions.tolist()):
+            if owner != last_owner:
+                last_owner, last_end = owner, 0
+            if position >= last_end:
+                counts[owner] += 1
+                last_end = position + length
+        return counts
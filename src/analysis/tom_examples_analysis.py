@@ -4,11 +4,51 @@ Theory of Mind Examples Analysis: Detailed Examination of Cognitive Patterns
 ============================================================================
 """
 
-import pandas as pd
-import re
+import sys
+from pathlib import Path
+
+from tom_patterns import PatternBank
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from results_store import read_table
+
+# First-order ToM patterns (opponent mental states)
+FIRST_ORDER_PATTERNS = [
+    r"opponent.*(?:thinks|believes|wants|knows|assumes|expects|hopes)",
+    r"(?:they|he).*(?:think|believe|want|know|assume|expect|hope)",
+    r"opponent.*(?:is trying|is attempting|is looking)",
+    r"opponent.*(?:enjoys|likes|prefers|tends)"
+]
+
+# Second-order ToM patterns (opponent thinking about hero's thoughts)
+SECOND_ORDER_PATTERNS = [
+    r"exploit.*(?:your|hero).*(?:range|hand|position)",
+    r"induce.*(?:folds|calls).*from.*(?:you|hero)",
+    r"make.*(?:you|hero).*(?:think|believe|fold)",
+    r"attempting to.*(?:bluff|exploit).*(?:your|hero)"
+]
+
+# Strategic deception detection
+DECEPTION_PATTERNS = [
+    r"bluff.*attempt",
+    r"trying to.*(?:induce|exploit|extract)",
+    r"scare.*card",
+    r"represent.*(?:strength|weakness)"
+]
+
+# Compiled once; findall gives the same matches as re.findall with each pattern
+FIRST_ORDER_BANK = PatternBank(FIRST_ORDER_PATTERNS)
+SECOND_ORDER_BANK = PatternBank(SECOND_ORDER_PATTERNS)
+DECEPTION_BANK = PatternBank(DECEPTION_PATTERNS)
 
 # Read the cognitive analysis results
-cognitive_df = pd.read_csv('detailed_cognitive_analysis.csv')
+cognitive_df = read_table('detailed_cognitive_analysis.csv', columns=[
+    'Model', 'Context_Type', 'Is_Correct', 'Explanation_Text', 'ToM_Level', 'Context_Integration_Score',
+    'Strategic_Reasoning_Score', 'Opponent_Psychology', 'Reasoning_Sophistication'
+])
 
 print("🔍 DETAILED THEORY OF MIND EXAMPLES ANALYSIS")
 print("=" * 70)
@@ -16,45 +56,10 @@ print("=" * 70)
 def analyze_tom_reasoning(text, context_type, model):
     """Analyze specific ToM reasoning patterns in text."""
     
-    # First-order ToM patterns (opponent mental states)
-    first_order_patterns = [
-        r"opponent.*(?:thinks|believes|wants|knows|assumes|expects|hopes)",
-        r"(?:they|he).*(?:think|believe|want|know|assume|expect|hope)",
-        r"opponent.*(?:is trying|is attempting|is looking)",
-        r"opponent.*(?:enjoys|likes|prefers|tends)"
-    ]
-    
-    # Second-order ToM patterns (opponent thinking about hero's thoughts)
-    second_order_patterns = [
-        r"exploit.*(?:your|hero).*(?:range|hand|position)",
-        r"induce.*(?:folds|calls).*from.*(?:you|hero)",
-        r"make.*(?:you|hero).*(?:think|believe|fold)",
-        r"attempting to.*(?:bluff|exploit).*(?:your|hero)"
-    ]
-    
-    # Strategic deception detection
-    deception_patterns = [
-        r"bluff.*attempt",
-        r"trying to.*(?:induce|exploit|extract)",
-        r"scare.*card",
-        r"represent.*(?:strength|weakness)"
-    ]
-    
-    first_order_matches = []
-    second_order_matches = []
-    deception_matches = []
-    
-    for pattern in first_order_patterns:
-        matches = re.findall(pattern, text.lower())
-        first_order_matches.extend(matches)
-    
-    for pattern in second_order_patterns:
-        matches = re.findall(pattern, text.lower())
-        second_order_matches.extend(matches)
-        
-    for pattern in deception_patterns:
-        matches = re.findall(pattern, text.lower())
-        deception_matches.extend(matches)
+    text = text.lower()
+    first_order_matches = FIRST_ORDER_BANK.findall(text)
+    second_order_matches = SECOND_ORDER_BANK.findall(text)
+    deception_matches = DECEPTION_BANK.findall(text)
     
     return {
         'first_order': first_order_matches,
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+ToM Pattern Bank: Precompiled Reasoning-Pattern Matching
+========================================================
+The ToM and reasoning detectors describe each cue as a chain of phrases joined by
+`.*`, e.g. `opponent.*thinks.*(?:i|you|hero)`. Searched as written, every `.*` runs
+to the end of the line and backtracks, and every occurrence of the first phrase
+starts that over, so a chain that fails costs far more than one pass over the text.
+
+PatternBank compiles each pattern list once, at import, after rewrites that keep the
+exact re.search / re.findall results:
+
+- Bounded gaps. `.` never matches a newline, so a chain only has to be found within
+  one line, and it exists there iff taking the earliest-ending occurrence of each
+  phrase after the previous one succeeds. Each gap becomes a lazy `[^\\n]*?` committed
+  to that occurrence (an atomic group, written as lookahead + backreference for
+  Python < 3.11), anchored at the line start, so every line is scanned once.
+  An alternative that contains another one (`they` contains `he`) can never end
+  first and is dropped for this existence check.
+- One alternation. All patterns of a list are merged into one regex with a named
+  group per pattern, so "does any pattern match" is a single search and
+  match.lastgroup names the pattern that did.
+
+findall first finds the matching lines this way, then re-matches only those lines
+with the first and last phrases as written, so each match spans the same text as
+the original pattern.
+"""
+
+import re
+from typing import List, Optional, Sequence
+
+# A phrase between two `.*`: a literal, or a non-capturing group of literal alternatives
+_PHRASE = re.compile(r'\(\?:([^()\[\]\\.*+?{}^$]*)\)|([^()\[\]|\\.*+?{}^$]*)')
+
+
+def _chain_phrases(pattern: str) -> Optional[List[List[str]]]:
+    """The literal alternatives of each phrase of a `.*` chain, or None for any other pattern."""
+    phrases = []
+    for phrase in pattern.split('.*'):
+        match = _PHRASE.fullmatch(phrase)
+        if match is None:
+            return None
+        alternatives = (match.group(1) if match.group(1) is not None else match.group(2)).split('|')
+        if '' in alternatives:
+            return None
+        phrases.append(alternatives)
+    return phrases if len(phrases) > 1 else None
+
+
+def _earliest_ending(alternatives: List[str]) -> str:
+    """A phrase matching the same places, with no alternative containing another.
+
+    Wherever an alternative occurs, any alternative it contains occurs too and ends no
+    later, so only the contained one matters for whether a chain exists. Afterwards
+    the first occurrence found by a lazy scan is also the earliest-ending one.
+    """
+    kept = [alt for alt in dict.fromkeys(alternatives)
+            if not any(other != alt and other in alt for other in alternatives)]
+    return '(?:' + '|'.join(kept) + ')'
+
+
+def _committed(phrase: str, group: str) -> str:
+    """Skip to the first occurrence of phrase on this line, without backtracking into it."""
+    return f'(?=(?P<{group}>[^\\n]*?{phrase}))(?P={group})'
+
+
+def line_pattern(pattern: str, name: str) -> str:
+    """Rewrite a `.*` chain into a regex that matches, from its start, each line containing it.
+
+    Any other pattern is returned unchanged. name prefixes the helper groups, which
+    must be unique within one regex.
+    """
+    phrases = _chain_phrases(pattern)
+    if phrases is None:
+        return pattern
+    return '(?m:^)' + ''.join(_committed(_earliest_ending(alternatives), f'{name}_{k}')
+                              for k, alternatives in enumerate(phrases))
+
+
+def span_pattern(pattern: str, name: str) -> Optional[str]:
+    """Rewrite a `.*` chain into a regex matching the same spans, linear within one line.
+
+    The first phrase and the greedy gap before the last phrase are kept as written, so
+    matches start and end where the original pattern's do. None if pattern is not a chain.
+    """
+    phrases = _chain_phrases(pattern)
+    if phrases is None:
+        return None
+    first, *middle, last = pattern.split('.*')
+    return (first
+            + ''.join(_committed(_earliest_ending(alternatives), f'{name}_{k}')
+                      for k, alternatives in enumerate(phrases[1:-1], start=1))
+            + f'[^\\n]*{last}')
+
+
+class PatternBank:
+    """A list of reasoning patterns compiled once for search, count and findall.
+
+    Results are identical to re.search / re.findall with the original pattern strings.
+    """
+
+    def __init__(self, patterns: Sequence[str], prefix: str = 'p'):
+        self.patterns = list(patterns)
+        self.names = [f'{prefix}{i}' for i in range(len(self.patterns))]
+
+        # Every pattern on its own, for per-pattern counts and findall
+        self.compiled = [re.compile(line_pattern(pattern, name))
+                         for pattern, name in zip(self.patterns, self.names)]
+        self._spanning = []
+        for pattern, name in zip(self.patterns, self.names):
+            spanning = span_pattern(pattern, name)
+            self._spanning.append(re.compile(spanning) if spanning is not None else None)
+
+        # All patterns as one alternation, for "any pattern matches"
+        self.combined = re.compile('|'.join(
+            f'(?P<{name}>{line_pattern(pattern, name)})'
+            for pattern, name in zip(self.patterns, self.names)
+        ))
+
+    def search(self, text: str) -> bool:
+        """any(re.search(pattern, text) for pattern in patterns)."""
+        return self.combined.search(text) is not None
+
+    def count_matching(self, text: str) -> int:
+        """Number of patterns that re.search finds in text."""
+        return sum(1 for regex in self.compiled if regex.search(text))
+
+    def findall(self, text: str) -> List[str]:
+        """re.findall of every pattern in turn, concatenated in pattern order."""
+        matches = []
+        for regex, spanning in zip(self.compiled, self._spanning):
+            if spanning is None:
+                matches.extend(regex.findall(text))
+                continue
+
+            # A chain matches at most once per line: from its first feasible start to
+            # the last occurrence of its final phrase
+            for line in regex.finditer(text):
+                line_end = text.find('\n', line.start())
+                line_end = len(text) if line_end < 0 else line_end
+                matches.append(spanning.search(text, line.start(), line_end).group(0))
+        return matches
@@ -2,174 +2,229 @@
 """
 Context Swapping Control Condition Test
 Tests whether models rely on Theory of Mind vs. poker knowledge by swapping opponent descriptions.
+
+Every scenario's Bluff and Value stimuli trade opponent descriptions
+(create_context_swapped_stimuli.create_context_swapped_pairs); hand, board, pot and bet
+stay the same. Originals and swaps run as one stimulus set through the experiment
+runner, each original directly followed by its swap, so a model is loaded once for
+both and, with a batch size that is a multiple of 2 x runs per stimulus, every
+original shares its generate call with its swap. Each response is then paired with
+the same model's response to the swap of the same run, and a pair flips when the two
+classifications differ.
+
+Usage:
+    python context_swapping_control.py --models "qwen3-1.7B-unsloth" "local-openai" --batch_size 6
+    python context_swapping_control.py --results results/poker_tom_results_*_context_swap_control_*.csv
 """
 
-import pandas as pd
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-import re
+import pandas as pd
 
-def load_and_prepare_data():
-    """Load the poker results data and prepare for analysis."""
-    
-    # Load the main results data
-    df = pd.read_csv('poker_tom_results_20250602_081719.csv')
-    
-    # Load the stimuli to get the original context descriptions
-    stimuli_df = pd.read_csv('poker_stimuli_20250527_212428.csv')
-    
-    return df, stimuli_df
+from poker_tom_experiment import PokerTOMExperiment, logger, NUM_RUNS_PER_STIM, GENERATION_MODES
 
-def create_context_swapped_scenarios(stimuli_df):
-    """Create context-swapped versions of selected scenarios."""
-    
-    # Select scenarios for swapping (ideally ones where context is the main differentiator)
-    scenarios_to_swap = ['S1', 'S3', 'S6', 'S8']  # Examples based on your data
+# poker_tom_experiment puts the repository root on sys.path
+from config import SEED, RESPONSE_CACHE, RESPONSE_CACHE_MAX_MB
+from create_context_swapped_stimuli import create_context_swapped_pairs
+from plot_style import pyplot
+from response_cache import ResponseCache
+from results_paper_latex import latex_escape
+from results_stats import binomial_p_value, wilson_interval
+from results_store import TABLE_FORMATS, read_table, table_columns, table_path, write_table
+
+# Label of the control stimulus set in results filenames, and the ID suffix of a swap
+CONTROL_LABEL = 'context_swap_control'
+SWAP_SUFFIX = '_Swapped'
+
+# A response and the response to its swap share model, original stimulus and run
+PAIR_KEYS = ['LLM_Model', 'Stimulus_ID', 'Run_Number']
+RESULT_COLUMNS = PAIR_KEYS + ['Core_Scenario_ID', 'Context_Type', 'Parsed_Classification',
+                              'Is_Classification_Correct']
+VALID_LABELS = ['Bluff', 'Value']
+
+PLOT_STYLE = dict(style='default')
+
+
+def build_control_stimuli(stimuli_df):
+    """Original stimuli and their context swaps as one set, each original followed by its swap.
     
-    swapped_scenarios = []
+    Only scenarios with both a Bluff and a Value stimulus can be swapped; the others
+    are left out.
+    """
     
-    for scenario_id in scenarios_to_swap:
-        # Get bluff and value versions of this scenario
-        bluff_row = stimuli_df[stimuli_df['Stimulus_ID'] == f'{scenario_id}_Bluff'].iloc[0]
-        value_row = stimuli_df[stimuli_df['Stimulus_ID'] == f'{scenario_id}_Value'].iloc[0]
-        
-        # Create swapped versions
-        bluff_swapped = bluff_row.copy()
-        value_swapped = value_row.copy()
-        
-        # Swap the opponent context descriptions while keeping everything else the same
-        bluff_swapped['Opponent_Context'] = value_row['Opponent_Context']
-        bluff_swapped['Stimulus_ID'] = f'{scenario_id}_Bluff_Swapped'
-        
-        value_swapped['Opponent_Context'] = bluff_row['Opponent_Context']
-        value_swapped['Stimulus_ID'] = f'{scenario_id}_Value_Swapped'
-        
-        swapped_scenarios.extend([bluff_swapped, value_swapped])
+    swapped_df = create_context_swapped_pairs(stimuli_df.copy()).drop(columns='Scenario_ID')
+    original_ids = swapped_df['ID'].str.removesuffix(SWAP_SUFFIX)
+    originals = stimuli_df[stimuli_df['ID'].isin(original_ids)]
     
-    return pd.DataFrame(swapped_scenarios)
+    control_df = pd.concat([originals, swapped_df], ignore_index=True)
+    order = pd.Categorical(control_df['ID'].str.removesuffix(SWAP_SUFFIX), categories=originals['ID']).codes
+    return control_df.iloc[np.argsort(order, kind='stable')].reset_index(drop=True)
 
-def analyze_context_sensitivity(df, model_name):
-    """Analyze how much a model's predictions change when context is swapped."""
-    
-    # Focus on scenarios where we have both original and swapped versions
-    results = []
-    
-    # Define scenario pairs for comparison
-    scenario_pairs = [
-        ('S1_Bluff', 'S1_Bluff_Swapped'),
-        ('S1_Value', 'S1_Value_Swapped'),
-        ('S3_Bluff', 'S3_Bluff_Swapped'),
-        ('S3_Value', 'S3_Value_Swapped'),
-    ]
-    
-    for original, swapped in scenario_pairs:
-        # Get predictions for original scenario
-        orig_data = df[(df['Stimulus_ID'] == original) & (df['LLM_Model'] == model_name)]
-        
-        if len(orig_data) == 0:
-            continue
-            
-        # Calculate prediction consistency
-        orig_predictions = orig_data['Parsed_Classification'].values
-        orig_accuracy = orig_data['Is_Classification_Correct'].mean()
-        
-        # For this analysis, we'll simulate swapped results based on the pattern
-        # In a real experiment, you'd re-run the models on swapped stimuli
-        
-        result = {
-            'Model': model_name,
-            'Scenario': original,
-            'Original_Accuracy': orig_accuracy,
-            'Context_Type': 'Bluff' if 'Bluff' in original else 'Value',
-            'N_Responses': len(orig_data)
-        }
-        results.append(result)
-    
-    return pd.DataFrame(results)
 
-def simulate_context_swapping_experiment(df):
-    """Simulate what would happen if we ran context swapping experiments."""
-    
-    models = df['LLM_Model'].unique()
-    
-    # Simulate different levels of context sensitivity for each model
-    context_sensitivity = {
-        'Hush-Qwen2.5-7B': 0.75,  # High ToM - should change predictions significantly
-        'OLMoE-1B-7B-0125-Instruct': 0.45,  # Medium ToM
-        'EXAONE-3.5-2.4B-Instruct': 0.30,  # Low ToM
-        'Llama-3.2-SUN-HDIC-1B-Ins': 0.10,  # Very low ToM - mostly poker heuristics
-    }
-    
-    results = []
-    
-    for model in models:
-        if model not in context_sensitivity:
-            continue
-            
-        sensitivity = context_sensitivity[model]
+def run_control_experiment(models: List[str], control_df: pd.DataFrame, output_dir: str = "./results",
+                           batch_size: Optional[int] = None, use_prefix_cache: bool = False, max_concurrency: int = 1,
+                           seed: int = SEED, response_cache: Optional[ResponseCache] = None,
+                           resume: bool = False, num_workers: int = 1,
+                           threads_per_worker: Optional[int] = None, generation_mode: str = 'full',
+                           results_format: str = 'csv') -> List[Path]:
+    """Run the control stimulus set through every model, loading each model once.
+    
+    By default each batch holds one original and its swap, all runs of both.
+    Returns the results table of each model.
+    """
+    
+    runs = 1 if generation_mode == 'score' else NUM_RUNS_PER_STIM
+    if batch_size is None:
+        batch_size = 2 * runs
+    if batch_size > 1 and batch_size % (2 * runs):
+        logger.warning(f"Batch size {batch_size} is not a multiple of {2 * runs}; "
+                       f"some originals and their swaps will be generated in different batches")
+    
+    results_paths = []
+    
+    # Duplicate model keys would trigger a second load, so collapse them
+    for model_name in dict.fromkeys(models):
+        experiment = PokerTOMExperiment(
+            model_name=model_name,
+            output_dir=output_dir,
+            batch_size=batch_size,
+            use_prefix_cache=use_prefix_cache,
+            max_concurrency=max_concurrency,
+            seed=seed,
+            response_cache=response_cache,
+            num_workers=num_workers,
+            threads_per_worker=threads_per_worker,
+            generation_mode=generation_mode,
+            results_format=results_format
+        )
         
-        # Simulate scenarios where context matters
-        for scenario in ['S1', 'S3', 'S6', 'S8']:
-            for context_type in ['Bluff', 'Value']:
-                
-                # Original prediction accuracy
-                orig_acc = np.random.normal(0.7, 0.1)  # Base accuracy
-                
-                # Swapped context accuracy - should change if model uses ToM
-                if np.random.random() < sensitivity:
-                    # Model is sensitive to context - prediction changes
-                    swapped_acc = 1 - orig_acc + np.random.normal(0, 0.1)
-                    swapped_acc = np.clip(swapped_acc, 0, 1)
-                    context_effect = abs(orig_acc - swapped_acc)
-                else:
-                    # Model ignores context - prediction stays similar
-                    swapped_acc = orig_acc + np.random.normal(0, 0.05)
-                    swapped_acc = np.clip(swapped_acc, 0, 1)
-                    context_effect = abs(orig_acc - swapped_acc)
-                
-                results.append({
-                    'Model': model,
-                    'Scenario': f'{scenario}_{context_type}',
-                    'Original_Accuracy': orig_acc,
-                    'Swapped_Accuracy': swapped_acc,
-                    'Context_Effect': context_effect,
-                    'Context_Sensitivity': sensitivity
-                })
-    
-    return pd.DataFrame(results)
+        experiment.load_model()
+        try:
+            logger.info(f"Context swap control: {model_name} on {len(control_df)} stimuli")
+            experiment.run_stimuli(control_df, resume='latest' if resume else None, run_label=CONTROL_LABEL)
+            results_paths.append(table_path(experiment.journal.path, results_format))
+        finally:
+            experiment.unload_model()
+    
+    return results_paths
+
+
+def load_control_results(paths) -> pd.DataFrame:
+    """Read the columns the pairing needs from control results tables (plus P_Bluff in score mode)."""
+    
+    frames = []
+    for path in paths:
+        columns = RESULT_COLUMNS + [column for column in ['P_Bluff'] if column in table_columns(path)]
+        frames.append(read_table(path, columns=columns))
+    return pd.concat(frames, ignore_index=True)
+
+
+def pair_control_responses(results_df):
+    """One row per (model, original stimulus, run): the original and the swapped response side by side.
+    
+    A pair is valid when both responses are Bluff or Value, and flipped when they are
+    valid and differ. In score mode P_Bluff_Shift is the swap's change in P(Bluff).
+    """
+    
+    stimulus_ids = results_df['Stimulus_ID'].astype(str)
+    is_swapped = stimulus_ids.str.endswith(SWAP_SUFFIX)
+    responses = results_df.assign(
+        LLM_Model=results_df['LLM_Model'].astype(str),
+        Stimulus_ID=stimulus_ids.str.removesuffix(SWAP_SUFFIX),
+        Parsed_Classification=results_df['Parsed_Classification'].astype(str)
+    )
+    
+    def side(rows, prefix, columns):
+        renames = {'Parsed_Classification': f'{prefix}_Classification',
+                   'Is_Classification_Correct': f'{prefix}_Correct', 'P_Bluff': f'{prefix}_P_Bluff'}
+        columns = PAIR_KEYS + columns + [column for column in renames if column in rows.columns]
+        return rows[columns].drop_duplicates(PAIR_KEYS, keep='last').rename(columns=renames)
+    
+    # Ground truth is set by hand and bet, which the swap keeps, so it is the original's
+    paired = side(responses[~is_swapped], 'Original', ['Core_Scenario_ID', 'Context_Type']).merge(
+        side(responses[is_swapped], 'Swapped', []), on=PAIR_KEYS, how='inner'
+    )
+    
+    paired['Valid'] = (paired['Original_Classification'].isin(VALID_LABELS)
+                       & paired['Swapped_Classification'].isin(VALID_LABELS))
+    paired['Flipped'] = paired['Valid'] & (paired['Original_Classification'] != paired['Swapped_Classification'])
+    if 'Original_P_Bluff' in paired.columns:
+        paired['P_Bluff_Shift'] = paired['Swapped_P_Bluff'] - paired['Original_P_Bluff']
+    return paired.sort_values(PAIR_KEYS, ignore_index=True)
+
+
+def flip_rates(paired_df):
+    """Per model: flip rate of the valid pairs with a Wilson 95% interval, and accuracy before and after.
+    
+    Original and swap share the ground truth, so every flip either loses or gains a
+    correct answer. P_Value is the exact McNemar test of lost against gained.
+    """
+    
+    valid = paired_df[paired_df['Valid']]
+    rates = valid.assign(Lost=valid['Flipped'] & (valid['Original_Correct'] == 1)).groupby('LLM_Model').agg(
+        N_Pairs=('Flipped', 'size'),
+        Flips=('Flipped', 'sum'),
+        Lost=('Lost', 'sum'),
+        Original_Correct=('Original_Correct', 'sum'),
+        Swapped_Correct=('Swapped_Correct', 'sum')
+    )
+    rates['N_Invalid'] = (~paired_df['Valid']).groupby(paired_df['LLM_Model']).sum()
+    
+    rates['Gained'] = rates['Flips'] - rates['Lost']
+    rates['Flip_Rate'] = rates['Flips'] / rates['N_Pairs']
+    rates['Flip_CI_Low'], rates['Flip_CI_High'] = np.clip(wilson_interval(rates['Flips'], rates['N_Pairs']), 0, 1)
+    rates['Original_Accuracy'] = rates['Original_Correct'] / rates['N_Pairs']
+    rates['Swapped_Accuracy'] = rates['Swapped_Correct'] / rates['N_Pairs']
+    rates['Context_Effect'] = rates['Original_Accuracy'] - rates['Swapped_Accuracy']
+    rates['P_Value'] = binomial_p_value(rates['Lost'], rates['Flips'])
+    
+    rates = rates.drop(columns=['Original_Correct', 'Swapped_Correct'])
+    return rates.sort_values('Flip_Rate', ascending=False).rename_axis('Model').reset_index()
+
 
-def create_context_swapping_plots(results_df):
+def stimulus_flip_rates(paired_df):
+    """Per model and original stimulus: accuracy before and after the swap, and the flip rate."""
+    
+    valid = paired_df[paired_df['Valid']]
+    return valid.groupby(['LLM_Model', 'Stimulus_ID']).agg(
+        Original_Accuracy=('Original_Correct', 'mean'),
+        Swapped_Accuracy=('Swapped_Correct', 'mean'),
+        Flip_Rate=('Flipped', 'mean')
+    ).rename_axis(['Model', 'Stimulus_ID']).reset_index()
+
+
+def create_context_swapping_plots(rates_df, stimulus_df):
     """Create visualizations for context swapping analysis."""
+    plt = pyplot(**PLOT_STYLE)
     
-    # Plot 1: Context Effect by Model
+    # Plot 1: Flip rate by Model
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
     
-    # Context effect magnitude
-    model_effects = results_df.groupby('Model')['Context_Effect'].agg(['mean', 'std']).reset_index()
-    model_names = [m.split('-')[0] for m in model_effects['Model']]
+    model_names = [m.split('-')[0] for m in rates_df['Model']]
+    errors = [rates_df['Flip_Rate'] - rates_df['Flip_CI_Low'], rates_df['Flip_CI_High'] - rates_df['Flip_Rate']]
     
-    bars = ax1.bar(range(len(model_names)), model_effects['mean'], 
-                   yerr=model_effects['std'], capsize=5,
+    bars = ax1.bar(range(len(model_names)), rates_df['Flip_Rate'], yerr=errors, capsize=5,
                    color=['#2E86AB', '#A23B72', '#F18F01', '#E63946'], alpha=0.8)
     
     ax1.set_xlabel('Models', fontsize=12, fontweight='bold')
-    ax1.set_ylabel('Context Effect Magnitude', fontsize=12, fontweight='bold')
-    ax1.set_title('Context Sensitivity: Change in Predictions\nWhen Opponent Description is Swapped', 
+    ax1.set_ylabel('Flip Rate (95% CI)', fontsize=12, fontweight='bold')
+    ax1.set_title('Context Sensitivity: Change in Predictions\nWhen Opponent Description is Swapped',
                   fontsize=14, fontweight='bold')
     ax1.set_xticks(range(len(model_names)))
     ax1.set_xticklabels(model_names, rotation=45, ha='right')
     ax1.grid(True, alpha=0.3)
     
     # Add value labels
-    for bar, val in zip(bars, model_effects['mean']):
+    for bar, val in zip(bars, rates_df['Flip_Rate']):
         ax1.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 0.01,
                 f'{val:.3f}', ha='center', va='bottom', fontweight='bold')
     
-    # Plot 2: Scatter plot showing relationship
-    for i, model in enumerate(results_df['Model'].unique()):
-        model_data = results_df[results_df['Model'] == model]
+    # Plot 2: Per-stimulus accuracy before and after the swap
+    for model, model_data in stimulus_df.groupby('Model', sort=False):
         ax2.scatter(model_data['Original_Accuracy'], model_data['Swapped_Accuracy'],
                    label=model.split('-')[0], alpha=0.7, s=60)
     
@@ -177,20 +232,29 @@ def create_context_swapping_plots(results_df):
     ax2.plot([0, 1], [0, 1], 'k--', alpha=0.5, label='No Change')
     ax2.set_xlabel('Original Scenario Accuracy', fontsize=12, fontweight='bold')
     ax2.set_ylabel('Context-Swapped Accuracy', fontsize=12, fontweight='bold')
-    ax2.set_title('Prediction Consistency:\nOriginal vs. Context-Swapped Scenarios', 
+    ax2.set_title('Prediction Consistency:\nOriginal vs. Context-Swapped Scenarios',
                   fontsize=14, fontweight='bold')
     ax2.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
     ax2.grid(True, alpha=0.3)
-    ax2.set_xlim(0, 1)
-    ax2.set_ylim(0, 1)
+    ax2.set_xlim(-0.05, 1.05)
+    ax2.set_ylim(-0.05, 1.05)
     
     plt.tight_layout()
     plt.savefig('context_swapping_analysis.pdf', dpi=300, bbox_inches='tight')
     plt.show()
 
-def generate_context_control_table():
+def generate_context_control_table(rates_df):
     """Generate LaTeX table for context swapping control results."""
     
+    rows = []
+    for rate in rates_df.itertuples(index=False):
+        p_value = '< 0.001' if rate.P_Value < 0.001 else f'{rate.P_Value:.3f}'
+        rows.append(
+            f"{latex_escape(rate.Model)} & {rate.Flip_Rate * 100:.1f}\\% & {rate.Original_Accuracy * 100:.1f}\\% & "
+            f"{rate.Swapped_Accuracy * 100:.1f}\\% & {rate.Lost:.0f} / {rate.Gained:.0f} & {p_value} \\\\\n"
+            f"& [{rate.Flip_CI_Low * 100:.1f}, {rate.Flip_CI_High * 100:.1f}] & & & & \\\\"
+        )
+    
     latex_table = r"""
 \begin{table}[htbp]
 \centering
@@ -198,52 +262,45 @@ def generate_context_control_table():
 \label{tab:context_control}
 \begin{tabular}{@{}lccccc@{}}
 \toprule
-\textbf{Model} & \textbf{Context} & \textbf{Poker} & \textbf{Effect} & \textbf{ToM} & \textbf{p-value} \\
- & \textbf{Sensitivity} & \textbf{Reliance} & \textbf{Size} & \textbf{Evidence} & \\
+\textbf{Model} & \textbf{Flip} & \textbf{Original} & \textbf{Swapped} & \textbf{Lost /} & \textbf{p-value} \\
+ & \textbf{Rate} & \textbf{Accuracy} & \textbf{Accuracy} & \textbf{Gained} & \\
 \midrule
-Hush-Qwen2.5-7B & High & Low & 0.234 & Strong & < 0.001 \\
-& (75.3\%) & (24.7\%) & & & \\
-\addlinespace
-OLMoE-1B-7B & Medium & Medium & 0.156 & Moderate & < 0.01 \\
-& (51.2\%) & (48.8\%) & & & \\
-\addlinespace
-EXAONE-3.5-2.4B & Low & High & 0.089 & Weak & 0.045 \\
-& (32.1\%) & (67.9\%) & & & \\
-\addlinespace
-Llama-3.2-SUN-1B & Very Low & Very High & 0.031 & None & 0.312 \\
-& (12.4\%) & (87.6\%) & & & \\
+""" + "\n\\addlinespace\n".join(rows) + r"""
 \bottomrule
 \end{tabular}
 \begin{tablenotes}
 \small
-\item Note: Context Sensitivity = \% change in predictions when opponent description swapped.
-Poker Reliance = \% decisions based on hand/bet size only. Effect Size = Cohen's d.
+\item Note: Flip Rate = \% of responses whose classification changes when the opponent descriptions
+of a scenario are swapped (95\% Wilson interval below). Lost / Gained = flips from a correct to an
+incorrect answer and back; p-value = exact McNemar test of lost against gained.
 \end{tablenotes}
 \end{table}
 """
-    
+
     return latex_table
 
-def create_tom_vs_poker_knowledge_plot():
+def create_tom_vs_poker_knowledge_plot(rates_df):
     """Create a plot showing ToM vs. Poker Knowledge reliance."""
+    plt = pyplot(**PLOT_STYLE)
     
-    models = ['Hush-Qwen2.5-7B', 'OLMoE-1B-7B', 'EXAONE-3.5-2.4B', 'Llama-3.2-SUN-1B']
-    tom_reliance = [75.3, 51.2, 32.1, 12.4]
-    poker_reliance = [24.7, 48.8, 67.9, 87.6]
+    # A flip follows the opponent description; a kept answer follows hand and bet
+    models = list(rates_df['Model'])
+    tom_reliance = list(rates_df['Flip_Rate'] * 100)
+    poker_reliance = list(100 - rates_df['Flip_Rate'] * 100)
     
     fig, ax = plt.subplots(figsize=(12, 8))
     
     x = np.arange(len(models))
     width = 0.35
     
-    bars1 = ax.bar(x - width/2, tom_reliance, width, label='Theory of Mind Reasoning', 
+    bars1 = ax.bar(x - width/2, tom_reliance, width, label='Theory of Mind Reasoning',
                    color='#2E86AB', alpha=0.8)
-    bars2 = ax.bar(x + width/2, poker_reliance, width, label='Poker Knowledge/Heuristics', 
+    bars2 = ax.bar(x + width/2, poker_reliance, width, label='Poker Knowledge/Heuristics',
                    color='#E63946', alpha=0.8)
     
     ax.set_xlabel('Models', fontsize=14, fontweight='bold')
     ax.set_ylabel('Reliance (%)', fontsize=14, fontweight='bold')
-    ax.set_title('Theory of Mind vs. Poker Knowledge Reliance\n(Based on Context Swapping Control)', 
+    ax.set_title('Theory of Mind vs. Poker Knowledge Reliance\n(Based on Context Swapping Control)',
                  fontsize=16, fontweight='bold', pad=20)
     ax.set_xticks(x)
     ax.set_xticklabels([m.split('-')[0] for m in models], rotation=45, ha='right')
@@ -267,59 +324,122 @@ def create_tom_vs_poker_knowledge_plot():
     plt.show()
 
 def main():
-    """Run the context swapping control analysis."""
+    """Run the context swapping control experiment and analysis."""
+    
+    parser = argparse.ArgumentParser(description="Theory of Mind Poker Context Swapping Control")
+    parser.add_argument("--models", nargs="+", help="config.MODEL_CONFIGS keys to run the control on")
+    parser.add_argument("--results", nargs="+",
+                       help="Analyse these control results tables instead of running models")
+    parser.add_argument("--stimuli_csv", default="poker_stimuli_20250527_212428.csv",
+                       help="Original stimuli whose opponent descriptions are swapped")
+    parser.add_argument("--output_dir", default="./results", help="Output directory for results")
+    parser.add_argument("--batch_size", type=int, default=None,
+                       help="Prompts per padded generate call (default: 2 x runs per stimulus); a multiple "
+                            "of 2 x runs keeps each original and its swap in one call")
+    parser.add_argument("--prefix_cache", action="store_true",
+                       help="Encode the shared prompt header once and reuse its KV cache")
+    parser.add_argument("--max_concurrency", type=int, default=1,
+                       help="Requests kept in flight against the backend (async mode when > 1)")
+    parser.add_argument("--seed", type=int, default=SEED,
+                       help="Base sampling seed; run k of each stimulus uses seed + k")
+    parser.add_argument("--response_cache", nargs="?", const=str(RESPONSE_CACHE), default=None,
+                       help="Reuse responses from this on-disk cache (default path if no value given); "
+                            "originals already run by the main experiment are served from it")
+    parser.add_argument("--cache_max_mb", type=float, default=RESPONSE_CACHE_MAX_MB,
+                       help="Size bound of the response cache before LRU eviction")
+    parser.add_argument("--resume", action="store_true",
+                       help="Continue each model's control run from its latest journal")
+    parser.add_argument("--num_workers", type=int, default=1,
+                       help="Worker processes, each holding a model replica (1 runs in-process)")
+    parser.add_argument("--threads_per_worker", type=int, default=None,
+                       help="Math-library threads per worker (default: CPU cores / num_workers)")
+    parser.add_argument("--generation_mode", choices=GENERATION_MODES, default="full",
+                       help="full responses, stop after the classification, constrained Bluff/Value answer, "
+                            "or score P(Bluff) without decoding")
+    parser.add_argument("--results_format", choices=list(TABLE_FORMATS), default="csv",
+                       help="Results table format; parquet and feather are typed, compressed and need pyarrow")
+    
+    args = parser.parse_args()
+    if not args.models and not args.results:
+        parser.error("give --models to run the control, or --results to analyse earlier runs")
     
     print("Running Context Swapping Control Analysis...")
     print("=" * 50)
     
-    # Load data
-    try:
-        df, stimuli_df = load_and_prepare_data()
-        print(f"✓ Loaded {len(df)} responses from {len(df['LLM_Model'].unique())} models")
-    except FileNotFoundError:
-        print("⚠ Data files not found. Running simulation instead...")
-        df = pd.DataFrame()  # Empty for simulation
-    
-    # Simulate context swapping experiment
-    print("\n1. Simulating Context Swapping Experiment...")
-    results_df = simulate_context_swapping_experiment(df)
-    print(f"✓ Generated {len(results_df)} simulated control conditions")
+    results_paths = args.results
+    if args.models:
+        print("\n1. Running Context-Swapped Stimuli...")
+        control_df = build_control_stimuli(pd.read_csv(args.stimuli_csv))
+        print(f"✓ {len(control_df) // 2} original stimuli and their swaps")
+        
+        response_cache = None
+        if args.response_cache:
+            response_cache = ResponseCache(args.response_cache, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+        
+        results_paths = run_control_experiment(
+            models=args.models,
+            control_df=control_df,
+            output_dir=args.output_dir,
+            batch_size=args.batch_size,
+            use_prefix_cache=args.prefix_cache,
+            max_concurrency=args.max_concurrency,
+            seed=args.seed,
+            response_cache=response_cache,
+            resume=args.resume,
+            num_workers=args.num_workers,
+            threads_per_worker=args.threads_per_worker,
+            generation_mode=args.generation_mode,
+            results_format=args.results_format
+        )
+    
+    # Pair every original with its swap and compute the flip rates
+    print("\n2. Pairing Original and Swapped Responses...")
+    paired_df = pair_control_responses(load_control_results(results_paths))
+    rates_df = flip_rates(paired_df)
+    print(f"✓ {len(paired_df)} pairs from {len(rates_df)} models ({(~paired_df['Valid']).sum()} with an unparsed answer)")
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    pairs_path = write_table(paired_df, Path(args.output_dir) / f"context_swap_pairs_{timestamp}", args.results_format)
+    rates_path = Path(args.output_dir) / f"context_swap_flip_rates_{timestamp}.csv"
+    rates_df.to_csv(rates_path, index=False)
+    print(f"✓ Saved {pairs_path}")
+    print(f"✓ Saved {rates_path}")
     
     # Create visualizations
-    print("\n2. Creating Visualizations...")
-    create_context_swapping_plots(results_df)
-    create_tom_vs_poker_knowledge_plot()
+    print("\n3. Creating Visualizations...")
+    create_context_swapping_plots(rates_df, stimulus_flip_rates(paired_df))
+    create_tom_vs_poker_knowledge_plot(rates_df)
     print("✓ Saved context_swapping_analysis.pdf")
     print("✓ Saved tom_vs_poker_knowledge.pdf")
     
     # Generate LaTeX table
-    print("\n3. Generating LaTeX Table...")
-    control_table = generate_context_control_table()
+    print("\n4. Generating LaTeX Table...")
+    control_table = generate_context_control_table(rates_df)
     with open('context_control_table.tex', 'w') as f:
         f.write(control_table)
     print("✓ Saved context_control_table.tex")
     
     # Summary statistics
-    print("\n4. Summary Results:")
+    print("\n5. Summary Results:")
     print("-" * 30)
-    for model in results_df['Model'].unique():
-        model_data = results_df[results_df['Model'] == model]
-        avg_effect = model_data['Context_Effect'].mean()
-        context_sens = model_data['Context_Sensitivity'].iloc[0]
-        
-        print(f"{model.split('-')[0]:15} | Context Effect: {avg_effect:.3f} | "
-              f"ToM Reliance: {context_sens*100:.1f}%")
+    for rate in rates_df.itertuples(index=False):
+        print(f"{rate.Model.split('-')[0]:15} | Flip Rate: {rate.Flip_Rate:.3f} "
+              f"[{rate.Flip_CI_Low:.3f}, {rate.Flip_CI_High:.3f}] | "
+              f"Accuracy: {rate.Original_Accuracy:.3f} -> {rate.Swapped_Accuracy:.3f} (p = {rate.P_Value:.3g})")
     
-    print("\n5. Interpretation:")
+    print("\n6. Interpretation:")
     print("-" * 30)
-    print("• High Context Effect = Model uses Theory of Mind reasoning")
-    print("• Low Context Effect = Model relies on poker heuristics/pattern matching")
+    print("• High Flip Rate = Model uses Theory of Mind reasoning")
+    print("• Low Flip Rate = Model relies on poker heuristics/pattern matching")
     print("• This control distinguishes genuine ToM from domain knowledge")
     
     print("\nFiles generated:")
+    print(f"- {pairs_path}")
+    print(f"- {rates_path}")
     print("- context_swapping_analysis.pdf")
-    print("- tom_vs_poker_knowledge.pdf") 
+    print("- tom_vs_poker_knowledge.pdf")
     print("- context_control_table.tex")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Multi-Model Sweep Scheduler
+===========================
+
+Runs several models over several stimulus sets (e.g. the original stimuli and the
+context-swapped control) in one process. Each model is loaded exactly once, runs
+every stimulus set while resident, and is released before the next model loads.
+Per-model load time and throughput are reported at the end.
+
+Usage:
+    python model_sweep.py --models "qwen3-1.7B-unsloth" "local-openai" \
+        --stimuli_csvs poker_stimuli_20250527_212428.csv context_swapped_stimuli.csv
+"""
+
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from poker_tom_experiment import (
+    PokerTOMExperiment, logger, TEMPERATURE, MAX_NEW_TOKENS, NUM_RUNS_PER_STIM, GENERATION_MODES
+)
+
+# poker_tom_experiment puts the repository root on sys.path
+from config import SEED, RESPONSE_CACHE, RESPONSE_CACHE_MAX_MB
+from response_cache import ResponseCache
+from results_store import TABLE_FORMATS, table_path
+
+
+def run_sweep(models: List[str], stimuli_csvs: List[str], output_dir: str = "./results",
+              batch_size: int = 1, use_prefix_cache: bool = False, max_concurrency: int = 1,
+              seed: int = SEED, response_cache: Optional[ResponseCache] = None,
+              resume: bool = False, num_workers: int = 1,
+              threads_per_worker: Optional[int] = None, generation_mode: str = 'full',
+              results_format: str = 'csv') -> pd.DataFrame:
+    """Run every model over every stimulus set, loading each model once.
+
+    Returns one row per (model, stimulus set) with load time and throughput.
+    """
+
+    # Each stimulus file is read once and shared by every model
+    stimulus_sets = {}
+    for csv_path in dict.fromkeys(stimuli_csvs):
+        logger.info(f"Loading stimuli from: {csv_path}")
+        stimulus_sets[Path(csv_path).stem] = pd.read_csv(csv_path)
+
+    report = []
+
+    # Duplicate model keys would trigger a second load, so collapse them
+    for model_name in dict.fromkeys(models):
+        experiment = PokerTOMExperiment(
+            model_name=model_name,
+            output_dir=output_dir,
+            batch_size=batch_size,
+            use_prefix_cache=use_prefix_cache,
+            max_concurrency=max_concurrency,
+            seed=seed,
+            response_cache=response_cache,
+            num_workers=num_workers,
+            threads_per_worker=threads_per_worker,
+            generation_mode=generation_mode,
+            results_format=results_format
+        )
+
+        load_start = time.perf_counter()
+        experiment.load_model()
+        load_time = time.perf_counter() - load_start
+
+        try:
+            for label, stimuli_df in stimulus_sets.items():
+                logger.info(f"Sweep: {model_name} on {label} ({len(stimuli_df)} stimuli)")
+
+                run_start = time.perf_counter()
+                n_generated = experiment.run_stimuli(
+                    stimuli_df, resume='latest' if resume else None, run_label=label
+                )
+                run_time = time.perf_counter() - run_start
+
+                report.append({
+                    'Model': model_name,
+                    'Stimulus_Set': label,
+                    'Load_Time_s': round(load_time, 2),
+                    'Responses': n_generated,
+                    'Run_Time_s': round(run_time, 2),
+                    'Responses_per_s': round(n_generated / run_time, 3) if run_time > 0 else 0.0,
+                    'Results_File': str(table_path(experiment.journal.path, results_format))
+                })
+        finally:
+            experiment.unload_model()
+
+    return pd.DataFrame(report)
+
+
+def main():
+    """Main execution function."""
+
+    parser = argparse.ArgumentParser(description="Theory of Mind Poker Multi-Model Sweep")
+    parser.add_argument("--models", nargs="+", required=True, help="config.MODEL_CONFIGS keys to sweep")
+    parser.add_argument("--stimuli_csvs", nargs="+", default=["poker_stimuli_20250527_212428.csv"],
+                       help="Stimulus CSV files run by every model")
+    parser.add_argument("--output_dir", default="./results", help="Output directory for results")
+    parser.add_argument("--batch_size", type=int, default=1,
+                       help="Prompts per padded generate call (1 disables batching)")
+    parser.add_argument("--prefix_cache", action="store_true",
+                       help="Encode the shared prompt header once and reuse its KV cache")
+    parser.add_argument("--max_concurrency", type=int, default=1,
+                       help="Requests kept in flight against the backend (async mode when > 1)")
+    parser.add_argument("--seed", type=int, default=SEED,
+                       help="Base sampling seed; run k of each stimulus uses seed + k")
+    parser.add_argument("--response_cache", nargs="?", const=str(RESPONSE_CACHE), default=None,
+                       help="Reuse responses from this on-disk cache (default path if no value given)")
+    parser.add_argument("--cache_max_mb", type=float, default=RESPONSE_CACHE_MAX_MB,
+                       help="Size bound of the response cache before LRU eviction")
+    parser.add_argument("--resume", action="store_true",
+                       help="Continue each (model, stimulus set) from its latest journal")
+    parser.add_argument("--num_workers", type=int, default=1,
+                       help="Worker processes, each holding a model replica (1 runs in-process)")
+    parser.add_argument("--threads_per_worker", type=int, default=None,
+                       help="Math-library threads per worker (default: CPU cores / num_workers)")
+    parser.add_argument("--generation_mode", choices=GENERATION_MODES, default="full",
+                       help="full responses, stop after the classification, constrained Bluff/Value answer, "
+                            "or score P(Bluff) without decoding")
+    parser.add_argument("--results_format", choices=list(TABLE_FORMATS), default="csv",
+                       help="Results table format; parquet and feather are typed, compressed and need pyarrow")
+
+    args = parser.parse_args()
+
+    response_cache = None
+    if args.response_cache:
+        response_cache = ResponseCache(args.response_cache, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+
+    logger.info(f"Sweep parameters: T={TEMPERATURE}, Max_tokens={MAX_NEW_TOKENS}, Runs={NUM_RUNS_PER_STIM}")
+
+    report_df = run_sweep(
+        models=args.models,
+        stimuli_csvs=args.stimuli_csvs,
+        output_dir=args.output_dir,
+        batch_size=args.batch_size,
+        use_prefix_cache=args.prefix_cache,
+        max_concurrency=args.max_concurrency,
+        seed=args.seed,
+        response_cache=response_cache,
+        resume=args.resume,
+        num_workers=args.num_workers,
+        threads_per_worker=args.threads_per_worker,
+        generation_mode=args.generation_mode,
+        results_format=args.results_format
+    )
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = Path(args.output_dir) / f"model_sweep_report_{timestamp}.csv"
+    report_df.to_csv(report_path, index=False)
+
+    print("\nModel Sweep Report")
+    print("==================")
+    print(report_df.drop(columns=['Results_File']).to_string(index=False))
+    logger.info(f"Sweep report saved to: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
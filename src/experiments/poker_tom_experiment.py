@@ -4,17 +4,30 @@ Theory of Mind Poker Experiment Script
 =====================================
 
 Executes LLM classification experiments on poker scenarios to test Theory of Mind capabilities.
-Supports Unsloth-optimized models with configurable parameters.
+Models are loaded through the backend registry in model_adapters.py (Unsloth, transformers,
+OpenAI-compatible servers) using the entries in config.MODEL_CONFIGS.
 
 Usage:
     python poker_tom_experiment.py --model_name "qwen3-1.7B-unsloth" --output_dir "./results"
+    python poker_tom_experiment.py --model_name "qwen3-1.7B-unsloth" --batch_size 6
+    python poker_tom_experiment.py --model_name "local-openai" --max_concurrency 16
+    python poker_tom_experiment.py --model_name "qwen3-1.7B-unsloth" --response_cache
+    python poker_tom_experiment.py --model_name "qwen3-1.7B-unsloth" --resume
+    python poker_tom_experiment.py --model_name "qwen3-1.7B-unsloth" --num_workers 4 --threads_per_worker 8
+    python poker_tom_experiment.py --model_name "qwen3-1.7B-unsloth" --generation_mode classification
+    python poker_tom_experiment.py --model_name "qwen3-1.7B-unsloth" --generation_mode score --batch_size 16
 """
 
 import os
 import re
+import sys
 import csv
 import json
+import time
+import asyncio
 import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -23,6 +36,21 @@ from typing import Dict, List, Tuple, Optional
 import logging
 from tqdm import tqdm
 
+# Shared project modules (config.py, model_adapters.py) live at the repository root
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import SEED, RESPONSE_CACHE, RESPONSE_CACHE_MAX_MB
+from model_adapters import ModelAdapter, create_adapter, generation_stats
+from response_cache import ResponseCache
+from results_store import TABLE_FORMATS, read_table, table_columns, write_table
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -55,46 +83,297 @@ Please answer the following:
 1. Classification: (Answer **only** "Bluff" or "Value")
 2. Explanation: Explain **why** you classified the bet that way, referring to board texture, bet size, and the opponent tendencies described above."""
 
+# Static header shared by every prompt: everything before the first per-stimulus
+# field, cut at a line break so it tokenizes the same alone as inside a prompt
+PROMPT_PREFIX = PROMPT_TEMPLATE.split('{', 1)[0].rsplit('\n', 1)[0] + '\n'
+
+# Generation modes: full responses, stop once the classification is emitted,
+# answer the classification cue directly with only the label tokens allowed, or
+# score both labels from one forward pass (one row per stimulus with P(Bluff))
+GENERATION_MODES = ('full', 'classification', 'constrained', 'score')
+CLASSIFICATION_CUE = "1. Classification:"
+CLASSIFICATION_LABELS = ("Bluff", "Value")
+
+# Per-row performance columns, filled from the backend's generation statistics
+PERF_COLUMNS = ['Prompt_Tokens', 'Generated_Tokens', 'TTFT_s', 'Generation_Time_s', 'Tokens_per_s']
+
+# Model replica held by a worker process of the process-pool mode, and the barrier
+# its warm-up task waits at until every worker has loaded its replica
+_worker_experiment = None
+_worker_barrier = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process and its finished children, in MB."""
+    
+    if resource is None:
+        return None
+    
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    unit = 1 if sys.platform == 'darwin' else 1024
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak * unit / 1e6
+
+
+def _limit_threads(num_threads: int):
+    """Cap the math-library thread pools of the current process."""
+    
+    # Read by OpenMP/MKL/OpenBLAS when they initialize, so set before torch loads
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ[var] = str(num_threads)
+    
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(num_threads)
+
+
+def _init_worker(experiment_kwargs: Dict, threads_per_worker: int, cache_path: Optional[str],
+                 cache_max_bytes: int, barrier):
+    """Process-pool initializer: pin thread counts and load this worker's model replica."""
+    global _worker_experiment, _worker_barrier
+    
+    _limit_threads(threads_per_worker)
+    _worker_barrier = barrier
+    
+    # SQLite connections cannot cross processes, so each worker opens the cache itself
+    response_cache = ResponseCache(cache_path, max_bytes=cache_max_bytes) if cache_path else None
+    
+    _worker_experiment = PokerTOMExperiment(response_cache=response_cache, **experiment_kwargs)
+    _worker_experiment.load_model()
+
+
+def _worker_warm_up() -> int:
+    """Process-pool task: return once every worker has loaded its replica.
+    
+    A worker blocks here until all the others reach the barrier too, so one warm-up
+    task per worker lands on every worker.
+    """
+    _worker_barrier.wait()
+    return os.getpid()
+
+
+def _worker_run_chunk(chunk: List[Tuple[Dict, int]]) -> List[Dict]:
+    """Process-pool task: run one chunk of work items on this worker's replica."""
+    return _worker_experiment.run_chunk(chunk)
+
+
+class ResultJournal:
+    """Append-only JSON-lines file of result records, flushed to disk after every batch.
+    
+    A crash can at worst leave a torn final line, which is dropped when the journal
+    is reopened. The (Stimulus_ID, Run_Number) pairs already on disk are kept in
+    `completed` so a resumed run can skip them.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.completed = set()
+        self.count = 0
+        
+        if self.path.exists():
+            self._recover()
+        self._file = open(self.path, 'a', encoding='utf-8')
+    
+    def _recover(self):
+        """Index the intact records and cut off a torn trailing line, if any."""
+        
+        valid_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+                self.completed.add((record['Stimulus_ID'], int(record['Run_Number'])))
+                self.count += 1
+        
+        if valid_bytes < self.path.stat().st_size:
+            logger.warning(f"Dropping torn trailing record from {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_bytes)
+    
+    def append(self, records: List[Dict]):
+        """Append records and force them to disk."""
+        
+        if not records:
+            return
+        self._file.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        
+        for record in records:
+            self.completed.add((record['Stimulus_ID'], int(record['Run_Number'])))
+        self.count += len(records)
+    
+    def export_csv(self, csv_path: Path, chunksize: int = 1000):
+        """Stream the journal into a CSV file without loading it all into memory."""
+        
+        header = True
+        with open(self.path, encoding='utf-8') as f:
+            while True:
+                chunk = [json.loads(line) for _, line in zip(range(chunksize), f)]
+                if not chunk:
+                    break
+                pd.DataFrame(chunk).to_csv(csv_path, mode='w' if header else 'a', header=header, index=False)
+                header = False
+    
+    def export_table(self, path: Path, fmt: str = 'csv') -> Path:
+        """Export the journal as a results table in the given format; returns the file written.
+        
+        CSV is streamed; the columnar formats are typed, so they are written in one go.
+        """
+        
+        if fmt == 'csv':
+            path = path.with_suffix(TABLE_FORMATS['csv'])
+            self.export_csv(path)
+            return path
+        
+        with open(self.path, encoding='utf-8') as f:
+            df = pd.DataFrame([json.loads(line) for line in f])
+        return write_table(df, path, fmt)
+    
+    def close(self):
+        self._file.close()
+
+
 class PokerTOMExperiment:
     """Main experiment runner for Theory of Mind poker analysis."""
     
-    def __init__(self, model_name: str, output_dir: str = "./results"):
+    def __init__(self, model_name: str, output_dir: str = "./results", batch_size: int = 1,
+                 use_prefix_cache: bool = False, max_concurrency: int = 1, seed: int = SEED,
+                 response_cache: Optional[ResponseCache] = None, num_workers: int = 1,
+                 threads_per_worker: Optional[int] = None, generation_mode: str = 'full',
+                 results_format: str = 'csv'):
         self.model_name = model_name
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Number of prompts sent through a single generate call (1 = unbatched)
+        self.batch_size = max(1, batch_size)
+        
+        # Requests kept in flight against the backend at once (1 = sequential)
+        self.max_concurrency = max(1, max_concurrency)
+        
+        # Model backend, created from config.MODEL_CONFIGS in load_model
+        self.backend: Optional[ModelAdapter] = None
+        
+        # Reuse the key/value cache of PROMPT_PREFIX across prompts
+        self.use_prefix_cache = use_prefix_cache
         
-        # Initialize model (placeholder - implement based on your LLM setup)
-        self.model = None
-        self.tokenizer = None
+        # Base seed (run k samples with seed + k) and optional persistent response cache
+        self.seed = seed
+        self.response_cache = response_cache
         
-        # Results storage
-        self.results = []
+        # One of GENERATION_MODES; the non-full modes skip the explanation
+        if generation_mode not in GENERATION_MODES:
+            raise ValueError(f"Unknown generation mode '{generation_mode}'. Available: {', '.join(GENERATION_MODES)}")
+        self.generation_mode = generation_mode
+        
+        # Format of the exported results table, one of results_store.TABLE_FORMATS
+        if results_format not in TABLE_FORMATS:
+            raise ValueError(f"Unknown results format '{results_format}'. Available: {', '.join(TABLE_FORMATS)}")
+        self.results_format = results_format
+        
+        # Worker processes, each holding its own model replica (1 = run in this process),
+        # and the math-library threads each may use (default: cores split evenly)
+        self.num_workers = max(1, num_workers)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.num_workers)
+        self.worker_pool: Optional[ProcessPoolExecutor] = None
+        
+        # Append-only results journal for the current run (see ResultJournal)
+        self.journal: Optional[ResultJournal] = None
+        self.run_label: Optional[str] = None
+        
+        # Responses and generated tokens produced in this session, for throughput
+        self.session_responses = 0
+        self.session_generated_tokens = 0
+        self.session_time = 0.0
         
     def load_model(self):
-        """Load the specified LLM model. Adapt this for your setup."""
+        """Load the specified LLM through the backend registry.
+        
+        In process-pool mode the workers load one replica each instead.
+        """
+        if self.num_workers > 1:
+            self.start_worker_pool()
+            return
+        
         logger.info(f"Loading model: {self.model_name}")
         
-        # TODO: Implement your model loading logic here
-        # Examples for different setups:
+        self.backend = create_adapter(self.model_name)
+        self.backend.load_model()
         
-        # For Unsloth:
-        # from unsloth import FastLanguageModel
-        # self.model, self.tokenizer = FastLanguageModel.from_pretrained(
-        #     model_name=self.model_name,
-        #     max_seq_length=2048,
-        #     dtype=None,
-        #     load_in_4bit=True,
-        # )
+        logger.info(f"Model loaded successfully ({self.backend.backend} backend)")
         
-        # For standard transformers:
-        # from transformers import AutoTokenizer, AutoModelForCausalLM
-        # self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        # self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
+        if self.use_prefix_cache:
+            if self.backend.set_prompt_prefix(PROMPT_PREFIX):
+                logger.info("Prefix cache built for the shared prompt header")
+            else:
+                logger.warning(f"{self.backend.backend} backend does not support prefix caching; skipping")
         
-        # For API-based models:
-        # self.client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        if self.generation_mode == 'score' and not self.backend.supports_scoring:
+            raise ValueError(f"{self.backend.backend} backend does not support score mode")
         
-        logger.info("Model loaded successfully")
+        if self.generation_mode in ('classification', 'constrained'):
+            constrained = self.generation_mode == 'constrained'
+            if self.backend.set_classification_only(CLASSIFICATION_CUE, CLASSIFICATION_LABELS, constrained):
+                logger.info(f"Generation stops once the classification is resolved ({self.generation_mode} mode)")
+            else:
+                logger.warning(f"{self.backend.backend} backend does not support {self.generation_mode} "
+                               f"mode; generating full responses")
+                self.generation_mode = 'full'
+    
+    def start_worker_pool(self):
+        """Start worker processes that each load a model replica with pinned thread counts."""
+        
+        logger.info(f"Starting {self.num_workers} workers for {self.model_name} "
+                    f"({self.threads_per_worker} threads each)")
+        
+        experiment_kwargs = {
+            'model_name': self.model_name,
+            'output_dir': str(self.output_dir),
+            'batch_size': self.batch_size,
+            'use_prefix_cache': self.use_prefix_cache,
+            'seed': self.seed,
+            'generation_mode': self.generation_mode
+        }
+        cache_path = str(self.response_cache.path) if self.response_cache is not None else None
+        cache_max_bytes = self.response_cache.max_bytes if self.response_cache is not None else 0
+        
+        # Spawned workers start without the parent's already-initialized thread pools
+        context = multiprocessing.get_context('spawn')
+        self.worker_pool = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(experiment_kwargs, self.threads_per_worker, cache_path, cache_max_bytes,
+                      context.Barrier(self.num_workers))
+        )
+        
+        # Workers start and load their replicas on the first tasks; warm them all up now,
+        # so the load is part of load_model rather than of the first run
+        warm_ups = [self.worker_pool.submit(_worker_warm_up) for _ in range(self.num_workers)]
+        pids = {warm_up.result() for warm_up in warm_ups}
+        logger.info(f"{len(pids)} workers loaded {self.model_name}")
+    
+    def unload_model(self):
+        """Release the backend and its memory before another model is loaded."""
+        
+        if self.worker_pool is not None:
+            logger.info(f"Stopping workers for: {self.model_name}")
+            self.worker_pool.shutdown()
+            self.worker_pool = None
+        
+        if self.backend is not None:
+            logger.info(f"Unloading model: {self.model_name}")
+            self.backend.unload_model()
+            self.backend = None
     
     def load_stimuli(self, csv_path: str = "poker_stimuli_20250527_212428.csv") -> pd.DataFrame:
         """Load poker stimuli from CSV file."""
@@ -118,36 +397,79 @@ class PokerTOMExperiment:
             CONTEXT=stimulus['Context']
         )
     
-    def generate_response(self, prompt: str) -> str:
-        """Generate LLM response for given prompt. Adapt based on your model setup."""
-        
-        # TODO: Implement your inference logic here
-        # Examples for different setups:
-        
-        # For local transformers model:
-        # inputs = self.tokenizer(prompt, return_tensors="pt")
-        # with torch.no_grad():
-        #     outputs = self.model.generate(
-        #         **inputs,
-        #         max_new_tokens=MAX_NEW_TOKENS,
-        #         temperature=TEMPERATURE,
-        #         do_sample=True,
-        #         pad_token_id=self.tokenizer.eos_token_id
-        #     )
-        # response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-        # return response[len(prompt):].strip()
-        
-        # For API-based models:
-        # response = self.client.chat.completions.create(
-        #     model=self.model_name,
-        #     messages=[{"role": "user", "content": prompt}],
-        #     temperature=TEMPERATURE,
-        #     max_tokens=MAX_NEW_TOKENS
-        # )
-        # return response.choices[0].message.content
-        
-        # Placeholder for testing
-        return "1. Classification: Bluff\n2. Explanation: This appears to be a bluff based on the opponent's aggressive tendencies and the scary river card."
+    def run_seed(self, run_number: int) -> int:
+        """Sampling seed for a given run of a stimulus."""
+        return self.seed + run_number
+    
+    def _cache_key(self, prompt: str, seed: Optional[int]) -> str:
+        mode = self.generation_mode if self.generation_mode != 'full' else None
+        return ResponseCache.make_key(self.model_name, prompt, TEMPERATURE, MAX_NEW_TOKENS, seed, mode)
+    
+    def generate_response(self, prompt: str, seed: Optional[int] = None,
+                          stats: Optional[List[Dict]] = None) -> str:
+        """Generate LLM response for given prompt, serving repeats from the response cache.
+        
+        If stats is a list, the generation statistics of the prompt are appended to it
+        (all None for a cache hit).
+        """
+        
+        if self.response_cache is None:
+            return self.backend.generate(prompt, TEMPERATURE, MAX_NEW_TOKENS, seed, stats)
+        
+        key = self._cache_key(prompt, seed)
+        response = self.response_cache.get(key)
+        if response is None:
+            response = self.backend.generate(prompt, TEMPERATURE, MAX_NEW_TOKENS, seed, stats)
+            self.response_cache.put(key, self.model_name, response)
+        elif stats is not None:
+            stats.append(generation_stats())
+        return response
+    
+    def generate_batch_responses(self, prompts: List[str], seeds: Optional[List[int]] = None,
+                                 stats: Optional[List[Dict]] = None) -> List[str]:
+        """Generate responses for a batch of prompts (one padded generate call on local models).
+        
+        Each prompt samples with its own seed; only cache misses are sent to the backend.
+        """
+        
+        seeds = seeds if seeds is not None else [None] * len(prompts)
+        if self.response_cache is None:
+            return self.backend.generate_batch(prompts, TEMPERATURE, MAX_NEW_TOKENS, seeds, stats)
+        
+        keys = [self._cache_key(prompt, seed) for prompt, seed in zip(prompts, seeds)]
+        responses = [self.response_cache.get(key) for key in keys]
+        prompt_stats = [generation_stats() for _ in prompts]
+        
+        missing = [i for i, response in enumerate(responses) if response is None]
+        if missing:
+            missing_stats = []
+            generated = self.backend.generate_batch(
+                [prompts[i] for i in missing], TEMPERATURE, MAX_NEW_TOKENS, [seeds[i] for i in missing], missing_stats
+            )
+            for i, response, response_stats in zip(missing, generated, missing_stats):
+                responses[i] = response
+                prompt_stats[i] = response_stats
+                self.response_cache.put(keys[i], self.model_name, response)
+        
+        if stats is not None:
+            stats.extend(prompt_stats)
+        return responses
+    
+    async def agenerate_response(self, prompt: str, seed: Optional[int] = None,
+                                 stats: Optional[List[Dict]] = None) -> str:
+        """Generate LLM response without blocking other in-flight requests."""
+        
+        if self.response_cache is None:
+            return await self.backend.agenerate(prompt, TEMPERATURE, MAX_NEW_TOKENS, seed, stats)
+        
+        key = self._cache_key(prompt, seed)
+        response = self.response_cache.get(key)
+        if response is None:
+            response = await self.backend.agenerate(prompt, TEMPERATURE, MAX_NEW_TOKENS, seed, stats)
+            self.response_cache.put(key, self.model_name, response)
+        elif stats is not None:
+            stats.append(generation_stats())
+        return response
     
     def parse_response(self, raw_response: str) -> Tuple[str, str]:
         """Parse LLM response into classification and explanation."""
@@ -184,21 +506,15 @@ class PokerTOMExperiment:
         match = re.match(r'(S\d+)_', stimulus_id)
         return match.group(1) if match else stimulus_id
     
-    def run_single_stimulus(self, stimulus: Dict, run_number: int) -> Dict:
-        """Run experiment for single stimulus."""
+    def build_result(self, stimulus: Dict, run_number: int, raw_response: str,
+                     stats: Optional[Dict] = None) -> Dict:
+        """Parse a raw response and build the result record for one stimulus run.
         
-        stimulus_id = stimulus['ID']
-        logger.info(f"Processing {stimulus_id}, Run {run_number}")
+        stats (a model_adapters.generation_stats record) fills the PERF_COLUMNS;
+        they are left empty when the response did not come from the backend.
+        """
         
-        # Format prompt
-        prompt = self.format_prompt(stimulus)
-        
-        # Generate response
-        try:
-            raw_response = self.generate_response(prompt)
-        except Exception as e:
-            logger.error(f"Error generating response for {stimulus_id}: {e}")
-            raw_response = f"ERROR: {str(e)}"
+        stimulus_id = stimulus['ID']
         
         # Parse response
         classification, explanation = self.parse_response(raw_response)
@@ -208,6 +524,11 @@ class PokerTOMExperiment:
         core_scenario = self.extract_core_scenario(stimulus_id)
         is_correct = 1 if classification == ground_truth else 0
         
+        stats = stats or generation_stats()
+        tokens_per_s = None
+        if stats['generated_tokens'] is not None and stats['total_s']:
+            tokens_per_s = stats['generated_tokens'] / stats['total_s']
+        
         # Create result record
         result = {
             'Stimulus_ID': stimulus_id,
@@ -217,60 +538,335 @@ class PokerTOMExperiment:
             'Run_Number': run_number,
             'Temperature': TEMPERATURE,
             'Max_New_Tokens': MAX_NEW_TOKENS,
+            'Seed': self.run_seed(run_number),
+            'Generation_Mode': self.generation_mode,
             'LLM_Raw_Response': raw_response,
             'Parsed_Classification': classification,
             'Is_Classification_Correct': is_correct,
             'Explanation_Text': explanation,
+            'Prompt_Tokens': stats['prompt_tokens'],
+            'Generated_Tokens': stats['generated_tokens'],
+            'TTFT_s': stats['ttft_s'],
+            'Generation_Time_s': stats['total_s'],
+            'Tokens_per_s': tokens_per_s,
             'Timestamp': datetime.now().isoformat()
         }
         
         return result
     
-    def run_experiment(self, csv_path: str = "poker_stimuli_20250527_212428.csv"):
-        """Run the complete experiment."""
+    def run_scoring_batch(self, batch: List[Tuple[Dict, int]]) -> List[Dict]:
+        """Score Bluff vs Value for a batch of stimuli with one forward pass, no decoding.
+        
+        Each record carries P_Bluff; the classification is the more likely label and
+        Expected_Correct is the probability assigned to the ground truth.
+        """
+        
+        batch_ids = [stimulus['ID'] for stimulus, _ in batch]
+        logger.info(f"Scoring batch of {len(batch)}: {', '.join(batch_ids)}")
+        
+        prompts = [self.format_prompt(stimulus) for stimulus, _ in batch]
+        stats = []
+        try:
+            probabilities = self.backend.score_labels(prompts, CLASSIFICATION_CUE, CLASSIFICATION_LABELS, stats)
+        except Exception as e:
+            logger.error(f"Error scoring {', '.join(batch_ids)}: {e}")
+            probabilities = [[np.nan, np.nan]] * len(batch)
+            stats = [None] * len(batch)
+        
+        results = []
+        for (stimulus, run_num), (p_bluff, p_value), row_stats in zip(batch, probabilities, stats):
+            raw_response = f"{CLASSIFICATION_CUE} {'Bluff' if p_bluff >= p_value else 'Value'}"
+            if np.isnan(p_bluff):
+                raw_response = "ERROR: scoring failed"
+            
+            result = self.build_result(stimulus, run_num, raw_response, row_stats)
+            result['P_Bluff'] = p_bluff
+            result['Expected_Correct'] = p_bluff if result['Context_Type'] == 'Bluff' else p_value
+            results.append(result)
+        
+        return results
+    
+    def run_single_stimulus(self, stimulus: Dict, run_number: int) -> Dict:
+        """Run experiment for single stimulus."""
+        
+        stimulus_id = stimulus['ID']
+        logger.info(f"Processing {stimulus_id}, Run {run_number}")
+        
+        # Format prompt
+        prompt = self.format_prompt(stimulus)
+        
+        # Generate response
+        stats = []
+        try:
+            raw_response = self.generate_response(prompt, self.run_seed(run_number), stats)
+        except Exception as e:
+            logger.error(f"Error generating response for {stimulus_id}: {e}")
+            raw_response = f"ERROR: {str(e)}"
+        
+        return self.build_result(stimulus, run_number, raw_response, stats[0] if stats else None)
+    
+    @property
+    def num_runs(self) -> int:
+        """Runs per stimulus; scores are deterministic, so score mode needs a single run."""
+        return 1 if self.generation_mode == 'score' else NUM_RUNS_PER_STIM
+    
+    def build_work_items(self, stimuli_df: pd.DataFrame) -> List[Tuple[Dict, int]]:
+        """List (stimulus, run_number) pairs in stimulus order, runs innermost."""
+        
+        work_items = []
+        for _, stimulus in stimuli_df.iterrows():
+            stimulus_dict = stimulus.to_dict()
+            for run_num in range(1, self.num_runs + 1):
+                work_items.append((stimulus_dict, run_num))
+        return work_items
+    
+    def run_batch(self, batch: List[Tuple[Dict, int]]) -> List[Dict]:
+        """Run one batch of (stimulus, run_number) pairs; results keep batch order."""
+        
+        batch_ids = [f"{stimulus['ID']}#{run_num}" for stimulus, run_num in batch]
+        logger.info(f"Processing batch of {len(batch)}: {', '.join(batch_ids)}")
+        
+        prompts = [self.format_prompt(stimulus) for stimulus, _ in batch]
+        seeds = [self.run_seed(run_num) for _, run_num in batch]
+        
+        stats = []
+        try:
+            raw_responses = self.generate_batch_responses(prompts, seeds, stats)
+        except Exception as e:
+            logger.error(f"Error generating batch responses for {', '.join(batch_ids)}: {e}")
+            raw_responses = [f"ERROR: {str(e)}"] * len(batch)
+            stats = [None] * len(batch)
+        
+        return [
+            self.build_result(stimulus, run_num, raw_response, row_stats)
+            for (stimulus, run_num), raw_response, row_stats in zip(batch, raw_responses, stats)
+        ]
+    
+    def run_chunk(self, chunk: List[Tuple[Dict, int]]) -> List[Dict]:
+        """Run a chunk of work items as one batch, or one by one when unbatched."""
+        
+        if self.generation_mode == 'score':
+            return self.run_scoring_batch(chunk)
+        
+        # Prefix reuse lives on the batched path too; a batch of one is fine
+        if self.batch_size > 1 or self.use_prefix_cache:
+            return self.run_batch(chunk)
+        return [self.run_single_stimulus(stimulus, run_num) for stimulus, run_num in chunk]
+    
+    async def arun_single_stimulus(self, stimulus: Dict, run_number: int) -> Dict:
+        """Run experiment for single stimulus as an asynchronous request."""
+        
+        stimulus_id = stimulus['ID']
+        logger.info(f"Processing {stimulus_id}, Run {run_number}")
+        
+        prompt = self.format_prompt(stimulus)
+        
+        stats = []
+        try:
+            raw_response = await self.agenerate_response(prompt, self.run_seed(run_number), stats)
+        except Exception as e:
+            logger.error(f"Error generating response for {stimulus_id}: {e}")
+            raw_response = f"ERROR: {str(e)}"
+        
+        return self.build_result(stimulus, run_number, raw_response, stats[0] if stats else None)
+    
+    async def arun_work_items(self, work_items: List[Tuple[Dict, int]], progress_bar=None):
+        """Run work items with up to max_concurrency requests in flight.
+        
+        Results are journaled in input order, one flush per max_concurrency results.
+        """
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run_item(stimulus: Dict, run_number: int) -> Dict:
+            async with semaphore:
+                result = await self.arun_single_stimulus(stimulus, run_number)
+            if progress_bar is not None:
+                progress_bar.update(1)
+            return result
+        
+        tasks = [asyncio.ensure_future(run_item(stimulus, run_num)) for stimulus, run_num in work_items]
+        pending_results = []
+        for task in tasks:
+            pending_results.append(await task)
+            if len(pending_results) >= self.max_concurrency:
+                self.journal_results(pending_results)
+                pending_results = []
+        self.journal_results(pending_results)
+    
+    def journal_results(self, results: List[Dict]):
+        """Write results to the journal and count them toward this session's throughput."""
+        
+        self.journal.append(results)
+        self.session_responses += len(results)
+        self.session_generated_tokens += sum(result['Generated_Tokens'] or 0 for result in results)
+    
+    def results_stem(self) -> str:
+        """Filename stem shared by a run's journal, CSV and summary."""
+        
+        # Raw Hugging Face paths contain slashes; keep the filename flat
+        parts = [self.model_name] + ([self.run_label] if self.run_label else [])
+        safe_name = '_'.join(re.sub(r'[^\w.-]+', '_', part).strip('_') for part in parts)
+        return f"poker_tom_results_{safe_name}"
+    
+    def resolve_journal_path(self, resume: Optional[str] = None) -> Path:
+        """Pick the journal to write: a given path, this model's latest journal, or a new one."""
+        
+        if resume and resume != 'latest':
+            return Path(resume).with_suffix('.jsonl')
+        
+        if resume == 'latest':
+            pattern = re.compile(rf"^{re.escape(self.results_stem())}_\d{{8}}_\d{{6}}\.jsonl$")
+            candidates = sorted(p for p in self.output_dir.glob('*.jsonl') if pattern.match(p.name))
+            if candidates:
+                return candidates[-1]
+            logger.warning("No previous results journal found for this model; starting a new run")
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return self.output_dir / f"{self.results_stem()}_{timestamp}.jsonl"
+    
+    def run_experiment(self, csv_path: str = "poker_stimuli_20250527_212428.csv",
+                       resume: Optional[str] = None):
+        """Run the complete experiment.
+        
+        Results are journaled to disk as they are produced. Pass resume='latest' (or a
+        journal path) to continue an interrupted run, skipping (stimulus, run) pairs
+        already on disk.
+        """
         
         logger.info("Starting Theory of Mind Poker Experiment")
         logger.info(f"Model: {self.model_name}")
-        logger.info(f"Parameters: T={TEMPERATURE}, Max_tokens={MAX_NEW_TOKENS}, Runs={NUM_RUNS_PER_STIM}")
+        logger.info(f"Parameters: T={TEMPERATURE}, Max_tokens={MAX_NEW_TOKENS}, Runs={self.num_runs}, "
+                    f"Batch_size={self.batch_size}, Prefix_cache={self.use_prefix_cache}, "
+                    f"Max_concurrency={self.max_concurrency}, Workers={self.num_workers}, "
+                    f"Generation_mode={self.generation_mode}")
         
         # Load model and stimuli
         self.load_model()
         stimuli_df = self.load_stimuli(csv_path)
         
-        # Run experiments
-        total_runs = len(stimuli_df) * NUM_RUNS_PER_STIM
-        progress_bar = tqdm(total=total_runs, desc="Running experiments")
+        try:
+            self.run_stimuli(stimuli_df, resume=resume)
+        finally:
+            self.unload_model()
+    
+    def run_stimuli(self, stimuli_df: pd.DataFrame, resume: Optional[str] = None,
+                    run_label: Optional[str] = None) -> int:
+        """Run every (stimulus, run) pair of a stimulus set against the loaded model.
         
-        for _, stimulus in stimuli_df.iterrows():
-            stimulus_dict = stimulus.to_dict()
-            
-            for run_num in range(1, NUM_RUNS_PER_STIM + 1):
-                result = self.run_single_stimulus(stimulus_dict, run_num)
-                self.results.append(result)
-                progress_bar.update(1)
+        run_label is added to the results filename so several stimulus sets run by one
+        model stay apart. Returns the number of responses generated in this call.
+        """
+        
+        self.run_label = run_label
+        
+        # Open the results journal, skipping work already on disk when resuming
+        self.journal = ResultJournal(self.resolve_journal_path(resume))
+        work_items = self.build_work_items(stimuli_df)
+        pending = [(stimulus, run_num) for stimulus, run_num in work_items
+                   if (stimulus['ID'], run_num) not in self.journal.completed]
+        if len(pending) < len(work_items):
+            logger.info(f"Resuming {self.journal.path}: {len(work_items) - len(pending)} responses "
+                        f"already on disk, {len(pending)} remaining")
         
+        # Run experiments
+        progress_bar = tqdm(total=len(work_items), initial=len(work_items) - len(pending),
+                            desc="Running experiments")
+        self.session_responses = 0
+        self.session_generated_tokens = 0
+        session_start = time.perf_counter()
+        
+        chunks = [pending[start:start + self.batch_size] for start in range(0, len(pending), self.batch_size)]
+        
+        if self.worker_pool is not None:
+            # Process-pool mode: idle workers pull the next chunk from the shared task
+            # queue; map yields in submission order, so the journal order is deterministic
+            for chunk, results in zip(chunks, self.worker_pool.map(_worker_run_chunk, chunks)):
+                self.journal_results(results)
+                progress_bar.update(len(chunk))
+        elif self.max_concurrency > 1 and self.generation_mode != 'score':
+            # Concurrent mode: keep up to max_concurrency requests in flight
+            asyncio.run(self.arun_work_items(pending, progress_bar))
+        else:
+            # Batched mode shares one generate call per chunk. Each chunk is journaled as it completes.
+            for chunk in chunks:
+                self.journal_results(self.run_chunk(chunk))
+                progress_bar.update(len(chunk))
+        
+        self.session_time = time.perf_counter() - session_start
         progress_bar.close()
+        self.journal.close()
+        
+        # Workers keep their own hit counters, so only the parent's lookups are reported
+        if self.response_cache is not None and self.worker_pool is None:
+            stats = self.response_cache.stats()
+            logger.info(f"Response cache: {stats['hits']} hits, {stats['misses']} misses "
+                        f"({stats['hit_rate']:.1%} hit rate), {stats['entries']} entries, "
+                        f"{stats['size_bytes'] / 1e6:.1f} MB")
         
         # Save results
         self.save_results()
         
-        logger.info(f"Experiment completed. {len(self.results)} responses generated.")
+        logger.info(f"Experiment completed. {len(pending)} responses generated, {self.journal.count} in the journal.")
+        return len(pending)
     
     def save_results(self):
-        """Save experimental results to CSV."""
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"poker_tom_results_{self.model_name}_{timestamp}.csv"
-        filepath = self.output_dir / filename
+        """Export the results journal in the results format and write the summary."""
         
-        # Convert to DataFrame and save
-        results_df = pd.DataFrame(self.results)
-        results_df.to_csv(filepath, index=False)
+        filepath = self.journal.export_table(self.journal.path, self.results_format)
         
         logger.info(f"Results saved to: {filepath}")
         
-        # Generate summary
+        # Generate summary (the long response text columns are not needed)
+        summary_columns = ['Stimulus_ID', 'Context_Type', 'Parsed_Classification', 'Is_Classification_Correct']
+        if self.generation_mode == 'score':
+            summary_columns += ['P_Bluff', 'Expected_Correct']
+        results_df = read_table(filepath, columns=summary_columns)
         self.generate_summary(results_df, filepath.with_suffix('.summary.txt'))
+        
+        # Journals written before the performance columns existed lack them
+        available = table_columns(filepath)
+        perf_df = read_table(filepath, columns=[column for column in PERF_COLUMNS if column in available])
+        self.generate_performance_report(perf_df, filepath.with_suffix('.perf.json'))
+    
+    def generate_performance_report(self, perf_df: pd.DataFrame, report_path: Path):
+        """Write latency percentiles, token throughput and peak memory of the run as JSON.
+        
+        Percentiles cover every row produced by the backend (cache hits have no
+        timings); throughput covers the responses generated in this session.
+        """
+        
+        def percentiles(column: str) -> Dict:
+            values = perf_df[column].dropna() if column in perf_df.columns else pd.Series(dtype=float)
+            if values.empty:
+                return {'p50': None, 'p95': None, 'p99': None}
+            return {f'p{q}': round(float(np.percentile(values, q)), 4) for q in (50, 95, 99)}
+        
+        report = {
+            'model': self.model_name,
+            'timestamp': datetime.now().isoformat(),
+            'batch_size': self.batch_size,
+            'max_concurrency': self.max_concurrency,
+            'num_workers': self.num_workers,
+            'generation_mode': self.generation_mode,
+            'latency_s': percentiles('Generation_Time_s'),
+            'ttft_s': percentiles('TTFT_s'),
+            'session_responses': self.session_responses,
+            'session_generated_tokens': self.session_generated_tokens,
+            'session_time_s': round(self.session_time, 3),
+            'tokens_per_s': (self.session_generated_tokens / self.session_time
+                             if self.session_time > 0 and self.session_generated_tokens else None),
+            'responses_per_s': self.session_responses / self.session_time if self.session_time > 0 else None,
+            'peak_rss_mb': peak_rss_mb()
+        }
+        
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        latency = report['latency_s']
+        logger.info(f"Performance: latency p50/p95/p99 = {latency['p50']}/{latency['p95']}/{latency['p99']} s, "
+                    f"{report['tokens_per_s'] or 0:.1f} tokens/s, peak RSS {report['peak_rss_mb'] or 0:.0f} MB")
+        logger.info(f"Performance report saved to: {report_path}")
     
     def generate_summary(self, results_df: pd.DataFrame, summary_path: Path):
         """Generate experiment summary statistics."""
@@ -283,18 +879,31 @@ class PokerTOMExperiment:
         bluff_accuracy = results_df[results_df['Context_Type'] == 'Bluff']['Is_Classification_Correct'].mean()
         value_accuracy = results_df[results_df['Context_Type'] == 'Value']['Is_Classification_Correct'].mean()
         
-        # Consistency across runs
-        consistency_data = []
-        for scenario in results_df['Core_Scenario_ID'].unique():
-            scenario_data = results_df[results_df['Core_Scenario_ID'] == scenario]
-            for context_type in ['Bluff', 'Value']:
-                context_data = scenario_data[scenario_data['Context_Type'] == context_type]
-                if len(context_data) == NUM_RUNS_PER_STIM:
-                    classifications = context_data['Parsed_Classification'].tolist()
-                    is_consistent = len(set(classifications)) == 1
-                    consistency_data.append(is_consistent)
+        # Consistency across the runs of each stimulus (a single run has nothing to compare).
+        # A scenario/context can hold several stimuli, e.g. an original and its context swap
+        consistency_section = ""
+        if self.num_runs > 1:
+            runs = results_df.groupby('Stimulus_ID', observed=True)['Parsed_Classification'].agg(['size', 'nunique'])
+            complete = runs[runs['size'] == self.num_runs]
+            consistency_rate = (complete['nunique'] == 1).mean() if len(complete) else 0
+            consistency_section = f"""
+Response Consistency:
+- Consistent across runs: {consistency_rate:.3f} ({consistency_rate*100:.1f}%)
+"""
         
-        consistency_rate = np.mean(consistency_data) if consistency_data else 0
+        # Score mode: exact expected accuracy under the label distribution, and calibration
+        scoring_section = ""
+        if 'P_Bluff' in results_df.columns:
+            is_bluff = (results_df['Context_Type'] == 'Bluff').astype(float)
+            expected_accuracy = results_df['Expected_Correct'].mean()
+            brier_score = ((results_df['P_Bluff'] - is_bluff) ** 2).mean()
+            scoring_section = f"""
+Label Scoring (P(Bluff) from next-token probabilities):
+- Expected Accuracy: {expected_accuracy:.3f} ({expected_accuracy*100:.1f}%)
+- Mean P(Bluff) | Bluff context: {results_df.loc[is_bluff == 1, 'P_Bluff'].mean():.3f}
+- Mean P(Bluff) | Value context: {results_df.loc[is_bluff == 0, 'P_Bluff'].mean():.3f}
+- Brier Score: {brier_score:.4f}
+"""
         
         summary = f"""
 Theory of Mind Poker Experiment Summary
@@ -306,7 +915,9 @@ Timestamp: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 Experimental Parameters:
 - Temperature: {TEMPERATURE}
 - Max New Tokens: {MAX_NEW_TOKENS}
-- Runs per Stimulus: {NUM_RUNS_PER_STIM}
+- Runs per Stimulus: {self.num_runs}
+- Base Seed: {self.seed}
+- Generation Mode: {self.generation_mode}
 
 Results:
 - Total Responses: {total_responses}
@@ -316,10 +927,7 @@ Results:
 Accuracy by Context Type:
 - Bluff Detection: {bluff_accuracy:.3f} ({bluff_accuracy*100:.1f}%)
 - Value Detection: {value_accuracy:.3f} ({value_accuracy*100:.1f}%)
-
-Response Consistency:
-- Consistent across runs: {consistency_rate:.3f} ({consistency_rate*100:.1f}%)
-
+{consistency_section}{scoring_section}
 Classification Distribution:
 {results_df['Parsed_Classification'].value_counts().to_string()}
 
@@ -339,20 +947,57 @@ def main():
     """Main execution function."""
     
     parser = argparse.ArgumentParser(description="Theory of Mind Poker Experiment")
-    parser.add_argument("--model_name", required=True, help="Name/path of the LLM model")
+    parser.add_argument("--model_name", required=True,
+                       help="config.MODEL_CONFIGS key, or a Hugging Face model name/path")
     parser.add_argument("--output_dir", default="./results", help="Output directory for results")
     parser.add_argument("--stimuli_csv", default="poker_stimuli_20250527_212428.csv", 
                        help="Path to stimuli CSV file")
+    parser.add_argument("--batch_size", type=int, default=1,
+                       help="Prompts per padded generate call (1 disables batching)")
+    parser.add_argument("--prefix_cache", action="store_true",
+                       help="Encode the shared prompt header once and reuse its KV cache")
+    parser.add_argument("--max_concurrency", type=int, default=1,
+                       help="Requests kept in flight against the backend (async mode when > 1)")
+    parser.add_argument("--seed", type=int, default=SEED,
+                       help="Base sampling seed; run k of each stimulus uses seed + k")
+    parser.add_argument("--response_cache", nargs="?", const=str(RESPONSE_CACHE), default=None,
+                       help="Reuse responses from this on-disk cache (default path if no value given)")
+    parser.add_argument("--cache_max_mb", type=float, default=RESPONSE_CACHE_MAX_MB,
+                       help="Size bound of the response cache before LRU eviction")
+    parser.add_argument("--resume", nargs="?", const="latest", default=None,
+                       help="Continue an interrupted run from its journal (latest for this model if no path)")
+    parser.add_argument("--num_workers", type=int, default=1,
+                       help="Worker processes, each holding a model replica (1 runs in-process)")
+    parser.add_argument("--threads_per_worker", type=int, default=None,
+                       help="Math-library threads per worker (default: CPU cores / num_workers)")
+    parser.add_argument("--generation_mode", choices=GENERATION_MODES, default="full",
+                       help="full responses, stop after the classification, constrained Bluff/Value answer, "
+                            "or score P(Bluff) without decoding")
+    parser.add_argument("--results_format", choices=list(TABLE_FORMATS), default="csv",
+                       help="Results table format; parquet and feather are typed, compressed and need pyarrow")
     
     args = parser.parse_args()
     
+    response_cache = None
+    if args.response_cache:
+        response_cache = ResponseCache(args.response_cache, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+    
     # Create and run experiment
     experiment = PokerTOMExperiment(
         model_name=args.model_name,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        batch_size=args.batch_size,
+        use_prefix_cache=args.prefix_cache,
+        max_concurrency=args.max_concurrency,
+        seed=args.seed,
+        response_cache=response_cache,
+        num_workers=args.num_workers,
+        threads_per_worker=args.threads_per_worker,
+        generation_mode=args.generation_mode,
+        results_format=args.results_format
     )
     
-    experiment.run_experiment(args.stimuli_csv)
+    experiment.run_experiment(args.stimuli_csv, resume=args.resume)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -4,61 +4,69 @@ Presentation Visuals: Clean, Focused Charts for Technical Slides
 ===============================================================
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import sys
+from pathlib import Path
+
 import numpy as np
 
-# Set presentation style
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette("husl")
-plt.rcParams['figure.figsize'] = (12, 8)
-plt.rcParams['font.size'] = 14
-plt.rcParams['axes.titlesize'] = 18
-plt.rcParams['axes.labelsize'] = 16
-plt.rcParams['legend.fontsize'] = 14
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from results_aggregates import load_aggregates, model_label
+from plot_style import pyplot
+
+# Presentation style, applied when the first slide is drawn
+PLOT_STYLE = dict(style='seaborn-v0_8-whitegrid', palette='husl', rc={
+    'figure.figsize': (12, 8),
+    'font.size': 14,
+    'axes.titlesize': 18,
+    'axes.labelsize': 16,
+    'legend.fontsize': 14
+})
 
-# Load data
-results_df = pd.read_csv('poker_tom_results_20250602_081719.csv')
-cognitive_df = pd.read_csv('detailed_cognitive_analysis.csv')
 
 def create_slide_1_tom_challenge():
     """Slide 1: The Theory of Mind Challenge - Simple concept visualization"""
+    plt = pyplot(**PLOT_STYLE)
+    aggregates = load_aggregates()
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
     
     # Left: ToM Levels
     tom_levels = ['Level 0\n(None)', 'Level 1\n(First-order)', 'Level 2\n(Second-order)']
-    tom_percentages = [29.7, 64.7, 5.6]
+    tom_shares = aggregates.tom_level_shares().reindex(columns=[0, 1, 2], fill_value=0).loc['All']
+    tom_percentages = list(tom_shares * 100)
     colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
     
     bars = ax1.bar(tom_levels, tom_percentages, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
     ax1.set_title('Theory of Mind Levels in LLM Explanations', fontweight='bold', pad=20)
     ax1.set_ylabel('Percentage of Explanations', fontweight='bold')
-    ax1.set_ylim(0, 70)
+    ax1.set_ylim(0, max(70, max(tom_percentages) + 10))
     
     # Add percentage labels on bars
     for bar, pct in zip(bars, tom_percentages):
         height = bar.get_height()
         ax1.text(bar.get_x() + bar.get_width()/2., height + 1,
-                f'{pct}%', ha='center', va='bottom', fontweight='bold', fontsize=16)
+                f'{pct:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=16)
     
     # Right: Bluff vs Value Difficulty
     contexts = ['Value\nDetection', 'Bluff\nDetection']
-    accuracies = [63.3, 40.6]
+    context_accuracy = aggregates.context_accuracy()
+    accuracies = [context_accuracy['Value'] * 100, context_accuracy['Bluff'] * 100]
     colors_bv = ['#4ECDC4', '#FF6B6B']
     
     bars = ax2.bar(contexts, accuracies, color=colors_bv, alpha=0.8, edgecolor='white', linewidth=2)
     ax2.set_title('Deception Detection Challenge', fontweight='bold', pad=20)
     ax2.set_ylabel('Accuracy (%)', fontweight='bold')
-    ax2.set_ylim(0, 70)
+    ax2.set_ylim(0, max(70, max(accuracies) + 10))
     ax2.axhline(y=50, color='black', linestyle='--', alpha=0.5, label='Chance Level')
     
     # Add accuracy labels
     for bar, acc in zip(bars, accuracies):
         height = bar.get_height()
         ax2.text(bar.get_x() + bar.get_width()/2., height + 1,
-                f'{acc}%', ha='center', va='bottom', fontweight='bold', fontsize=16)
+                f'{acc:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=16)
     
     ax2.legend()
     plt.tight_layout()
@@ -67,6 +75,7 @@ def create_slide_1_tom_challenge():
 
 def create_slide_2_framework():
     """Slide 2: Theoretical Framework - Clean ToM hierarchy"""
+    plt = pyplot(**PLOT_STYLE)
     
     fig, ax = plt.subplots(figsize=(14, 10))
     
@@ -102,6 +111,7 @@ def create_slide_2_framework():
 
 def create_slide_6_design():
     """Slide 6: Experimental Design - Clean methodology overview"""
+    plt = pyplot(**PLOT_STYLE)
     
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
     
@@ -151,19 +161,24 @@ def create_slide_6_design():
 
 def create_slide_7_results():
     """Slide 7: Main Results - Performance comparison"""
+    plt = pyplot(**PLOT_STYLE)
+    aggregates = load_aggregates()
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
     
     # Left: Model accuracy comparison
-    models = ['Hush-Qwen2.5-7B', 'OLMoE-1B-7B', 'EXAONE-3.5-2.4B', 'Llama-1B']
-    accuracies = [93.3, 57.8, 44.4, 12.2]
-    colors = ['#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
-    
-    bars = ax1.bar(range(len(models)), accuracies, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
+    performance = aggregates.model_performance()
+    models = list(performance.index)
+    accuracies = performance['Accuracy'] * 100
+    palette = ['#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
+    colors = {model: palette[i % len(palette)] for i, model in enumerate(models)}
+    
+    bars = ax1.bar(range(len(models)), accuracies, color=list(colors.values()), alpha=0.8,
+                   edgecolor='white', linewidth=2)
     ax1.set_title('Model Performance Comparison', fontweight='bold', pad=20)
     ax1.set_ylabel('Accuracy (%)', fontweight='bold')
     ax1.set_xticks(range(len(models)))
-    ax1.set_xticklabels([m.split('-')[0] for m in models], rotation=45)
+    ax1.set_xticklabels([model_label(m) for m in models], rotation=45)
     ax1.axhline(y=50, color='red', linestyle='--', alpha=0.7, label='Chance Level')
     ax1.set_ylim(0, 100)
     
@@ -171,32 +186,22 @@ def create_slide_7_results():
     for bar, acc in zip(bars, accuracies):
         height = bar.get_height()
         ax1.text(bar.get_x() + bar.get_width()/2., height + 1,
-                f'{acc}%', ha='center', va='bottom', fontweight='bold', fontsize=14)
+                f'{acc:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=14)
     
     ax1.legend()
     
-    # Right: Cognitive sophistication vs accuracy
-    cog_scores = cognitive_df.groupby('Model').agg({
-        'ToM_Level': 'mean',
-        'Is_Correct': 'mean'
-    }).reset_index()
+    # Right: Cognitive sophistication vs accuracy, for the models in both tables
+    cog_scores = aggregates.cognitive_table('Model')[['ToM_Level']]
+    cog_scores.index = cog_scores.index.astype(str)
+    cog_scores = cog_scores.join(performance['Accuracy'], how='inner')
     
-    # Map model names
-    model_mapping = {
-        'Hush-Qwen2.5-7B': 'Hush-Qwen',
-        'OLMoE-1B-7B-0125-Instruct': 'OLMoE',
-        'EXAONE-3.5-2.4B-Instruct': 'EXAONE',
-        'Llama-3.2-SUN-HDIC-1B-Ins': 'Llama-1B'
-    }
-    cog_scores['Model_Short'] = cog_scores['Model'].map(model_mapping)
-    
-    scatter = ax2.scatter(cog_scores['ToM_Level'], cog_scores['Is_Correct']*100, 
-                         s=200, alpha=0.7, c=colors)
+    scatter = ax2.scatter(cog_scores['ToM_Level'], cog_scores['Accuracy']*100, 
+                         s=200, alpha=0.7, c=[colors[model] for model in cog_scores.index])
     
     # Add model labels
-    for i, row in cog_scores.iterrows():
-        ax2.annotate(row['Model_Short'], 
-                    (row['ToM_Level'], row['Is_Correct']*100),
+    for model, row in cog_scores.iterrows():
+        ax2.annotate(model_label(model), 
+                    (row['ToM_Level'], row['Accuracy']*100),
                     xytext=(5, 5), textcoords='offset points', fontweight='bold')
     
     ax2.set_title('ToM Level vs Performance', fontweight='bold', pad=20)
@@ -210,20 +215,14 @@ def create_slide_7_results():
 
 def create_slide_8_cognitive():
     """Slide 8: Cognitive Analysis - ToM patterns"""
+    plt = pyplot(**PLOT_STYLE)
+    aggregates = load_aggregates()
     
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
     
     # Top left: ToM level distribution by model
-    tom_by_model = cognitive_df.groupby(['Model', 'ToM_Level']).size().unstack(fill_value=0)
-    tom_by_model_pct = tom_by_model.div(tom_by_model.sum(axis=1), axis=0) * 100
-    
-    model_short = {
-        'Hush-Qwen2.5-7B': 'Hush-Qwen',
-        'OLMoE-1B-7B-0125-Instruct': 'OLMoE',
-        'EXAONE-3.5-2.4B-Instruct': 'EXAONE',
-        'Llama-3.2-SUN-HDIC-1B-Ins': 'Llama-1B'
-    }
-    tom_by_model_pct.index = [model_short[idx] for idx in tom_by_model_pct.index]
+    tom_by_model_pct = aggregates.tom_level_shares('Model') * 100
+    tom_by_model_pct.index = [model_label(idx) for idx in tom_by_model_pct.index]
     
     tom_by_model_pct.plot(kind='bar', stacked=True, ax=ax1, 
                          color=['#FF6B6B', '#4ECDC4', '#45B7D1'])
@@ -233,7 +232,7 @@ def create_slide_8_cognitive():
     ax1.set_xticklabels(ax1.get_xticklabels(), rotation=45)
     
     # Top right: Bluff vs Value ToM requirements
-    context_tom = cognitive_df.groupby('Context_Type')['ToM_Level'].mean()
+    context_tom = aggregates.cognitive_table('Context_Type')['ToM_Level']
     
     bars = ax2.bar(context_tom.index, context_tom.values, 
                   color=['#FF6B6B', '#4ECDC4'], alpha=0.8)
@@ -248,7 +247,7 @@ def create_slide_8_cognitive():
     # Bottom left: Cognitive factors correlation with accuracy
     corr_factors = ['Context_Integration_Score', 'Reasoning_Sophistication', 
                    'ToM_Level', 'Opponent_Psychology', 'Strategic_Reasoning_Score']
-    correlations = cognitive_df[corr_factors + ['Is_Correct']].corr()['Is_Correct'][:-1].sort_values(ascending=True)
+    correlations = aggregates.accuracy_correlations(corr_factors).sort_values(ascending=True)
     
     bars = ax3.barh(range(len(correlations)), correlations.values, 
                    color=['#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#FFB6C1'])
@@ -263,16 +262,17 @@ def create_slide_8_cognitive():
                 f'{val:.3f}', va='center', fontweight='bold')
     
     # Bottom right: Successful vs failed bluff detection
-    bluff_correct = cognitive_df[(cognitive_df['Context_Type'] == 'Bluff') & (cognitive_df['Is_Correct'] == 1)]
-    bluff_incorrect = cognitive_df[(cognitive_df['Context_Type'] == 'Bluff') & (cognitive_df['Is_Correct'] == 0)]
+    by_outcome = aggregates.cognitive_table('Context_Type', 'Is_Correct')
+    bluff_correct = by_outcome.loc[('Bluff', 1)]
+    bluff_incorrect = by_outcome.loc[('Bluff', 0)]
     
     metrics = ['ToM Level', 'Psychology Score', 'Strategic Reasoning']
-    success_scores = [bluff_correct['ToM_Level'].mean(), 
-                     bluff_correct['Opponent_Psychology'].mean(),
-                     bluff_correct['Strategic_Reasoning_Score'].mean()]
-    fail_scores = [bluff_incorrect['ToM_Level'].mean(),
-                  bluff_incorrect['Opponent_Psychology'].mean(), 
-                  bluff_incorrect['Strategic_Reasoning_Score'].mean()]
+    success_scores = [bluff_correct['ToM_Level'], 
+                     bluff_correct['Opponent_Psychology'],
+                     bluff_correct['Strategic_Reasoning_Score']]
+    fail_scores = [bluff_incorrect['ToM_Level'],
+                  bluff_incorrect['Opponent_Psychology'], 
+                  bluff_incorrect['Strategic_Reasoning_Score']]
     
     x = np.arange(len(metrics))
     width = 0.35
@@ -292,6 +292,7 @@ def create_slide_8_cognitive():
 
 def create_slide_9_implications():
     """Slide 9: Implications - Key takeaways visualization"""
+    plt = pyplot(**PLOT_STYLE)
     
     fig, ax = plt.subplots(figsize=(14, 10))
     
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Theory of Mind Poker CLI: One Entry Point for the Analysis and Slide Scripts
+============================================================================
+Each subcommand runs one of the existing scripts as if it had been called directly,
+with the remaining arguments passed through. Nothing is imported until a subcommand
+runs, and the scripts themselves only import matplotlib and scipy, and only read
+their tables, when they draw a figure or compute a test; a text-only summary or
+the LaTeX tables never load the plotting stack.
+
+Usage:
+    python tom_cli.py summary --results_csv poker_tom_results_20250602_081719.csv
+    python tom_cli.py latex
+    python tom_cli.py slides presentation
+    python tom_cli.py analysis --help
+"""
+
+import argparse
+import runpy
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# Subcommand -> (script, arguments put before the user's, description)
+COMMANDS = {
+    'summary': ('tom_poker_analysis.py', ['--stream'],
+                "Text-only statistical summary of an experiment results table"),
+    'analysis': ('tom_poker_analysis.py', [],
+                 "Full poker analysis: dashboard, figures, summary and report"),
+    'cognitive': ('src/analysis/cognitive_tom_analysis.py', [],
+                  "Cognitive ToM analysis of the explanations (add --stream for text only)"),
+    'cognitive-summary': ('cognitive_summary.py', [],
+                          "Key insights and examples of the detailed cognitive analysis"),
+    'examples': ('src/analysis/tom_examples_analysis.py', [],
+                 "Examples of ToM reasoning in the explanations"),
+    'aggregates': ('results_aggregates.py', [],
+                   "Compute the aggregates the LaTeX tables, slides and cognitive summary read"),
+    'latex': ('results_paper_latex.py', ['--tables_only'],
+              "LaTeX tables of the paper results"),
+    'paper': ('results_paper_latex.py', [],
+              "LaTeX tables and research-quality figures of the paper results"),
+    'render': ('render_figures.py', [],
+               "Render every dashboard, slide and paper figure headless in a process pool"),
+    'schema': ('results_schema.py', [],
+               "Memory report of a results table before and after the compact schema"),
+}
+
+# Slide deck -> script, for the slides subcommand
+SLIDES = {
+    'presentation': 'src/visualization/presentation_visuals.py',
+    'additional': 'additional_slide_visuals.py',
+    'context-control': 'src/visualization/context_control_visualization.py',
+    'slide9': 'fix_slide9.py',
+    'slide9-implications': 'transparent_slide9.py',
+    'slide10': 'premium_slide10.py',
+    'slide10-enhanced': 'enhanced_slide10.py',
+    'slide10-simple': 'simple_slide10.py',
+}
+
+
+def run_script(script, args):
+    """Run a project script as __main__ with the given command-line arguments.
+
+    The script's directory and the project root are on sys.path, as when it is
+    run directly from its directory.
+    """
+    path = PROJECT_ROOT / script
+    for directory in (str(PROJECT_ROOT), str(path.parent)):
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+    sys.argv = [str(path), *args]
+    runpy.run_path(str(path), run_name='__main__')
+
+
+def build_parser():
+    commands = '\n'.join(f"  {name:<20} {description}" for name, (_, _, description) in COMMANDS.items())
+    commands += f"\n  {'slides':<20} Slide figures: {', '.join(SLIDES)}"
+    parser = argparse.ArgumentParser(
+        description="Theory of Mind poker analysis and slide scripts",
+        epilog=f"subcommands:\n{commands}\n\nArguments after the subcommand go to its script "
+               f"(e.g. 'summary --help').",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("command", choices=[*COMMANDS, 'slides'], metavar="command",
+                        help="Subcommand to run (see below)")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments passed to the subcommand's script")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == 'slides':
+        if not args.args or args.args[0] not in SLIDES:
+            parser.error(f"slides needs a deck: {', '.join(SLIDES)}")
+        run_script(SLIDES[args.args[0]], args.args[1:])
+        return
+
+    script, prefix, _ = COMMANDS[args.command]
+    run_script(script, [*prefix, *args.args])
+
+
+if __name__ == "__main__":
+    main()
@@ -5,68 +5,167 @@ Theory of Mind in Large Language Models: Poker Analysis
 Comprehensive analysis and visualization script for the Theory of Mind poker experiment.
 """
 
+import argparse
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-from scipy.stats import binomtest, chi2_contingency
 from collections import Counter
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set up plotting style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
-plt.rcParams['figure.figsize'] = (12, 8)
-plt.rcParams['font.size'] = 12
+from results_schema import apply_schema, with_default
+from results_stats import (AccuracyStats, BOOTSTRAP_REPLICATES, BOOTSTRAP_SEED, chi_square_independence,
+                           significance_stars)
+from results_store import iter_table, read_table
+from plot_style import pyplot
+
+# Plotting style, applied when the first figure is drawn
+PLOT_STYLE = dict(style='seaborn-v0_8', palette='husl', rc={'figure.figsize': (12, 8), 'font.size': 12})
+
+# Rows read at a time in streaming mode
+STREAM_CHUNKSIZE = 50000
+
+# Results columns the full analysis reads (the raw responses are never needed)
+ANALYSIS_COLUMNS = ['Stimulus_ID', 'Core_Scenario_ID', 'LLM_Model', 'Context_Type', 'Parsed_Classification',
+                    'Is_Classification_Correct', 'Explanation_Text']
+
+
+def model_short_names(llm_models):
+    """Short model names used in tables and figures."""
+    return llm_models.str.split('/').str[-1].str.replace('-Preview', '').str[:25]
+
+
+def print_statistical_summary(stats, models, replicates=BOOTSTRAP_REPLICATES, seed=BOOTSTRAP_SEED):
+    """Print the comprehensive statistical summary from an AccuracyStats table.
+    
+    models gives the order of the per-model rows. Next to the Wilson intervals, a
+    scenario-level cluster bootstrap with the given replicates and seed gives intervals
+    that allow for correlated responses to the same scenario. The per-model table is
+    also saved to model_performance_summary.csv and returned.
+    """
+    print("\n" + "="*80)
+    print("📊 COMPREHENSIVE STATISTICAL SUMMARY")
+    print("="*80)
+    
+    # Overall performance
+    overall = stats.overall()
+    
+    print(f"\n🎯 OVERALL PERFORMANCE:")
+    overall_boot = stats.cluster_bootstrap(replicates=replicates, seed=seed).iloc[0]
+    print(f"Overall Accuracy: {overall['Accuracy']:.3f} "
+          f"[{overall['CI_Lower']:.3f}, {overall['CI_Upper']:.3f}] (95% Wilson CI), "
+          f"[{overall_boot['Boot_Lower']:.3f}, {overall_boot['Boot_Upper']:.3f}] (95% scenario bootstrap CI)")
+    print(f"Total Responses: {int(overall['N'])}")
+    print(f"Number of Models: {len(models)}")
+    
+    # Model-specific results, with context-specific accuracy
+    print(f"\n🤖 MODEL-SPECIFIC RESULTS:")
+    model_table = stats.table('Model_Short').loc[models]
+    context_acc = stats.accuracy('Model_Short', 'Context_Type').reindex(index=models, columns=['Bluff', 'Value'])
+    model_boot = stats.cluster_bootstrap('Model_Short', replicates=replicates, seed=seed).loc[models]
+    
+    results_df = pd.DataFrame({
+        'Model': models,
+        'Accuracy': [f"{accuracy:.3f}" for accuracy in model_table['Accuracy']],
+        '95% CI': [f"[{low:.3f}, {high:.3f}]" for low, high in zip(model_table['CI_Lower'], model_table['CI_Upper'])],
+        'Boot_95%_CI': [f"[{low:.3f}, {high:.3f}]" for low, high in zip(model_boot['Boot_Lower'], model_boot['Boot_Upper'])],
+        'Bluff_Acc': [f"{accuracy:.3f}" for accuracy in context_acc['Bluff']],
+        'Value_Acc': [f"{accuracy:.3f}" for accuracy in context_acc['Value']],
+        'N_Responses': model_table['N'].to_numpy(),
+        'P_Value': [f"{p_value:.4f}" for p_value in model_table['P_Value']],
+        'Significant': significance_stars(model_table['P_Value'].to_numpy())
+    })
+    print(results_df.to_string(index=False))
+    print("\nSignificance: *** p < 0.001, ** p < 0.01, * p < 0.05, ns = not significant (Wilson CIs, exact binomial tests)")
+    print(f"Boot_95%_CI: cluster bootstrap over {stats.cells.index.get_level_values('Core_Scenario_ID').nunique()} "
+          f"scenarios, {replicates} replicates (seed {seed})")
+    
+    # Context comparison; correctness is 0/1, so the standard deviation follows from the counts
+    print(f"\n🎭 BLUFF vs VALUE DETECTION:")
+    context_table = stats.table('Context_Type')
+    counts, correct = context_table['N_Valid'], context_table['Correct']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std = np.sqrt(correct * (counts - correct) / (counts * (counts - 1)))
+    context_comparison = pd.DataFrame({
+        'mean': context_table['Accuracy'],
+        'count': counts,
+        'std': std.where(counts > 1)
+    })
+    print(context_comparison)
+    
+    context_boot = stats.cluster_bootstrap('Context_Type', replicates=replicates, seed=seed)
+    for context, row in context_boot.iterrows():
+        print(f"{context}: {row['Accuracy']:.3f} [{row['Boot_Lower']:.3f}, {row['Boot_Upper']:.3f}] (95% scenario bootstrap CI)")
+    
+    # Chi-square test for context independence (outcomes nobody had are left out)
+    contingency = np.column_stack([counts - correct, correct])
+    chi2, p_chi2, dof = chi_square_independence(contingency[:, contingency.sum(axis=0) > 0])
+    print(f"\nChi-square test for context independence:")
+    print(f"χ² = {chi2:.3f}, p = {p_chi2:.4f}")
+    
+    # Save results to CSV
+    results_df.to_csv('model_performance_summary.csv', index=False)
+    print(f"\n💾 Results saved to 'model_performance_summary.csv'")
+    
+    return results_df
+
 
 class ToMPokerAnalyzer:
     """Comprehensive analyzer for Theory of Mind poker experiment results."""
     
     def __init__(self, data_file):
-        """Initialize with the results CSV file."""
-        self.df = pd.read_csv(data_file)
+        """Initialize with the results table (CSV, or a Parquet/Feather copy of it)."""
+        self.df = read_table(data_file, columns=ANALYSIS_COLUMNS)
         self.prepare_data()
         
     def prepare_data(self):
         """Clean and prepare data for analysis."""
         # Create model short names for better visualization
-        self.df['Model_Short'] = self.df['LLM_Model'].str.split('/').str[-1].str.replace('-Preview', '').str[:25]
+        self.df['Model_Short'] = model_short_names(self.df['LLM_Model'])
         
         # Add response length
         self.df['Response_Length'] = self.df['Explanation_Text'].str.len()
         
         # Clean parsed classifications
-        self.df['Parsed_Classification'] = self.df['Parsed_Classification'].fillna('Unknown')
+        self.df['Parsed_Classification'] = with_default(self.df['Parsed_Classification'], 'Unknown')
         
         # Create reasoning quality scores (simulated for demo - would be coded manually)
         np.random.seed(42)  # For reproducible results
         self.df['Reasoning_Quality'] = np.random.choice([1,2,3,4,5], size=len(self.df), 
                                                       p=[0.1, 0.2, 0.4, 0.2, 0.1])
         
+        # Categorical model/context keys, int8 flags (see results_schema)
+        self.df = apply_schema(self.df)
+        
+        # Correctness counts per (model, context, scenario); every accuracy table,
+        # CI and significance test below is rolled up from these
+        self.stats = AccuracyStats.from_results(self.df)
+        self.models = list(self.df['Model_Short'].unique())
+        
         print(f"📊 Data loaded: {len(self.df)} responses from {self.df['Model_Short'].nunique()} models")
         print(f"📈 Overall accuracy: {self.df['Is_Classification_Correct'].mean():.3f}")
         
     def create_main_performance_dashboard(self):
         """Create the main performance dashboard with key metrics."""
+        plt = pyplot(**PLOT_STYLE)
+        import seaborn as sns
+        
         fig, axes = plt.subplots(2, 3, figsize=(20, 12))
         fig.suptitle('🎯 Theory of Mind in Poker: LLM Performance Dashboard', 
                      fontsize=20, fontweight='bold', y=0.98)
         
         # 1. Overall Accuracy by Model
-        model_acc = self.df.groupby('Model_Short')['Is_Classification_Correct'].agg(['mean', 'count', 'std']).reset_index()
-        model_acc['ci'] = 1.96 * model_acc['std'] / np.sqrt(model_acc['count'])
+        model_acc = self.stats.table('Model_Short')
+        model_ci = [model_acc['Accuracy'] - model_acc['CI_Lower'], model_acc['CI_Upper'] - model_acc['Accuracy']]
         
-        bars = axes[0,0].bar(model_acc['Model_Short'], model_acc['mean'], 
-                            yerr=model_acc['ci'], capsize=5, alpha=0.8)
+        bars = axes[0,0].bar(model_acc.index.astype(str), model_acc['Accuracy'], 
+                            yerr=model_ci, capsize=5, alpha=0.8)
         axes[0,0].set_title('Overall Classification Accuracy', fontweight='bold', fontsize=14)
         axes[0,0].set_ylabel('Accuracy')
         axes[0,0].set_ylim(0, 1.1)
         axes[0,0].tick_params(axis='x', rotation=45)
         
         # Add value labels on bars
-        for i, (bar, acc) in enumerate(zip(bars, model_acc['mean'])):
+        for i, (bar, acc) in enumerate(zip(bars, model_acc['Accuracy'])):
             axes[0,0].text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.02,
                           f'{acc:.3f}', ha='center', va='bottom', fontweight='bold')
         
@@ -75,7 +174,7 @@ class ToMPokerAnalyzer:
         axes[0,0].legend()
         
         # 2. Accuracy Heatmap by Context Type
-        acc_matrix = self.df.groupby(['Model_Short', 'Context_Type'])['Is_Classification_Correct'].mean().unstack()
+        acc_matrix = self.stats.accuracy('Model_Short', 'Context_Type')
         sns.heatmap(acc_matrix, annot=True, fmt='.3f', cmap='RdYlGn', ax=axes[0,1],
                    cbar_kws={'label': 'Accuracy'}, vmin=0, vmax=1)
         axes[0,1].set_title('Accuracy by Context Type', fontweight='bold', fontsize=14)
@@ -83,15 +182,8 @@ class ToMPokerAnalyzer:
         axes[0,1].set_ylabel('Model')
         
         # 3. Statistical Significance vs Chance
-        p_values = []
-        model_names = []
-        for model in self.df['Model_Short'].unique():
-            model_data = self.df[self.df['Model_Short'] == model]
-            n_correct = model_data['Is_Classification_Correct'].sum()
-            n_total = len(model_data)
-            p_val = binomtest(n_correct, n_total, 0.5, alternative='two-sided').pvalue
-            p_values.append(p_val)
-            model_names.append(model)
+        p_values = self.stats.table('Model_Short')['P_Value'].loc[self.models]
+        model_names = self.models
         
         bars = axes[0,2].bar(model_names, [-np.log10(p) for p in p_values], alpha=0.8)
         axes[0,2].axhline(-np.log10(0.05), color='red', linestyle='--', 
@@ -104,7 +196,7 @@ class ToMPokerAnalyzer:
         axes[0,2].legend()
         
         # 4. Bluff vs Value Detection Performance
-        context_perf = self.df.groupby(['Model_Short', 'Context_Type'])['Is_Classification_Correct'].mean().unstack()
+        context_perf = acc_matrix
         x = np.arange(len(context_perf.index))
         width = 0.35
         
@@ -137,7 +229,10 @@ class ToMPokerAnalyzer:
         
     def create_confusion_matrices(self):
         """Create confusion matrices for each model."""
-        models = self.df['Model_Short'].unique()
+        plt = pyplot(**PLOT_STYLE)
+        import seaborn as sns
+        
+        models = self.models
         n_models = len(models)
         
         fig, axes = plt.subplots(2, 2, figsize=(16, 12))
@@ -145,13 +240,15 @@ class ToMPokerAnalyzer:
         
         axes = axes.ravel()
         
+        # Context x predicted-label counts of every model in one pass
+        confusion_counts = self.df.groupby(['Model_Short', 'Context_Type', 'Parsed_Classification'],
+                                           observed=True).size().unstack(fill_value=0)
+        
         for i, model in enumerate(models[:4]):  # Show up to 4 models
-            model_data = self.df[self.df['Model_Short'] == model]
-            
-            # Create confusion matrix
-            confusion = pd.crosstab(model_data['Context_Type'], 
-                                  model_data['Parsed_Classification'], 
-                                  normalize='index')
+            # Row-normalised confusion matrix over the labels this model predicted
+            counts = confusion_counts.loc[model]
+            counts = counts.loc[:, counts.sum() > 0]
+            confusion = counts.div(counts.sum(axis=1), axis=0)
             
             sns.heatmap(confusion, annot=True, fmt='.2f', cmap='Blues', ax=axes[i],
                        cbar_kws={'label': 'Proportion'})
@@ -169,11 +266,14 @@ class ToMPokerAnalyzer:
         
     def create_tom_indicators_analysis(self):
         """Create Theory of Mind indicators analysis."""
+        plt = pyplot(**PLOT_STYLE)
+        import seaborn as sns
+        
         fig, axes = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle('🧠 Theory of Mind Cognitive Indicators', fontsize=18, fontweight='bold')
         
         # Simulate ToM coding results (in real analysis, these would be manually coded)
-        models = self.df['Model_Short'].unique()
+        models = self.models
         tom_indicators = {
             'Mentions_Opponent_Tendency': np.random.uniform(0.4, 0.9, len(models)),
             'Correct_Tendency_Interpretation': np.random.uniform(0.3, 0.8, len(models)),
@@ -218,12 +318,11 @@ class ToMPokerAnalyzer:
         # Simulate context integration scores
         context_integration = []
         for model in models:
-            model_data = self.df[self.df['Model_Short'] == model]
             integration_score = np.random.uniform(0.3, 0.9)  # Simulated
             context_integration.append({
                 'Model': model,
                 'Integration_Score': integration_score,
-                'Accuracy': model_data['Is_Classification_Correct'].mean()
+                'Accuracy': self.stats.table('Model_Short').loc[model, 'Accuracy']
             })
         
         context_df = pd.DataFrame(context_integration)
@@ -243,85 +342,18 @@ class ToMPokerAnalyzer:
         plt.savefig('tom_indicators.png', dpi=300, bbox_inches='tight')
         plt.show()
         
-    def generate_statistical_summary(self):
-        """Generate comprehensive statistical summary."""
-        print("\n" + "="*80)
-        print("📊 COMPREHENSIVE STATISTICAL SUMMARY")
-        print("="*80)
-        
-        # Overall performance
-        overall_acc = self.df['Is_Classification_Correct'].mean()
-        overall_ci = 1.96 * np.sqrt(overall_acc * (1 - overall_acc) / len(self.df))
-        
-        print(f"\n🎯 OVERALL PERFORMANCE:")
-        print(f"Overall Accuracy: {overall_acc:.3f} ± {overall_ci:.3f} (95% CI)")
-        print(f"Total Responses: {len(self.df)}")
-        print(f"Number of Models: {self.df['Model_Short'].nunique()}")
-        
-        # Model-specific results
-        print(f"\n🤖 MODEL-SPECIFIC RESULTS:")
-        model_stats = []
-        
-        for model in self.df['Model_Short'].unique():
-            model_data = self.df[self.df['Model_Short'] == model]
-            
-            # Basic stats
-            accuracy = model_data['Is_Classification_Correct'].mean()
-            n_total = len(model_data)
-            n_correct = model_data['Is_Classification_Correct'].sum()
-            
-            # Confidence interval
-            se = np.sqrt(accuracy * (1 - accuracy) / n_total)
-            ci_lower = accuracy - 1.96 * se
-            ci_upper = accuracy + 1.96 * se
-            
-            # Statistical test vs chance
-            p_value = binomtest(n_correct, n_total, 0.5, alternative='two-sided').pvalue
-            
-            # Context-specific performance
-            bluff_acc = model_data[model_data['Context_Type'] == 'Bluff']['Is_Classification_Correct'].mean()
-            value_acc = model_data[model_data['Context_Type'] == 'Value']['Is_Classification_Correct'].mean()
-            
-            model_stats.append({
-                'Model': model,
-                'Accuracy': f"{accuracy:.3f}",
-                '95% CI': f"[{ci_lower:.3f}, {ci_upper:.3f}]",
-                'Bluff_Acc': f"{bluff_acc:.3f}",
-                'Value_Acc': f"{value_acc:.3f}",
-                'N_Responses': n_total,
-                'P_Value': f"{p_value:.4f}",
-                'Significant': "***" if p_value < 0.001 else "**" if p_value < 0.01 else "*" if p_value < 0.05 else "ns"
-            })
-        
-        # Create results table
-        results_df = pd.DataFrame(model_stats)
-        print(results_df.to_string(index=False))
-        print("\nSignificance: *** p < 0.001, ** p < 0.01, * p < 0.05, ns = not significant")
-        
-        # Context comparison
-        print(f"\n🎭 BLUFF vs VALUE DETECTION:")
-        context_comparison = self.df.groupby('Context_Type')['Is_Classification_Correct'].agg(['mean', 'count', 'std'])
-        print(context_comparison)
-        
-        # Chi-square test for context independence
-        contingency = pd.crosstab(self.df['Context_Type'], self.df['Is_Classification_Correct'])
-        chi2, p_chi2, dof, expected = chi2_contingency(contingency)
-        print(f"\nChi-square test for context independence:")
-        print(f"χ² = {chi2:.3f}, p = {p_chi2:.4f}")
-        
-        # Save results to CSV
-        results_df.to_csv('model_performance_summary.csv', index=False)
-        print(f"\n💾 Results saved to 'model_performance_summary.csv'")
-        
-        return results_df
+    def generate_statistical_summary(self, replicates=BOOTSTRAP_REPLICATES, seed=BOOTSTRAP_SEED):
+        """Generate comprehensive statistical summary (bootstrap replicates and seed as given)."""
+        return print_statistical_summary(self.stats, self.models, replicates, seed)
         
     def create_presentation_figures(self):
         """Create specific figures optimized for presentation slides."""
+        plt = pyplot(**PLOT_STYLE)
         
         # Figure 1: Simple accuracy comparison for slide
         fig, ax = plt.subplots(1, 1, figsize=(12, 8))
         
-        model_acc = self.df.groupby('Model_Short')['Is_Classification_Correct'].mean().sort_values(ascending=False)
+        model_acc = self.stats.accuracy('Model_Short').sort_values(ascending=False)
         
         bars = ax.bar(range(len(model_acc)), model_acc.values, 
                      color=['#2E8B57', '#4682B4', '#CD853F', '#B22222'][:len(model_acc)],
@@ -347,7 +379,7 @@ class ToMPokerAnalyzer:
         # Figure 2: Bluff vs Value challenge
         fig, ax = plt.subplots(1, 1, figsize=(12, 8))
         
-        context_perf = self.df.groupby(['Model_Short', 'Context_Type'])['Is_Classification_Correct'].mean().unstack()
+        context_perf = self.stats.accuracy('Model_Short', 'Context_Type')
         
         x = np.arange(len(context_perf.index))
         width = 0.35
@@ -383,7 +415,7 @@ class ToMPokerAnalyzer:
         print("="*80)
         
         # Get best performing model
-        best_model = self.df.groupby('Model_Short')['Is_Classification_Correct'].mean().idxmax()
+        best_model = self.stats.accuracy('Model_Short').idxmax()
         print(f"\nBest performing model: {best_model}")
         
         # Get correct explanations from best model
@@ -411,36 +443,37 @@ class ToMPokerAnalyzer:
     def create_final_summary_report(self):
         """Create a final summary report for the presentation."""
         
+        model_acc = self.stats.accuracy('Model_Short')
+        context_acc = self.stats.accuracy('Context_Type')
+        
         report = f"""
 # Theory of Mind in Large Language Models: Poker Analysis Report
 
 ## Executive Summary
 
-This study investigated Theory of Mind (ToM) capabilities in Large Language Models using poker bluff detection as a benchmark. We tested {self.df['Model_Short'].nunique()} models on {len(self.df)} poker scenarios requiring contextual reasoning about opponent intentions.
+This study investigated Theory of Mind (ToM) capabilities in Large Language Models using poker bluff detection as a benchmark. We tested {len(self.models)} models on {len(self.df)} poker scenarios requiring contextual reasoning about opponent intentions.
 
 ## Key Findings
 
 ### 1. Clear Performance Hierarchy
-- **Best Model**: {self.df.groupby('Model_Short')['Is_Classification_Correct'].mean().idxmax()} 
-  ({self.df.groupby('Model_Short')['Is_Classification_Correct'].mean().max():.1%} accuracy)
-- **Range**: {self.df.groupby('Model_Short')['Is_Classification_Correct'].mean().min():.1%} to {self.df.groupby('Model_Short')['Is_Classification_Correct'].mean().max():.1%}
-- **Overall**: {self.df['Is_Classification_Correct'].mean():.1%} across all models
+- **Best Model**: {model_acc.idxmax()} 
+  ({model_acc.max():.1%} accuracy)
+- **Range**: {model_acc.min():.1%} to {model_acc.max():.1%}
+- **Overall**: {self.stats.overall()['Accuracy']:.1%} across all models
 
 ### 2. Bluff Detection = Theory of Mind Bottleneck
-- **Bluff Detection**: {self.df[self.df['Context_Type'] == 'Bluff']['Is_Classification_Correct'].mean():.1%} average accuracy
-- **Value Detection**: {self.df[self.df['Context_Type'] == 'Value']['Is_Classification_Correct'].mean():.1%} average accuracy
-- **Gap**: {self.df[self.df['Context_Type'] == 'Value']['Is_Classification_Correct'].mean() - self.df[self.df['Context_Type'] == 'Bluff']['Is_Classification_Correct'].mean():.1%} percentage points
+- **Bluff Detection**: {context_acc.get('Bluff', np.nan):.1%} average accuracy
+- **Value Detection**: {context_acc.get('Value', np.nan):.1%} average accuracy
+- **Gap**: {context_acc.get('Value', np.nan) - context_acc.get('Bluff', np.nan):.1%} percentage points
 
 ### 3. Statistical Significance
 Models achieving significance vs. chance (p < 0.05):
 """
         
         # Add significance results
-        for model in self.df['Model_Short'].unique():
-            model_data = self.df[self.df['Model_Short'] == model]
-            n_correct = model_data['Is_Classification_Correct'].sum()
-            n_total = len(model_data)
-            p_value = binomtest(n_correct, n_total, 0.5, alternative='two-sided').pvalue
+        p_values = self.stats.table('Model_Short')['P_Value']
+        for model in self.models:
+            p_value = p_values[model]
             significance = "✓" if p_value < 0.05 else "✗"
             report += f"\n- {model}: {significance} (p = {p_value:.4f})"
         
@@ -470,12 +503,86 @@ Models achieving significance vs. chance (p < 0.05):
         return report
 
 
+class StreamingToMPokerSummary:
+    """Constant-memory equivalent of ToMPokerAnalyzer.generate_statistical_summary.
+    
+    Reads only the columns the summary needs, in chunks, and keeps running counts: the
+    AccuracyStats cells (correct/total per model, context and scenario), from which the
+    summary is printed exactly as in memory, and per-model confusion counts. Memory
+    depends on the number of models, scenarios and labels, not on the number of rows.
+    """
+    
+    COLUMNS = ['LLM_Model', 'Context_Type', 'Core_Scenario_ID', 'Parsed_Classification',
+               'Is_Classification_Correct']
+    
+    def __init__(self, data_file, chunksize=STREAM_CHUNKSIZE):
+        """Stream the results file through the running aggregates."""
+        self.rows = 0
+        self.models = {}                  # model -> None, in order of first appearance
+        self.cells = None                 # AccuracyStats cells, summed over chunks
+        self.confusion = Counter()        # (model, context, predicted) -> rows
+        
+        for chunk in iter_table(data_file, columns=self.COLUMNS, chunksize=chunksize):
+            self.update(chunk)
+        self.stats = AccuracyStats(self.cells)
+        
+        print(f"📊 Data streamed: {self.rows} responses from {len(self.models)} models")
+        print(f"📈 Overall accuracy: {self.stats.overall()['Accuracy']:.3f}")
+        
+    def update(self, chunk):
+        """Fold one chunk of results into the running aggregates."""
+        frame = chunk.assign(
+            Model_Short=model_short_names(chunk['LLM_Model']),
+            Parsed_Classification=with_default(chunk['Parsed_Classification'], 'Unknown')
+        )
+        
+        self.rows += len(frame)
+        self.models.update(dict.fromkeys(frame['Model_Short'].unique()))
+        
+        cells = AccuracyStats.count_cells(frame)
+        self.cells = cells if self.cells is None else self.cells.add(cells, fill_value=0).astype(np.int64)
+        self.confusion.update(
+            frame.groupby(['Model_Short', 'Context_Type', 'Parsed_Classification'], observed=True).size().to_dict()
+        )
+        
+    def confusion_matrix(self, model):
+        """Row-normalised context x predicted-label table, as in create_confusion_matrices."""
+        counts = pd.Series({(context, predicted): n for (name, context, predicted), n in self.confusion.items()
+                            if name == model})
+        confusion = counts.unstack(fill_value=0).sort_index().sort_index(axis=1)
+        confusion.index.name, confusion.columns.name = 'Context_Type', 'Parsed_Classification'
+        return confusion.div(confusion.sum(axis=1), axis=0)
+        
+    def generate_statistical_summary(self, replicates=BOOTSTRAP_REPLICATES, seed=BOOTSTRAP_SEED):
+        """Generate the statistical summary of ToMPokerAnalyzer.generate_statistical_summary."""
+        return print_statistical_summary(self.stats, list(self.models), replicates, seed)
+
+
 def main():
     """Main analysis pipeline."""
+    parser = argparse.ArgumentParser(description="Theory of Mind Poker Analysis")
+    parser.add_argument("--results_csv", default="poker_tom_results_20250602_081719.csv",
+                        help="Experiment results file to analyze (a newer .parquet/.feather copy is read instead)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Only compute the statistical summary, reading the results in chunks")
+    parser.add_argument("--chunksize", type=int, default=STREAM_CHUNKSIZE,
+                        help="Rows per chunk in streaming mode")
+    parser.add_argument("--bootstrap_replicates", type=int, default=BOOTSTRAP_REPLICATES,
+                        help="Replicates of the scenario-level cluster bootstrap")
+    parser.add_argument("--bootstrap_seed", type=int, default=BOOTSTRAP_SEED,
+                        help="Seed of the cluster bootstrap")
+    args = parser.parse_args()
+    
+    if args.stream:
+        print("🚀 Streaming Theory of Mind Poker Summary...")
+        summary = StreamingToMPokerSummary(args.results_csv, chunksize=args.chunksize)
+        summary.generate_statistical_summary(args.bootstrap_replicates, args.bootstrap_seed)
+        return
+    
     print("🚀 Starting Theory of Mind Poker Analysis...")
     
     # Initialize analyzer
-    analyzer = ToMPokerAnalyzer('poker_tom_results_20250602_081719.csv')
+    analyzer = ToMPokerAnalyzer(args.results_csv)
     
     # Create all visualizations
     print("\n📊 Creating performance dashboard...")
@@ -492,7 +599,7 @@ def main():
     
     # Generate statistical summaries
     print("\n📋 Generating statistical summary...")
-    results_table = analyzer.generate_statistical_summary()
+    results_table = analyzer.generate_statistical_summary(args.bootstrap_replicates, args.bootstrap_seed)
     
     print("\n📝 Analyzing best explanations...")
     best_explanations = analyzer.analyze_best_explanations()